@@ -0,0 +1,289 @@
+# Batched, NumPy-vectorized game environments for bots, training and balance testing.
+# Rules come from game_rules, shared with the games in main.py; nothing here
+# touches the display.
+import numpy as np
+from game_rules import (SNAKE_COLS, SNAKE_ROWS, snake_start,
+                        TETRIS_COLS, TETRIS_ROWS, LINE_SCORE, TETROMINOES, ROTATIONS, spawn_x)
+
+# direction codes follow SnakeGame's key order: up, down, left, right
+DIRS = ((0,-1), (0,1), (-1,0), (1,0))
+DX = np.array([d[0] for d in DIRS], dtype=np.int32)
+DY = np.array([d[1] for d in DIRS], dtype=np.int32)
+
+
+# Snake batch environment
+class SnakeBatchEnv:
+    """N independent Snake boards advanced together by one vectorized step().
+
+    Same rules as SnakeGame: walls, self and cross-player collision (tails
+    included), 3 lives, +1 life and growth per food, respawn at the
+    SnakeGame start points (or a random empty cell when a body or the food
+    is there), players moving in order within a step.
+
+    Boards are flat arrays of cols*rows cells: occ holds player id + 1 per
+    cell, bodies are ring buffers of cell indices with a head pointer and a
+    length, so growth and tail pops are pure index arithmetic.
+    """
+
+    def __init__(self, n, num_players=2, seed=None, auto_reset=True):
+        self.n = n
+        self.num_players = num_players
+        self.cols, self.rows = SNAKE_COLS, SNAKE_ROWS
+        self.cells = self.cols*self.rows
+        self.auto_reset = auto_reset
+        self.rng = np.random.default_rng(seed)
+        starts = [snake_start(num_players, p) for p in range(num_players)]
+        self.start = np.array([y*self.cols + x for (x, y), d in starts], dtype=np.int32)
+        self.start_dir = np.array([DIRS.index(d) for pos, d in starts], dtype=np.int8)
+        cell_t = np.int16 if self.cells < 2**15 else np.int32
+        self.occ = np.zeros((n, self.cells), dtype=np.int8)
+        self.body = np.zeros((n, num_players, self.cells), dtype=cell_t)
+        self.head = np.zeros((n, num_players), dtype=np.int32)
+        self.length = np.zeros((n, num_players), dtype=np.int32)
+        self.dirs = np.zeros((n, num_players), dtype=np.int8)
+        self.lives = np.zeros((n, num_players), dtype=np.int32)
+        self.food = np.zeros(n, dtype=np.int32)
+        self.reset()
+
+    def reset(self, idx=None):
+        idx = np.arange(self.n) if idx is None else np.asarray(idx)
+        self.occ[idx] = 0
+        for p in range(self.num_players):
+            self.body[idx, p, 0] = self.start[p]
+            self.head[idx, p] = 0
+            self.length[idx, p] = 1
+            self.dirs[idx, p] = self.start_dir[p]
+            self.lives[idx, p] = 3
+            self.occ[idx, self.start[p]] = p + 1
+        self._spawn_food(idx)
+
+    def _spawn_food(self, idx):
+        # one rejection sample per board, then an exact uniform pick over the
+        # free cells for the boards that missed; -1 when a board is full
+        cand = self.rng.integers(0, self.cells, idx.size)
+        hit = self.occ[idx, cand] == 0
+        self.food[idx[hit]] = cand[hit]
+        rest = idx[~hit]
+        if rest.size:
+            free = self.occ[rest] == 0
+            score = self.rng.random(free.shape)
+            score[~free] = -1
+            self.food[rest] = np.where(free.any(axis=1), score.argmax(axis=1), -1)
+
+    def _respawn_cells(self, idx, p):
+        # SnakeGame.respawn_pos: the start point unless a body or the food is
+        # on it, else a random empty cell; boards with none leave p out
+        start = np.full(idx.size, self.start[p], dtype=np.int32)
+        blocked = (self.occ[idx, self.start[p]] != 0) | (self.food[idx] == self.start[p])
+        if not blocked.any():
+            return idx, start
+        b = idx[blocked]
+        free = self.occ[b] == 0
+        fed = np.flatnonzero(self.food[b] >= 0)
+        free[fed, self.food[b[fed]]] = False
+        score = self.rng.random(free.shape)
+        score[~free] = -1
+        start[blocked] = score.argmax(axis=1)
+        keep = np.ones(idx.size, dtype=bool)
+        keep[np.flatnonzero(blocked)[~free.any(axis=1)]] = False
+        return idx[keep], start[keep]
+
+    def step(self, actions=None):
+        """Advance every board by one move.
+
+        actions: (n, num_players) direction codes 0-3, -1 keeps the heading.
+        Returns (rewards, done): rewards is (n, num_players) with +1 per food
+        and -1 per life lost; done flags boards where every player is out of
+        lives (those boards are reset when auto_reset is on).
+        """
+        if actions is not None:
+            actions = np.asarray(actions).reshape(self.n, self.num_players)
+            self.dirs = np.where(actions >= 0, actions, self.dirs).astype(np.int8)
+        rewards = np.zeros((self.n, self.num_players), dtype=np.float32)
+        cols, occ = self.cols, self.occ
+        for p in range(self.num_players):
+            alive = np.flatnonzero(self.length[:, p] > 0)
+            if not alive.size: continue
+            h = self.body[alive, p, self.head[alive, p]].astype(np.int32)
+            d = self.dirs[alive, p]
+            nx = h % cols + DX[d]
+            ny = h // cols + DY[d]
+            inside = (nx >= 0) & (nx < cols) & (ny >= 0) & (ny < self.rows)
+            cell = np.where(inside, ny*cols + nx, 0)
+            lost = ~inside | (occ[alive, cell] != 0)
+            dead = alive[lost]
+            if dead.size:
+                self.lives[dead, p] -= 1
+                rewards[dead, p] -= 1
+                block = occ[dead]
+                block[block == p + 1] = 0
+                occ[dead] = block
+                respawn = dead[self.lives[dead, p] > 0]
+                respawn, start = self._respawn_cells(respawn, p)
+                self.length[dead, p] = 0
+                self.head[respawn, p] = 0
+                self.body[respawn, p, 0] = start
+                self.length[respawn, p] = 1
+                self.dirs[respawn, p] = self.start_dir[p]
+                occ[respawn, start] = p + 1
+            moved = alive[~lost]
+            cell = cell[~lost]
+            hd = (self.head[moved, p] + 1) % self.cells
+            self.head[moved, p] = hd
+            self.body[moved, p, hd] = cell
+            occ[moved, cell] = p + 1
+            eat = cell == self.food[moved]
+            grow = moved[eat]
+            self.length[grow, p] += 1
+            self.lives[grow, p] += 1
+            rewards[grow, p] += 1
+            trail = moved[~eat]
+            tail = self.body[trail, p, (hd[~eat] - self.length[trail, p]) % self.cells]
+            occ[trail, tail] = 0
+            if grow.size:
+                self._spawn_food(grow)
+        done = (self.length == 0).all(axis=1)
+        if self.auto_reset and done.any():
+            self.reset(np.flatnonzero(done))
+        return rewards, done
+
+    def observation(self):
+        """(n, rows, cols) int8 boards: 0 empty, player id + 1 for bodies, num_players + 1 for food."""
+        obs = self.occ.copy()
+        has_food = np.flatnonzero(self.food >= 0)
+        obs[has_food, self.food[has_food]] = self.num_players + 1
+        return obs.reshape(self.n, self.rows, self.cols)
+
+
+def board_features(boards):
+    """Heuristic features for any (..., rows, cols) stack of 0/1 boards.
+
+    Returns a dict of arrays over the leading axes: heights (per column),
+    aggregate_height, max_height, holes (empty cells under a column's top)
+    and bumpiness (sum of adjacent height differences).
+    """
+    filled = boards.astype(bool)
+    rows = filled.shape[-2]
+    has = filled.any(axis=-2)
+    heights = np.where(has, rows - filled.argmax(axis=-2), 0)
+    aggregate = heights.sum(axis=-1)
+    return {
+        'heights': heights,
+        'aggregate_height': aggregate,
+        'max_height': heights.max(axis=-1),
+        'holes': aggregate - filled.sum(axis=(-2, -1)),
+        'bumpiness': np.abs(np.diff(heights, axis=-1)).sum(axis=-1),
+    }
+
+
+# Tetris batch environment
+class TetrisBatchEnv:
+    """N Tetris boards with vectorized enumeration of hard-drop placements.
+
+    Uses TetrisGame's 7 shapes, rotation tables, spawn column and points per
+    cleared line (all from game_rules). For the current piece of every board, placements()
+    lists each (rotation, x) reachable by rotating and shifting at the top
+    and dropping straight down, returns the resulting boards (lines already
+    cleared) and their features. step(choice) commits one candidate per board.
+    """
+
+    def __init__(self, n, seed=None, auto_reset=True):
+        self.n = n
+        self.cols, self.rows = TETRIS_COLS, TETRIS_ROWS
+        self.auto_reset = auto_reset
+        self.rng = np.random.default_rng(seed)
+        self.shape_names = list(TETROMINOES)
+        # candidate tables padded to the largest placement count (K) of any shape;
+        # padded piece columns get a huge bottom so they never limit the drop
+        cands = [[(rot, x) for rot, piece in enumerate(ROTATIONS[name])
+                  for x in range(self.cols - piece.width + 1)] for name in self.shape_names]
+        S, K = len(cands), max(map(len, cands))
+        self.K = K
+        self.cand_rot = np.zeros((S, K), dtype=np.int32)
+        self.cand_x = np.zeros((S, K), dtype=np.int32)
+        self.cand_ok = np.zeros((S, K), dtype=bool)
+        self.cand_dx = np.zeros((S, K, 4), dtype=np.int32)
+        self.cand_dy = np.zeros((S, K, 4), dtype=np.int32)
+        self.cand_col = np.zeros((S, K, 4), dtype=np.int32)
+        self.cand_bottom = np.full((S, K, 4), -(1 << 20), dtype=np.int32)
+        for s, name in enumerate(self.shape_names):
+            for k, (rot, x) in enumerate(cands[s]):
+                piece = ROTATIONS[name][rot]
+                self.cand_rot[s, k], self.cand_x[s, k], self.cand_ok[s, k] = rot, x, True
+                self.cand_dx[s, k] = [dx for dx, dy in piece.cells]
+                self.cand_dy[s, k] = [dy for dx, dy in piece.cells]
+                self.cand_col[s, k, :piece.width] = x + np.arange(piece.width)
+                self.cand_bottom[s, k, :piece.width] = piece.bottom
+        spawn = [ROTATIONS[name][0] for name in self.shape_names]
+        self.spawn_r = np.array([[dy for dx, dy in p.cells] for p in spawn], dtype=np.int32)
+        self.spawn_c = np.array([[spawn_x(p) + dx for dx, dy in p.cells] for p in spawn], dtype=np.int32)
+        self.boards = np.zeros((n, self.rows, self.cols), dtype=np.uint8)
+        self.pieces = np.zeros(n, dtype=np.int32)
+        self.score = np.zeros(n, dtype=np.int64)
+        self.lines = np.zeros(n, dtype=np.int64)
+        self._last = None
+        self.reset()
+
+    def reset(self, idx=None):
+        idx = np.arange(self.n) if idx is None else np.asarray(idx)
+        self.boards[idx] = 0
+        self.score[idx] = 0
+        self.lines[idx] = 0
+        self.pieces[idx] = self.rng.integers(0, len(self.shape_names), idx.size)
+        self._last = None
+
+    def placements(self):
+        """Enumerate every hard-drop placement of each board's current piece.
+
+        Returns a dict with 'boards' (n, K, rows, cols) after the drop and line
+        clears, 'valid' (n, K), 'rot' and 'x' (n, K), 'lines' (n, K) and the
+        board_features() of the resulting boards.
+        """
+        n, K, rows = self.n, self.K, self.rows
+        p = self.pieces
+        filled = self.boards.astype(bool)
+        top = np.where(filled.any(axis=1), filled.argmax(axis=1), rows)      # (n, cols)
+        bi = np.arange(n)[:, None, None]
+        y = (top[bi, self.cand_col[p]] - self.cand_bottom[p] - 1).min(axis=-1)  # (n, K)
+        valid = self.cand_ok[p] & (y >= 0)
+        y = np.where(valid, y, 0)
+        after = np.repeat(self.boards[:, None], K, axis=1)
+        r = y[..., None] + self.cand_dy[p]
+        c = self.cand_x[p][..., None] + self.cand_dx[p]
+        after[bi, np.arange(K)[None, :, None], r, c] = 1
+        full = after.all(axis=-1)                                               # (n, K, rows)
+        lines = full.sum(axis=-1)
+        if lines.any():
+            # stable sort moves full rows to the top in order, then blank them
+            order = np.argsort(~full, axis=-1, kind='stable')
+            after = np.take_along_axis(after, order[..., None], axis=2)
+            after *= (np.arange(rows) >= lines[..., None])[..., None]
+        result = {'boards': after, 'valid': valid, 'rot': self.cand_rot[p], 'x': self.cand_x[p],
+                  'lines': np.where(valid, lines, 0)}
+        result.update(board_features(after))
+        self._last = result
+        return result
+
+    def step(self, choice):
+        """Commit candidate choice[i] on board i and spawn the next piece.
+
+        Returns (rewards, done): rewards are points scored (LINE_SCORE per line),
+        done flags boards whose choice was invalid or whose next piece
+        collides at spawn (reset when auto_reset is on).
+        """
+        res = self._last if self._last is not None else self.placements()
+        idx = np.arange(self.n)
+        choice = np.asarray(choice)
+        ok = res['valid'][idx, choice]
+        self.boards[ok] = res['boards'][idx[ok], choice[ok]]
+        cleared = np.where(ok, res['lines'][idx, choice], 0)
+        rewards = cleared*LINE_SCORE
+        self.lines += cleared
+        self.score += rewards
+        self.pieces = self.rng.integers(0, len(self.shape_names), self.n).astype(np.int32)
+        blocked = self.boards[idx[:, None], self.spawn_r[self.pieces], self.spawn_c[self.pieces]].any(axis=1)
+        done = ~ok | blocked
+        self._last = None
+        if self.auto_reset and done.any():
+            self.reset(np.flatnonzero(done))
+        return rewards, done
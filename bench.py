@@ -0,0 +1,288 @@
+# Headless micro-benchmarks for game logic and save/load, reported as ops/sec.
+# Runs without a window (SDL_VIDEODRIVER=dummy) and can store a baseline and
+# flag regressions against it:
+#   python bench.py                          run everything, print a table
+#   python bench.py -k snake                 only cases whose name contains "snake"
+#   python bench.py --save-baseline          write bench_baseline.json
+#   python bench.py --compare --threshold 0.15
+#                                            exit 1 if a case is >15% slower
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+import argparse, json, platform, random, shutil, sys, tempfile, time
+from collections import deque
+import pygame
+import main
+from main import SnakeGame, TetrisGame, PingPongGame, GameHub, GameState
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_baseline.json")
+
+
+def measure(op, min_batch=0.05, repeats=5):
+    """Best-of-`repeats` ops/sec for op(), batches sized to run >= min_batch s."""
+    n = 1
+    while True:
+        t = time.perf_counter()
+        for _ in range(n): op()
+        elapsed = time.perf_counter() - t
+        if elapsed >= min_batch: break
+        n *= 2 if elapsed <= 0 else max(2, min(10, int(min_batch / elapsed) + 1))
+    best = n / elapsed
+    for _ in range(repeats - 1):
+        t = time.perf_counter()
+        for _ in range(n): op()
+        best = max(best, n / (time.perf_counter() - t))
+    return best
+
+
+# Snake
+def snake_cycle(cols, rows):
+    # Hamiltonian cycle (rows must be even): serpentine over columns 1.., then
+    # back up column 0; a snake steered along it never hits itself or a wall
+    path = []
+    for y in range(rows):
+        xs = range(1, cols) if y % 2 == 0 else range(cols-1, 0, -1)
+        path.extend((x, y) for x in xs)
+    path.extend((0, y) for y in range(rows-1, -1, -1))
+    return path
+
+def snake_on_cycle(length, players):
+    g = SnakeGame(players, seed=0)
+    path = snake_cycle(g.cols, g.rows)
+    heads = [length-1 + i*len(path)//players for i in range(players)]
+    g.snakes = [deque(path[(h-k) % len(path)] for k in range(length)) for h in heads]
+    g.food = None  # no growth: the length stays fixed for the whole run
+    g.rebuild_occupancy()
+    turn = {}
+    for i, (x, y) in enumerate(path):
+        nx, ny = path[(i+1) % len(path)]
+        turn[(x, y)] = (nx-x, ny-y)
+    return g, turn
+
+def case_snake_tick(length, players):
+    g, turn = snake_on_cycle(length, players)
+    def op():
+        g.tick([turn[s[0]] for s in g.snakes])
+    return op
+
+def case_spawn_food(fill):
+    g = SnakeGame(1, seed=0)
+    path = snake_cycle(g.cols, g.rows)
+    g.snakes = [deque(path[:int(len(path)*fill)])]
+    g.rebuild_occupancy()
+    return g.spawn_food
+
+
+# Tetris
+def tetris_board(seed=0, height=10):
+    # bottom `height` rows randomly filled, never complete
+    rng = random.Random(seed)
+    g = TetrisGame()
+    for r in range(g.rows-height, g.rows):
+        mask = rng.getrandbits(g.cols) & g.full_row
+        if mask == g.full_row: mask ^= 1 << rng.randrange(g.cols)
+        g.row_masks[r] = mask
+        for j in range(g.cols):
+            if mask >> j & 1: g.row_colors[r][j] = 1 + rng.randrange(7)
+    return g
+
+def case_tetris_collide():
+    g = tetris_board()
+    rng = random.Random(1)
+    probes = []
+    for _ in range(1024):
+        piece = rng.choice(g.rotations[rng.choice(list(g.shapes))])
+        probes.append((rng.randrange(-1, g.cols), rng.randrange(g.rows), piece))
+    it = iter(())
+    def op():
+        nonlocal it
+        for x, y, piece in it:
+            g.collide(x, y, piece)
+            return
+        it = iter(probes)
+    return op
+
+def case_tetris_lock():
+    # clone + hard drop + lock of the current piece on a half-filled board
+    base = tetris_board()
+    def op():
+        g = base.clone()
+        while not g.collide(g.x, g.y+1, g.piece): g.y += 1
+        g.lock()
+    return op
+
+def case_tetris_clear():
+    # clone + lock of a vertical I completing four rows at once
+    base = tetris_board(height=0)
+    for r in range(base.rows-4, base.rows):
+        base.row_masks[r] = base.full_row & ~1
+        base.row_colors[r][1:] = bytes([2]*(base.cols-1))
+    base.shape, base.rot = 'I', 1
+    base.piece = base.rotations['I'][1]
+    base.x, base.y = 0, base.rows-4
+    def op():
+        base.clone().lock()
+    return op
+
+
+# Ping Pong
+def case_pingpong_frame():
+    # one 60 fps frame of simulation (two physics steps), paddle tracking the ball
+    g = PingPongGame()
+    frame_ms = 1000 / 60
+    def op():
+        nonlocal g
+        mid = g.left_y + g.paddle_h/2
+        if g.tick((g.ball_y > mid) - (g.ball_y < mid), frame_ms):
+            g = PingPongGame()
+    return op
+
+
+# Save / load through GameHub
+_hub = None
+
+def bench_hub():
+    # one GameHub on the dummy display, shared by the save/load cases
+    global _hub
+    if _hub is None:
+        _hub = GameHub()
+        _hub.finish_init()
+    return _hub
+
+def sample_games():
+    snake, _ = snake_on_cycle(200, 2)
+    snake.food = (0, 0) if not snake.occ[0] else None
+    tetris = tetris_board()
+    pong = PingPongGame()
+    pong.tick(0, 500)
+    return {GameState.SNAKE: snake, GameState.TETRIS: tetris, GameState.PINGPONG: pong}
+
+def case_snapshot(game):
+    # what a save costs the frame loop; serializing and writing is SaveWriter's job
+    return game.to_dict
+
+def case_save(state, game, path):
+    # a complete save: snapshot, queue and wait for the fsynced write
+    hub = bench_hub()
+    def op():
+        hub.game, hub.state, hub.paused_state = game, state, None
+        hub.save_progress(path)
+        main.save_writer.flush()
+    return op
+
+def case_load(state, game, path):
+    hub = bench_hub()
+    hub.game, hub.state, hub.paused_state = game, state, None
+    hub.save_progress(path)
+    main.save_writer.flush()
+    def op():
+        hub.load_progress(path)
+    return op
+
+
+# Score history
+_scores = None
+
+def bench_scores(workdir, rows=200000):
+    # one store prefilled with `rows` random scores spread over the three games
+    global _scores
+    if _scores is None:
+        _scores = main.ScoreStore(os.path.join(workdir, "bench_scores.db"))
+        rng = random.Random(0)
+        db = _scores.open()
+        db.execute("BEGIN")
+        db.executemany(_scores.insert, ((rng.choice(("snake", "tetris", "pingpong")), rng.randrange(100000), i)
+                                        for i in range(rows)))
+        db.execute("COMMIT")
+    return _scores
+
+def case_scores_query(workdir, kind):
+    store = bench_scores(workdir)
+    query = getattr(store, kind)
+    return lambda: query("tetris", 10)
+
+
+def build_cases(workdir):
+    cases = {}
+    for players in (1, 2):
+        for length in (1, 50, 200, 500):
+            cases[f"snake.tick[p{players},len{length}]"] = lambda p=players, n=length: case_snake_tick(n, p)
+    for fill in (0.5, 0.9, 0.99):
+        cases[f"snake.spawn_food[fill{int(fill*100)}]"] = lambda f=fill: case_spawn_food(f)
+    cases["tetris.collide"] = case_tetris_collide
+    cases["tetris.lock"] = case_tetris_lock
+    cases["tetris.clear4"] = case_tetris_clear
+    cases["pingpong.frame"] = case_pingpong_frame
+    for state, game in sample_games().items():
+        name = state.name.lower()
+        path = os.path.join(workdir, f"bench_{name}{main.SAVE_EXT}")
+        json_path = os.path.join(workdir, f"bench_{name}.json")
+        cases[f"{name}.snapshot"] = lambda g=game: case_snapshot(g)
+        cases[f"{name}.save"] = lambda s=state, g=game, p=path: case_save(s, g, p)
+        cases[f"{name}.load"] = lambda s=state, g=game, p=path: case_load(s, g, p)
+        cases[f"{name}.save_json"] = lambda s=state, g=game, p=json_path: case_save(s, g, p)
+        cases[f"{name}.load_json"] = lambda s=state, g=game, p=json_path: case_load(s, g, p)
+    for kind in ("top", "recent"):
+        cases[f"scores.{kind}10[200k]"] = lambda k=kind: case_scores_query(workdir, k)
+    return cases
+
+
+def compare(results, baseline, threshold):
+    # list of (name, ratio) for cases slower than baseline by more than threshold
+    slower = []
+    for name, ops in results.items():
+        base = baseline.get("results", {}).get(name)
+        if base and ops < base * (1 - threshold):
+            slower.append((name, ops / base))
+    return slower
+
+
+def run(argv=None):
+    ap = argparse.ArgumentParser(description="Headless game logic and persistence benchmarks")
+    ap.add_argument("-k", "--filter", default="", help="only run cases whose name contains this")
+    ap.add_argument("--baseline", default=DEFAULT_BASELINE, help="baseline JSON path")
+    ap.add_argument("--save-baseline", action="store_true", help="store these results as the baseline")
+    ap.add_argument("--compare", action="store_true", help="compare against the baseline, exit 1 on regressions")
+    ap.add_argument("--threshold", type=float, default=0.15, help="allowed slowdown fraction (default 0.15)")
+    ap.add_argument("--min-batch", type=float, default=0.05, help="seconds per timed batch")
+    args = ap.parse_args(argv)
+
+    workdir = tempfile.mkdtemp(prefix="hub_bench_")
+    # keep saves, caches and scores out of the real app folder
+    main.BASE_DIR = workdir
+    random.seed(0)
+    pygame.init()
+    try:
+        baseline = {}
+        if args.compare:
+            with open(args.baseline, "r") as f:
+                baseline = json.load(f)
+        results = {}
+        for name, build in build_cases(workdir).items():
+            if args.filter not in name: continue
+            ops = measure(build(), args.min_batch)
+            results[name] = ops
+            base = baseline.get("results", {}).get(name)
+            delta = f"{(ops/base - 1)*100:+7.1f}%" if base else ""
+            print(f"{name:<28} {ops:14,.0f} ops/s {delta}")
+    finally:
+        pygame.quit()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump({"machine": platform.platform(), "python": platform.python_version(),
+                       "pygame": pygame.version.ver, "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+                       "results": results}, f, indent=2)
+        print(f"baseline written to {args.baseline}")
+    if args.compare:
+        slower = compare(results, baseline, args.threshold)
+        for name, ratio in slower:
+            print(f"REGRESSION {name}: {ratio*100:.0f}% of baseline")
+        if slower:
+            return 1
+        print(f"no regressions beyond {args.threshold*100:.0f}%")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(run())
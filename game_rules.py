@@ -0,0 +1,60 @@
+# Game rules shared by the pygame games in main.py and the NumPy environments
+# in batch_env.py: board sizes, start positions and the tetromino tables.
+# Plain Python only, so either module can import it without the other.
+from collections import namedtuple
+
+# Window; the Snake board is the area inside its margins
+WIDTH, HEIGHT = 900, 800
+TOP_MARGIN = 100
+SIDE_MARGIN = 80
+BOTTOM_MARGIN = 100
+
+# Snake
+SNAKE_CELL = 20
+SNAKE_COLS = (WIDTH - 2*SIDE_MARGIN) // SNAKE_CELL
+SNAKE_ROWS = (HEIGHT - TOP_MARGIN - BOTTOM_MARGIN) // SNAKE_CELL
+
+def snake_start(num_players, i):
+    # (start cell, heading) of player i, used at reset and on respawn
+    if num_players == 1:
+        return (SNAKE_COLS//2, SNAKE_ROWS//2), (1,0)
+    if i == 0:
+        return (SNAKE_COLS//4, SNAKE_ROWS//2), (1,0)
+    return (3*SNAKE_COLS//4, SNAKE_ROWS//2), (-1,0)
+
+# Tetris
+TETRIS_COLS, TETRIS_ROWS = 10, 20
+LINE_SCORE = 100
+TETROMINOES = {
+    'I':[[(1,1,1,1)],[(1,),(1,),(1,),(1,)]],
+    'O':[[(1,1),(1,1)]],
+    'T':[[(0,1,0),(1,1,1)],[(1,0),(1,1),(1,0)],[(1,1,1),(0,1,0)],[(0,1),(1,1),(0,1)]],
+    'S':[[(0,1,1),(1,1,0)],[(1,0),(1,1),(0,1)]],
+    'Z':[[(1,1,0),(0,1,1)],[(0,1),(1,1),(1,0)]],
+    'J':[[(1,0,0),(1,1,1)],[(1,1),(1,0),(1,0)],[(1,1,1),(1,0,0)],[(0,1),(0,1),(1,1)]],
+    'L':[[(0,0,1),(1,1,1)],[(1,0),(1,0),(1,1)],[(1,1,1),(1,0,0)],[(1,1),(0,1),(0,1)]]
+}
+
+# one precomputed entry per (shape, rotation):
+#   cells  - (dx, dy) offsets of the occupied cells
+#   masks  - row bitmasks, bit j = column j
+#   bottom - lowest occupied dy in each column
+Rotation = namedtuple('Rotation', 'pattern cells masks width height bottom')
+
+def build_rotations(shapes):
+    table = {}
+    for name, rots in shapes.items():
+        table[name] = []
+        for patt in rots:
+            cells = tuple((j, i) for i, row in enumerate(patt) for j, val in enumerate(row) if val)
+            masks = tuple(sum(1 << j for j, val in enumerate(row) if val) for row in patt)
+            width, height = len(patt[0]), len(patt)
+            bottom = tuple(max(i for j, i in cells if j == c) for c in range(width))
+            table[name].append(Rotation(patt, cells, masks, width, height, bottom))
+    return table
+
+ROTATIONS = build_rotations(TETROMINOES)
+
+def spawn_x(piece):
+    # new pieces start centred on the top row
+    return TETRIS_COLS//2 - piece.width//2
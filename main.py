@@ -1,11 +1,19 @@
-import sys, pygame, random, time, math
+import time
+# taken before the heavy imports: StartupProfiler's "module load" lap starts here
+LOAD_START = time.perf_counter()
+import sys, pygame, random, math
 from enum import Enum
-import json, os
+from collections import deque, OrderedDict
+import json, os, hashlib, platform, threading, atexit, struct, zlib, sqlite3
+from array import array
+from itertools import islice
 from datetime import datetime
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+# board sizes, start positions and tetrominoes, shared with batch_env
+from game_rules import (WIDTH, HEIGHT, TOP_MARGIN, SIDE_MARGIN, BOTTOM_MARGIN,
+                        SNAKE_CELL, SNAKE_COLS, SNAKE_ROWS, snake_start,
+                        TETRIS_COLS, TETRIS_ROWS, LINE_SCORE, TETROMINOES, ROTATIONS, spawn_x)
 
-# Window
-WIDTH, HEIGHT = 900, 800
 # Colors
 CYAN = (0,255,255)
 MED_CYAN = (0,180,180)
@@ -17,10 +25,368 @@ YELLOW = (255,255,0)
 BLUE = (0,0,255)
 MAGENTA = (255,0,255)
 
-# padding for snake UI
-TOP_MARGIN = 100
-SIDE_MARGIN = 80
-BOTTOM_MARGIN = 100
+# longest real-time slice fed to a simulation per frame (avoids catch-up bursts after stalls)
+MAX_FRAME_MS = 250
+# Snake repaints only changed cells and pushes just those rects (HUB_DIRTY_RECTS=0 for full redraws)
+DIRTY_RECTS = os.environ.get("HUB_DIRTY_RECTS", "1") != "0"
+# slot saves are binary .sav files (see SaveCodec); HUB_SAVE_ZLIB=0 stores payloads uncompressed
+SAVE_EXT = ".sav"
+SAVE_ZLIB = os.environ.get("HUB_SAVE_ZLIB", "1") != "0"
+# crash autosave journals (see Autosaver): one write per HUB_AUTOSAVE_MS of play, 0 disables
+JOURNAL_EXT = ".jrn"
+AUTOSAVE_MS = int(os.environ.get("HUB_AUTOSAVE_MS", "3000"))
+
+# Startup profiling: HUB_PROFILE_STARTUP=1 or --profile-startup prints how long
+# each phase took once the first frame (and the deferred setup after it) is done
+class StartupProfiler:
+    def __init__(self, enabled, start=None):
+        self.enabled = enabled
+        self.phases = []
+        self.last = time.perf_counter() if start is None else start
+
+    def lap(self, name):
+        # the time since the previous lap is charged to name
+        now = time.perf_counter()
+        self.phases.append((name, (now - self.last) * 1000))
+        self.last = now
+
+    def report(self):
+        if self.enabled and self.phases:
+            total = sum(ms for _, ms in self.phases)
+            print(f"[STARTUP] {'phase':<28} {'ms':>8} {'%':>6}")
+            for name, ms in self.phases:
+                print(f"[STARTUP] {name:<28} {ms:8.2f} {ms*100/total:6.1f}")
+            print(f"[STARTUP] {'total':<28} {total:8.2f}")
+        self.phases = []
+
+profiler = StartupProfiler(os.environ.get("HUB_PROFILE_STARTUP", "0") != "0" or "--profile-startup" in sys.argv, LOAD_START)
+
+# Frame timing: per-state time spent in each phase of GameHub.run, kept over a
+# rolling window of frames (F3 toggles the overlay, F4 exports CSV + JSON)
+class FrameStats:
+    phases = ("events", "update", "draw", "hud", "flip")
+    budget_ms = 1000 / 60
+
+    def __init__(self, window=600):
+        self.window = window
+        self.samples = {}   # state name -> {phase or "frame": deque of ms}
+        self.over = {}      # state name -> frames over budget since start
+        self.frames = {}    # state name -> frames recorded since start
+        self.state = None
+        self.current = {}
+
+    def begin(self, state):
+        self.state = state.name
+        self.current = {}
+        self.start = self.mark = time.perf_counter()
+
+    def lap(self, phase):
+        # the time since the previous lap (or begin) is charged to phase
+        now = time.perf_counter()
+        self.current[phase] = self.current.get(phase, 0) + (now - self.mark) * 1000
+        self.mark = now
+
+    def end(self):
+        total = (time.perf_counter() - self.start) * 1000
+        rows = self.samples.get(self.state)
+        if rows is None:
+            rows = self.samples[self.state] = {p: deque(maxlen=self.window) for p in ("frame",) + self.phases}
+            self.over[self.state] = 0
+            self.frames[self.state] = 0
+        rows["frame"].append(total)
+        for p in self.phases:
+            rows[p].append(self.current.get(p, 0))
+        self.frames[self.state] += 1
+        if total > self.budget_ms:
+            self.over[self.state] += 1
+
+    @staticmethod
+    def percentile(values, q):
+        if not values:
+            return 0
+        ordered = sorted(values)
+        return ordered[min(len(ordered) - 1, int(q / 100 * len(ordered)))]
+
+    def summary(self):
+        # {state: {"frames", "over_budget", "window_over_budget", phase: {mean, p50, p95, p99, max}}}
+        out = {}
+        for state, rows in self.samples.items():
+            s = {"frames": self.frames[state], "over_budget": self.over[state],
+                 "window_over_budget": sum(1 for v in rows["frame"] if v > self.budget_ms)}
+            for phase, values in rows.items():
+                s[phase] = {"mean": sum(values) / len(values) if values else 0,
+                            "p50": self.percentile(values, 50), "p95": self.percentile(values, 95),
+                            "p99": self.percentile(values, 99), "max": max(values) if values else 0}
+            out[state] = s
+        return out
+
+    def export(self, folder):
+        # frame_stats_<timestamp>.csv / .json in folder; returns the JSON path
+        os.makedirs(folder, exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        summary = self.summary()
+        base = os.path.join(folder, f"frame_stats_{stamp}")
+        with open(base + ".csv", "w") as f:
+            f.write("state,phase,samples,mean_ms,p50_ms,p95_ms,p99_ms,max_ms,frames,over_budget\n")
+            for state, s in summary.items():
+                for phase in ("frame",) + self.phases:
+                    v = s[phase]
+                    f.write(f"{state},{phase},{len(self.samples[state][phase])},{v['mean']:.3f},{v['p50']:.3f},"
+                            f"{v['p95']:.3f},{v['p99']:.3f},{v['max']:.3f},{s['frames']},{s['over_budget']}\n")
+        info = {"platform": platform.platform(), "python": platform.python_version(),
+                "pygame": pygame.version.ver, "budget_ms": self.budget_ms, "window": self.window,
+                "states": summary}
+        with open(base + ".json", "w") as f:
+            json.dump(info, f, indent=2)
+        return base + ".json"
+
+    def overlay_rows(self):
+        # table rows for the current state: header, one row per phase, then
+        # a single-cell over-budget line
+        rows = self.samples.get(self.state)
+        if not rows:
+            return []
+        table = [(self.state, "p50", "p95", "p99")]
+        for phase in ("frame",) + self.phases:
+            v = rows[phase]
+            table.append((phase,) + tuple(f"{self.percentile(v, q):.1f}" for q in (50, 95, 99)))
+        over = sum(1 for v in rows["frame"] if v > self.budget_ms)
+        table.append((f">{self.budget_ms:.1f}ms: {over}/{len(rows['frame'])} ({self.over[self.state]} total)",))
+        return table
+
+# Rendered text cache
+class TextCache:
+    # font.render results keyed by (font, text, colour, antialias) with LRU
+    # eviction; callers must treat the returned surfaces as read-only
+    def __init__(self, maxsize=512):
+        self.maxsize = maxsize
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, text, color, antialias=True):
+        key = (font, text, tuple(color), antialias)
+        surf = self.surfaces.get(key)
+        if surf is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surf
+        self.misses += 1
+        surf = font.render(text, antialias, color)
+        self.surfaces[key] = surf
+        if len(self.surfaces) > self.maxsize:
+            self.surfaces.popitem(last=False)
+        return surf
+
+    def clear(self):
+        self.surfaces.clear()
+        self.hits = self.misses = 0
+
+text_cache = TextCache()
+
+def render_text(font, text, color, antialias=True):
+    return text_cache.render(font, text, color, antialias)
+
+# Font registry
+class FontRegistry:
+    # one Font per (family, size); the file each family resolves to is kept in
+    # BASE_DIR/font_cache.json so later startups skip the system font scan
+    # (delete the file to force a rescan)
+    cache_name = "font_cache.json"
+
+    def __init__(self):
+        self.fonts = {}
+        self.paths = None
+
+    def cache_path(self):
+        return os.path.join(BASE_DIR, self.cache_name)
+
+    def load_paths(self):
+        try:
+            with open(self.cache_path(), "r") as f:
+                self.paths = json.load(f)
+        except:
+            self.paths = {}
+
+    def save_paths(self):
+        try:
+            with open(self.cache_path(), "w") as f:
+                json.dump(self.paths, f)
+        except:
+            pass
+
+    def resolve(self, family):
+        # font file for family, or None for pygame's default font
+        if self.paths is None:
+            self.load_paths()
+        path = self.paths.get(family, "")
+        if path == "" or (path and not os.path.exists(path)):
+            try: path = pygame.font.match_font(family)
+            except: path = None
+            self.paths[family] = path
+            self.save_paths()
+        return path
+
+    def get(self, family, size):
+        key = (family, size)
+        font = self.fonts.get(key)
+        if font is None:
+            try: font = pygame.font.Font(self.resolve(family), size)
+            except: font = pygame.font.Font(None, size)
+            self.fonts[key] = font
+        return font
+
+fonts = FontRegistry()
+
+# Icon assets
+class AssetManager:
+    # icons are found case-insensitively in BASE_DIR/icons (or Icons), loaded on
+    # first use and copied into shared atlas pages. The final scaled pixels are
+    # cached in BASE_DIR/icon_cache keyed by source mtime/size and target size,
+    # so warm starts skip PNG decoding and both smoothscale passes.
+    cache_name = "icon_cache"
+    page_size = 256
+    # name -> (file, scaling): "font" scales to the font height, "unify" to the
+    # font height and then to the save icon's size, (w, h) straight to that size
+    specs = {
+        'snake':     ('snake.png', 'unify'),
+        'tetris':    ('tetris.png', 'unify'),
+        'pingpong':  ('ping pong.png', 'unify'),
+        'save':      ('save game.png', 'font'),
+        'load':      ('load game.png', 'unify'),
+        'new':       ('new game.png', 'unify'),
+        'back':      ('back.png', 'unify'),
+        'save_quit': ('Save & Quit.png', 'unify'),
+        'continue':  ('Continue.png', 'unify'),
+        'title_pill': ('title.png', 'unify'),
+        'datetime':  ('Date & Time.png', 'unify'),
+        'slot':      ('Slot.png', 'unify'),
+        'delete':    ('delete.png', 'unify'),
+        'score':     ('score.png', 'font'),
+        'hint':      ('hints.png', 'font'),
+        'title':     ('game hub.png', (50, 50)),
+        'app':       ('app icon.png', (32, 32)),
+    }
+
+    def __init__(self, font_height):
+        self.font_height = font_height
+        self.icons = {}
+        self.files = None
+        self.index = None
+        # atlas pages and the free spot (x, y, shelf height) on the last one
+        self.pages = []
+        self.shelf = (0, 0, 0)
+
+    def icon(self, name):
+        # scaled icon surface (an atlas subsurface) or None when unavailable
+        if name not in self.icons:
+            try: surf = self.load(name)
+            except: surf = None
+            self.icons[name] = self.pack(surf) if surf else None
+        return self.icons[name]
+
+    def find(self, filename):
+        if self.files is None:
+            self.files = {}
+            for folder in ('icons', 'Icons'):
+                folder = os.path.join(BASE_DIR, folder)
+                try: names = os.listdir(folder)
+                except OSError: continue
+                for n in names:
+                    self.files.setdefault(n.lower(), os.path.join(folder, n))
+        return self.files.get(filename.lower())
+
+    def load(self, name):
+        filename, scale = self.specs[name]
+        path = self.find(filename)
+        if path is None:
+            return None
+        if scale == 'unify':
+            save = self.icon('save')
+            target = save.get_size() if save else None
+        else:
+            target = scale if scale != 'font' else None
+        st = os.stat(path)
+        src = f"{filename.lower()}|{st.st_mtime_ns}|{st.st_size}"
+        key = f"{src}|{self.font_height}|{target}"
+        surf = self.cached(key)
+        if surf is None:
+            raw = pygame.image.load(path).convert_alpha()
+            if isinstance(scale, tuple):
+                surf = pygame.transform.smoothscale(raw, scale)
+            else:
+                h = self.font_height
+                w = raw.get_width() * h // raw.get_height()
+                surf = pygame.transform.smoothscale(raw, (w, h))
+                if target:
+                    surf = pygame.transform.smoothscale(surf, target)
+            self.store(key, src, surf)
+        return surf
+
+    def cache_dir(self):
+        return os.path.join(BASE_DIR, self.cache_name)
+
+    def cached(self, key):
+        if self.index is None:
+            try:
+                with open(os.path.join(self.cache_dir(), "index.json"), "r") as f:
+                    self.index = json.load(f)
+            except:
+                self.index = {}
+        entry = self.index.get(key)
+        if not entry:
+            return None
+        w, h, fname = entry[:3]
+        try:
+            with open(os.path.join(self.cache_dir(), fname), "rb") as f:
+                data = f.read()
+            frombytes = getattr(pygame.image, 'frombytes', None) or pygame.image.fromstring
+            return frombytes(data, (w, h), "RGBA").convert_alpha()
+        except:
+            return None
+
+    def store(self, key, src, surf):
+        # raw RGBA per entry; older entries for a changed source file are dropped
+        try:
+            folder = self.cache_dir()
+            os.makedirs(folder, exist_ok=True)
+            for k, entry in list(self.index.items()):
+                if k.split("|")[0] == src.split("|")[0] and entry[3] != src:
+                    del self.index[k]
+                    try: os.remove(os.path.join(folder, entry[2]))
+                    except OSError: pass
+            fname = hashlib.sha1(key.encode()).hexdigest()[:16] + ".rgba"
+            tobytes = getattr(pygame.image, 'tobytes', None) or pygame.image.tostring
+            with open(os.path.join(folder, fname), "wb") as f:
+                f.write(tobytes(surf, "RGBA"))
+            self.index[key] = [surf.get_width(), surf.get_height(), fname, src]
+            with open(os.path.join(folder, "index.json"), "w") as f:
+                json.dump(self.index, f)
+        except:
+            pass
+
+    def pack(self, surf):
+        # shelf-pack into the current atlas page; the region starts fully
+        # transparent, so an additive blit copies the pixels exactly
+        w, h = surf.get_size()
+        size = self.page_size
+        if w > size or h > size:
+            return surf
+        x, y, shelf_h = self.shelf
+        if x + w > size:
+            x, y, shelf_h = 0, y + shelf_h, 0
+        if not self.pages or y + h > size:
+            self.pages.append(pygame.Surface((size, size), pygame.SRCALPHA))
+            x, y, shelf_h = 0, 0, 0
+        rect = pygame.Rect(x, y, w, h)
+        page = self.pages[-1]
+        page.blit(surf, rect, special_flags=pygame.BLEND_RGBA_ADD)
+        self.shelf = (x + w, y, max(shelf_h, h))
+        return page.subsurface(rect)
+
+def icon_property(name):
+    # GameHub.<name>_icon attributes read through the lazy asset manager
+    return property(lambda self: self.assets.icon(name))
 
 # Game States
 class GameState(Enum):
@@ -40,6 +406,14 @@ class GameState(Enum):
     LOAD_MENU_PINGPONG = 14
     DETAIL_SAVE_PINGPONG = 15
 
+# screens that only change on input: the hub blocks on events there instead of
+# redrawing at 60 fps, waking at least every MENU_IDLE_MS
+MENU_STATES = frozenset((GameState.MENU, GameState.SUBMENU_SNAKE, GameState.SUBMENU_TETRIS,
+                         GameState.SUBMENU_PINGPONG, GameState.PAUSE, GameState.LOAD_MENU_SNAKE, GameState.LOAD_MENU_TETRIS,
+                         GameState.LOAD_MENU_PINGPONG, GameState.DETAIL_SAVE_SNAKE, GameState.DETAIL_SAVE_TETRIS,
+                         GameState.DETAIL_SAVE_PINGPONG))
+MENU_IDLE_MS = 250
+
 # Orbiting Morphing Button
 class OrbitButton:
     def __init__(self, label, center, size, action, icon=None):
@@ -54,73 +428,96 @@ class OrbitButton:
         self.hovered = False
         self.focused = False  # for keyboard nav highlight
         self.icon = icon
+        # pre-rendered appearances, see sprite()
+        self.sprites = {}
+        self.sprite_key = None
 
-    def update(self, dt):
-        mx, my = pygame.mouse.get_pos()
+    def update(self, dt, mouse=None):
+        # mouse: position read once per frame by the caller
+        mx, my = mouse if mouse is not None else pygame.mouse.get_pos()
         self.hovered = self.rect.collidepoint(mx, my)
 
     def draw(self, surf, font):
+        # icon pills keep their hit area centred on self.center
+        if getattr(self, 'icon', None):
+            self.rect = pygame.Rect(0, 0, *self.size)
+            self.rect.center = self.center
+            self.pos = self.rect.topleft
+        sprite = self.sprite(font, self.hovered or self.focused)
+        surf.blit(sprite, (self.rect.x - 4, self.rect.y - 4))
+
+    def sprite(self, font, active):
+        # pre-rendered appearance (active = hovered or focused, which look the
+        # same) with a 4px margin for the highlight ring; rebuilt when the
+        # font, size, label or icon change
+        key = (font, tuple(self.size), self.label, id(self.icon))
+        if key != self.sprite_key:
+            self.sprite_key = key
+            self.sprites = {}
+        sprite = self.sprites.get(active)
+        if sprite is None:
+            w, h = self.size
+            sprite = pygame.Surface((w + 8, h + 8), pygame.SRCALPHA)
+            self.paint(sprite, font, pygame.Rect(4, 4, w, h), active)
+            self.sprites[active] = sprite
+        return sprite
+
+    def paint(self, surf, font, rect, active):
         # slot buttons: white background, black text, with icon
         if self.label.startswith("Slot"):
-            pygame.draw.rect(surf, WHITE, self.rect, border_radius=self.size[1]//2)
-            txt = font.render(self.label, True, BLACK)
+            pygame.draw.rect(surf, WHITE, rect, border_radius=self.size[1]//2)
+            txt = render_text(font, self.label, BLACK)
             tw, th = txt.get_size()
             # draw icon if available
             if getattr(self, 'icon', None):
                 icon_w, icon_h = self.icon.get_size()
                 pad_x = 10
-                icon_x = self.rect.x + pad_x
-                icon_y = self.rect.centery - icon_h//2
+                icon_x = rect.x + pad_x
+                icon_y = rect.centery - icon_h//2
                 surf.blit(self.icon, (icon_x, icon_y))
                 tx = icon_x + icon_w + pad_x
-                ty = self.rect.centery - th//2
+                ty = rect.centery - th//2
             else:
-                tx = self.rect.centerx - tw//2
-                ty = self.rect.centery - th//2
+                tx = rect.centerx - tw//2
+                ty = rect.centery - th//2
             surf.blit(txt, (tx, ty))
-            if self.hovered or self.focused:
-                pygame.draw.rect(surf, YELLOW, self.rect.inflate(8,8), width=4, border_radius=self.size[1]//2+4)
+            if active:
+                pygame.draw.rect(surf, YELLOW, rect.inflate(8,8), width=4, border_radius=self.size[1]//2+4)
             return
         # use focused as hover for color change too
-        col = LIGHT_CYAN if (self.hovered or self.focused) else MED_CYAN
+        col = LIGHT_CYAN if active else MED_CYAN
         # dynamic icon button overrides static: draw uniform circle background then text
         if getattr(self, 'icon', None):
-            text_surf = font.render(self.label, True, WHITE)
+            text_surf = render_text(font, self.label, WHITE)
             tw, th = text_surf.get_size()
             iw, ih = self.icon.get_size()
             gap = 10
-            pill_w, pill_h = self.size
             # fixed padding for icon circle
             pad_x = 20
-            icon_bg_radius = pill_h // 2
-            pill_rect = pygame.Rect(0, 0, pill_w, pill_h)
-            pill_rect.center = self.center
-            # update hit area
-            self.rect = pill_rect
-            self.pos = pill_rect.topleft
+            icon_bg_radius = self.size[1] // 2
             # draw pill background
-            pygame.draw.rect(surf, col, pill_rect, border_radius=icon_bg_radius)
+            pygame.draw.rect(surf, col, rect, border_radius=icon_bg_radius)
             # draw icon circle background at constant padding from left
-            bg_cx = pill_rect.x + pad_x + icon_bg_radius
-            bg_cy = pill_rect.centery
+            bg_cx = rect.x + pad_x + icon_bg_radius
+            bg_cy = rect.centery
             pygame.draw.circle(surf, col, (bg_cx, bg_cy), icon_bg_radius)
             # render icon and text
             surf.blit(self.icon, (bg_cx - iw//2, bg_cy - ih//2))
             # draw text: center only for pause menu labels, keep icon position
             if self.label in ("Continue", "Save & Quit", "Quit Without Saving"):
-                tx = pill_rect.centerx - tw//2
-                surf.blit(text_surf, (tx, pill_rect.centery - th//2))
+                tx = rect.centerx - tw//2
+                surf.blit(text_surf, (tx, rect.centery - th//2))
             else:
-                surf.blit(text_surf, (bg_cx + icon_bg_radius + gap, pill_rect.centery - th//2))
-            if self.hovered or self.focused:
-                pygame.draw.rect(surf, YELLOW, pill_rect.inflate(8,8), width=4, border_radius=icon_bg_radius+4)
+                surf.blit(text_surf, (bg_cx + icon_bg_radius + gap, rect.centery - th//2))
+            if active:
+                pygame.draw.rect(surf, YELLOW, rect.inflate(8,8), width=4, border_radius=icon_bg_radius+4)
             return
         # draw rounded rectangle tablet
-        pygame.draw.rect(surf, col, self.rect, border_radius=self.size[1]//2)
+        pygame.draw.rect(surf, col, rect, border_radius=self.size[1]//2)
         # draw icon at left side
         icon_w, icon_h = 20, 20
-        ix = self.pos[0] + 10
-        iy = self.pos[1] + self.size[1]//2 - icon_h//2
+        ix = rect.x + 10
+        iy = rect.y + self.size[1]//2 - icon_h//2
         if "Snake" in self.label:
             for i in range(3):
                 pygame.draw.rect(surf, MED_CYAN, (ix + i*(icon_w//3 + 2), iy, icon_w//3, icon_h//3))
@@ -162,11 +559,11 @@ class OrbitButton:
             pygame.draw.rect(surf, LIGHT_CYAN, (ix, iy, icon_w, icon_h), border_radius=3)
             pygame.draw.polygon(surf, WHITE, [(ix + icon_w//2, iy + icon_h//4), (ix + icon_w//4, iy + icon_h*3//4), (ix + icon_w*3//4, iy + icon_h*3//4)])
         # label
-        text = font.render(self.label, True, WHITE)
-        tr = text.get_rect(center=self.rect.center)
+        text = render_text(font, self.label, WHITE)
+        tr = text.get_rect(center=rect.center)
         surf.blit(text, tr)
-        if self.hovered or self.focused:
-            pygame.draw.rect(surf, YELLOW, self.rect.inflate(8,8), width=4, border_radius=self.size[1]//2+4)
+        if active:
+            pygame.draw.rect(surf, YELLOW, rect.inflate(8,8), width=4, border_radius=self.size[1]//2+4)
 
     def handle_event(self, event):
         if event.type==pygame.MOUSEBUTTONDOWN and event.button==1 and self.hovered:
@@ -175,10 +572,7 @@ class OrbitButton:
 # Title
 def draw_title(surf, font, icon, panel_rect, title_str="PMD742OMNI GAME HUB"):
     # dynamic title pill inside menu panel
-    try:
-        title_font = pygame.font.SysFont("consolas", 12)
-    except:
-        title_font = pygame.font.Font(None, 12)
+    title_font = fonts.get("consolas", 12)
     text_surf = title_font.render(title_str, True, WHITE)
     text_surf.set_alpha(200)
     icon_gap = 5
@@ -213,191 +607,548 @@ def draw_title(surf, font, icon, panel_rect, title_str="PMD742OMNI GAME HUB"):
 
 # Snake game
 class SnakeGame:
-    def __init__(self, num_players=2):
-        self.cell=20
-        self.cols=(WIDTH - 2*SIDE_MARGIN) // self.cell
-        self.rows=(HEIGHT - TOP_MARGIN - BOTTOM_MARGIN) // self.cell
+    keymaps = (
+        {pygame.K_w: (0,-1), pygame.K_s: (0,1), pygame.K_a: (-1,0), pygame.K_d: (1,0)},
+        {pygame.K_UP: (0,-1), pygame.K_DOWN: (0,1), pygame.K_LEFT: (-1,0), pygame.K_RIGHT: (1,0)},
+    )
+    def __init__(self, num_players=2, seed=None):
+        self.cell=SNAKE_CELL
+        self.cols=SNAKE_COLS
+        self.rows=SNAKE_ROWS
         self.offset_x = SIDE_MARGIN
         self.offset_y = TOP_MARGIN
         self.num_players = num_players
         self.player_colors = [MED_CYAN, MAGENTA][:num_players]
+        self.rng = random.Random(seed)
         self.reset()
 
     def reset(self):
-        self.snakes = []
-        self.dirs = []
         self.lives = [3] * self.num_players
-        if self.num_players == 1:
-            start = (self.cols//2, self.rows//2)
-            self.snakes = [[start]]
-            self.dirs = [(1,0)]
-        else:
-            p1 = (self.cols//4, self.rows//2)
-            p2 = (3*self.cols//4, self.rows//2)
-            self.snakes = [[p1], [p2]]
-            self.dirs = [(1,0), (-1,0)]
+        self.dirs = [snake_start(self.num_players, i)[1] for i in range(self.num_players)]
+        # bodies are deques (head at index 0); occ holds the owning player id + 1 per cell
+        self.snakes = [deque([self.start_pos(i)]) for i in range(self.num_players)]
+        self.food = None
+        self.rebuild_occupancy()
         self.spawn_food()
         self.powers = []
-        self.last_move = pygame.time.get_ticks()
         self.move_delay = 150
+        # simulation clock (ms) and fixed-step accumulator, independent of pygame
+        self.sim_time = 0
+        self.accumulator = 0
+        self.last_clock = None
+
+    def start_pos(self, i):
+        return snake_start(self.num_players, i)[0]
+
+    def respawn_pos(self, i):
+        # the start point unless another snake or the food is on it, else a
+        # random empty cell (never a shared one: each cell has one owner in occ)
+        x, y = self.start_pos(i)
+        if not self.occ[y*self.cols + x] and (x, y) != self.food:
+            return (x, y)
+        food = self.food[1]*self.cols + self.food[0] if self.food else -1
+        cells = [c for c in self.free if c != food]
+        if not cells:
+            return None
+        cell = cells[self.rng.randrange(len(cells))]
+        return (cell % self.cols, cell // self.cols)
+
+    def rebuild_occupancy(self):
+        # occ plus a free-cell index: free is a swap-remove array of empty
+        # cells and free_pos maps each cell to its slot in it (-1 = occupied)
+        n = self.cols*self.rows
+        self.occ = bytearray(n)
+        self.free = list(range(n))
+        self.free_pos = list(range(n))
+        # cells changed since the last draw_dirty(); a rebuild repaints everything
+        self.dirty = set()
+        self.needs_full_redraw = True
+        for i, snake in enumerate(self.snakes):
+            for x, y in snake:
+                self._occupy(y*self.cols + x, i + 1)
+
+    def _occupy(self, cell, owner):
+        if not self.occ[cell]:
+            # swap-remove cell from the free list
+            k = self.free_pos[cell]
+            last = self.free.pop()
+            if last != cell:
+                self.free[k] = last
+                self.free_pos[last] = k
+            self.free_pos[cell] = -1
+        self.occ[cell] = owner
+        self.dirty.add(cell)
+
+    def _vacate(self, cell):
+        # respawns never share a cell, so nobody else is left on it
+        self.occ[cell] = 0
+        self.free_pos[cell] = len(self.free)
+        self.free.append(cell)
+        self.dirty.add(cell)
 
     def spawn_food(self):
-        occupied = [seg for s in self.snakes for seg in s]
-        while True:
-            p = (random.randrange(self.cols), random.randrange(self.rows))
-            if p not in occupied:
-                break
-        self.food = p
+        # uniform over empty cells in O(1); no food once the board is full
+        if self.food:
+            self.dirty.add(self.food[1]*self.cols + self.food[0])
+        if not self.free:
+            self.food = None
+            return
+        cell = self.free[self.rng.randrange(len(self.free))]
+        self.food = (cell % self.cols, cell // self.cols)
+        self.dirty.add(cell)
+
+    def tick(self, inputs=None, dt=None):
+        # headless core: no pygame events or clocks are touched here.
+        # inputs: per-player (dx, dy) as a list indexed by player or a
+        # {player: dir} dict; None keeps the current heading.
+        # dt: ms of simulation time to feed the fixed-step accumulator;
+        # None advances exactly one move.
+        if inputs:
+            pairs = inputs.items() if isinstance(inputs, dict) else enumerate(inputs)
+            for i, d in pairs:
+                if d is not None and 0 <= i < self.num_players:
+                    self.dirs[i] = tuple(d)
+        if dt is None:
+            self.sim_time += self.move_delay
+            self.step()
+            return None
+        self.accumulator += dt
+        while self.accumulator >= self.move_delay:
+            self.accumulator -= self.move_delay
+            self.sim_time += self.move_delay
+            self.step()
+        return None
+
+    def step(self):
+        # advance every snake by one cell; all checks are O(1) via the occupancy grid
+        cols, rows, occ = self.cols, self.rows, self.occ
+        occupy, vacate = self._occupy, self._vacate
+        for i in range(self.num_players):
+            body = self.snakes[i]
+            if not body: continue
+            x,y = body[0]
+            dx,dy = self.dirs[i]
+            nx, ny = x+dx, y+dy
+            # occ covers this snake and every other player, tails included
+            lost = (nx<0 or nx>=cols or ny<0 or ny>=rows or occ[ny*cols + nx])
+            if lost:
+                self.lives[i] -= 1
+                for sx, sy in body:
+                    vacate(sy*cols + sx)
+                start = self.respawn_pos(i) if self.lives[i] > 0 else None
+                if start:
+                    self.snakes[i] = deque([start])
+                    occupy(start[1]*cols + start[0], i + 1)
+                    self.dirs[i] = snake_start(self.num_players, i)[1]
+                else:
+                    self.snakes[i] = deque()
+                continue
+            nh = (nx, ny)
+            body.appendleft(nh)
+            occupy(ny*cols + nx, i + 1)
+            if nh == self.food:
+                self.lives[i] += 1
+                self.spawn_food()
+            else:
+                tx, ty = body.pop()
+                vacate(ty*cols + tx)
 
     def update(self, events):
         # handle input: WASD for P1, arrows for P2
+        inputs = [None] * self.num_players
         for e in events:
             if e.type == pygame.KEYDOWN:
-                if e.key == pygame.K_w: self.dirs[0] = (0,-1)
-                elif e.key == pygame.K_s: self.dirs[0] = (0,1)
-                elif e.key == pygame.K_a: self.dirs[0] = (-1,0)
-                elif e.key == pygame.K_d: self.dirs[0] = (1,0)
-                if self.num_players>1:
-                    if e.key == pygame.K_UP: self.dirs[1] = (0,-1)
-                    elif e.key == pygame.K_DOWN: self.dirs[1] = (0,1)
-                    elif e.key == pygame.K_LEFT: self.dirs[1] = (-1,0)
-                    elif e.key == pygame.K_RIGHT: self.dirs[1] = (1,0)
+                for i, keymap in enumerate(self.keymaps[:self.num_players]):
+                    if e.key in keymap: inputs[i] = keymap[e.key]
+        # feed real elapsed time into the fixed-step simulation
         now = pygame.time.get_ticks()
-        if now - self.last_move > self.move_delay:
-            self.last_move = now
-            for i in range(self.num_players):
-                if not self.snakes[i]: continue
-                x,y = self.snakes[i][0]
-                dx,dy = self.dirs[i]
-                nh = (x+dx, y+dy)
-                lost = (nh[0]<0 or nh[0]>=self.cols or nh[1]<0 or nh[1]>=self.rows or nh in self.snakes[i])
-                if not lost and self.num_players>1:
-                    for j in range(self.num_players):
-                        if j!=i and nh in self.snakes[j]: lost=True; break
-                if lost:
-                    self.lives[i] -= 1
-                    if self.lives[i] > 0:
-                        start = ((self.cols//2,self.rows//2) if self.num_players==1 else ((self.cols//4,self.rows//2) if i==0 else (3*self.cols//4,self.rows//2)))
-                        self.snakes[i] = [start]
-                        self.dirs[i] = (1,0) if i==0 else (-1,0)
-                    else:
-                        self.snakes[i] = []
-                    continue
-                self.snakes[i].insert(0, nh)
-                if nh == self.food:
-                    self.lives[i] += 1
-                    self.spawn_food()
-                else:
-                    self.snakes[i].pop()
-        return None
+        dt = 0 if self.last_clock is None else min(now - self.last_clock, MAX_FRAME_MS)
+        self.last_clock = now
+        return self.tick(inputs, dt)
 
     def draw(self,surf,font):
         surf.fill(BG_COLOR)
         pygame.draw.rect(surf, WHITE, (self.offset_x, self.offset_y, self.cols*self.cell, self.rows*self.cell), 2)
-        pygame.draw.rect(surf, LIGHT_CYAN, (self.food[0]*self.cell + self.offset_x, self.food[1]*self.cell + self.offset_y, self.cell, self.cell))
+        if self.food:
+            pygame.draw.rect(surf, LIGHT_CYAN, (self.food[0]*self.cell + self.offset_x, self.food[1]*self.cell + self.offset_y, self.cell, self.cell))
         for i, snake in enumerate(self.snakes):
             col = self.player_colors[i]
             for seg in snake:
                 pygame.draw.rect(surf, col, (seg[0]*self.cell + self.offset_x, seg[1]*self.cell + self.offset_y, self.cell, self.cell))
-        # display lives
+        self.draw_lives(surf, font)
+
+    def draw_lives(self, surf, font):
         for i in range(self.num_players):
-            txt = font.render(f"P{i+1} Lives: {self.lives[i]}", True, WHITE)
+            txt = render_text(font, f"P{i+1} Lives: {self.lives[i]}", WHITE)
             x = 10 if i==0 else WIDTH - txt.get_width() - 10
             surf.blit(txt, (x, 10))
+        self.drawn_lives = list(self.lives)
+
+    def draw_dirty(self, surf, font):
+        # repaint only the cells changed since the last call and, when lives
+        # changed, the HUD band above the board; returns the rects to push.
+        # hud_repainted tells the caller its own HUD overlays were wiped.
+        self.hud_repainted = self.needs_full_redraw
+        if self.needs_full_redraw:
+            self.draw(surf, font)
+            self.needs_full_redraw = False
+            self.dirty.clear()
+            return [surf.get_rect()]
+        c, cols = self.cell, self.cols
+        board = pygame.Rect(self.offset_x, self.offset_y, cols*c, self.rows*c)
+        food = self.food[1]*cols + self.food[0] if self.food else -1
+        rects = []
+        for cell in self.dirty:
+            x, y = cell % cols, cell // cols
+            r = pygame.Rect(x*c + self.offset_x, y*c + self.offset_y, c, c)
+            owner = self.occ[cell]
+            if owner:
+                surf.fill(self.player_colors[owner-1], r)
+            elif cell == food:
+                surf.fill(LIGHT_CYAN, r)
+            else:
+                surf.fill(BG_COLOR, r)
+                if x in (0, cols-1) or y in (0, self.rows-1):
+                    # edge cells share pixels with the border line
+                    surf.set_clip(r)
+                    pygame.draw.rect(surf, WHITE, board, 2)
+                    surf.set_clip(None)
+            rects.append(r)
+        self.dirty.clear()
+        if self.lives != self.drawn_lives:
+            band = pygame.Rect(0, 0, WIDTH, self.offset_y)
+            surf.fill(BG_COLOR, band)
+            self.draw_lives(surf, font)
+            rects.append(band)
+            self.hud_repainted = True
+        return rects
+
+    def to_dict(self):
+        # save snapshot: fresh containers only, safe to serialize on another thread
+        return {
+            "snakes": [list(seg) for seg in self.snakes],
+            "dirs": list(self.dirs),
+            "lives": list(self.lives),
+            "food": self.food,
+            "powers": [dict(p) for p in self.powers],
+            "move_delay": self.move_delay
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        g = cls(len(data['snakes']))
+        g.snakes = [deque(map(tuple, snake)) for snake in data['snakes']]
+        g.dirs = [tuple(d) for d in data['dirs']]
+        g.lives = list(data['lives'])
+        g.food = tuple(data['food']) if data['food'] else None
+        g.powers = [{'type':p['type'],'pos':tuple(p['pos']),'color':tuple(p['color']),'mult':p['mult']} for p in data['powers']]
+        g.move_delay = data['move_delay']
+        g.rebuild_occupancy()
+        return g
+
+    def thumbnail(self):
+        # one char per cell, chr(48 + palette index): players 1.., food last
+        food = len(self.player_colors) + 1
+        cells = bytearray(self.occ)
+        if self.food:
+            cells[self.food[1]*self.cols + self.food[0]] = food
+        digits = bytes(b + 48 for b in cells).decode()
+        cols = self.cols
+        return {"palette": [BG_COLOR, *self.player_colors, LIGHT_CYAN],
+                "rows": [digits[i:i+cols] for i in range(0, len(digits), cols)]}
 
 # Tetris game
 class TetrisGame:
-    shapes={
-        'I':[[(1,1,1,1)],[(1,),(1,),(1,),(1,)]],
-        'O':[[(1,1),(1,1)]],
-        'T':[[(0,1,0),(1,1,1)],[(1,0),(1,1),(1,0)],[(1,1,1),(0,1,0)],[(0,1),(1,1),(0,1)]],
-        'S':[[(0,1,1),(1,1,0)],[(1,0),(1,1),(0,1)]],
-        'Z':[[(1,1,0),(0,1,1)],[(0,1),(1,1),(1,0)]],
-        'J':[[(1,0,0),(1,1,1)],[(1,1),(1,0),(1,0)],[(1,1,1),(1,0,0)],[(0,1),(0,1),(1,1)]],
-        'L':[[(0,0,1),(1,1,1)],[(1,0),(1,0),(1,1)],[(1,1,1),(1,0,0)],[(1,1),(0,1),(0,1)]]
-    }
+    shapes=TETROMINOES
     colors={'I':CYAN,'O':YELLOW,'T':LIGHT_CYAN,'S':BLUE,'Z':MAGENTA,'J':MED_CYAN,'L':WHITE}
-    def __init__(self):
-        self.cols=10; self.rows=20; self.cell=30
-        self.grid=[[None for _ in range(self.cols)] for __ in range(self.rows)]
+    # locked cells store an index into palette; 0 means empty. The palette is
+    # fixed: colours from older saves map to the nearest piece colour
+    palette=(None, *colors.values())
+    color_index={k: i+1 for i, k in enumerate(colors)}
+    rotations=ROTATIONS
+    keymap={pygame.K_LEFT:'left', pygame.K_RIGHT:'right', pygame.K_DOWN:'down', pygame.K_UP:'rotate', pygame.K_w:'rotate'}
+    def __init__(self, autoplay=False):
+        self.cols=TETRIS_COLS; self.rows=TETRIS_ROWS; self.cell=30
+        # bitboard: one int per row (bit j = column j) plus parallel palette indices
+        self.full_row=(1 << self.cols) - 1
+        self.row_masks=[0]*self.rows
+        self.row_colors=[bytearray(self.cols) for _ in range(self.rows)]
         self.score=0; self.level=1; self.lines=0; self.over=False
         self.new_piece()
-        self.gravity_event=pygame.USEREVENT+1
-        pygame.time.set_timer(self.gravity_event, max(50,500 - (self.level-1)*50))
+        # per-instance gravity: simulation clock (ms) and accumulator, no pygame timers
+        self.sim_time=0; self.gravity_acc=0; self.last_clock=None
+        # autoplay: the AI places one piece per ai_delay ms instead of gravity stepping
+        self.autoplay=autoplay; self.ai=None; self.ai_delay=50
+    @staticmethod
+    def gravity_delay(level):
+        return max(50,500 - (level-1)*50)
     def new_piece(self):
         self.shape=random.choice(list(self.shapes.keys())); self.rot=0
-        self.pattern=self.shapes[self.shape][self.rot]
-        self.x=self.cols//2 - len(self.pattern[0])//2; self.y=0
-        if self.collide(self.x,self.y,self.pattern): self.over=True
+        self.piece=self.rotations[self.shape][self.rot]
+        self.x=spawn_x(self.piece); self.y=0
+        if self.collide(self.x,self.y,self.piece): self.over=True
     def rotate(self):
-        r=(self.rot+1)%len(self.shapes[self.shape])
-        patt=self.shapes[self.shape][r]
-        if not self.collide(self.x,self.y,patt): self.rot=r; self.pattern=patt
-    def collide(self,x,y,patt):
-        for i,row in enumerate(patt):
-            for j,val in enumerate(row):
-                if val:
-                    if x+j<0 or x+j>=self.cols or y+i>=self.rows or (y+i>=0 and self.grid[y+i][x+j]):
-                        return True
+        r=(self.rot+1)%len(self.rotations[self.shape])
+        piece=self.rotations[self.shape][r]
+        if not self.collide(self.x,self.y,piece): self.rot=r; self.piece=piece
+    @classmethod
+    def palette_index(cls, color):
+        color=tuple(color)
+        pal=cls.palette
+        if color in pal: return pal.index(color)
+        return min(range(1,len(pal)), key=lambda i: sum((a-b)**2 for a,b in zip(pal[i],color)))
+    @property
+    def pattern(self): return self.piece.pattern
+    @property
+    def grid(self):
+        # colour-tuple view of the board (rows of colour or None), used by saves
+        pal=self.palette
+        return [[pal[c] for c in row] for row in self.row_colors]
+    @grid.setter
+    def grid(self, rows):
+        self.row_masks=[0]*self.rows
+        self.row_colors=[bytearray(self.cols) for _ in range(self.rows)]
+        for i,row in enumerate(rows):
+            for j,color in enumerate(row):
+                if not color: continue
+                self.row_masks[i] |= 1 << j
+                self.row_colors[i][j]=self.palette_index(color)
+    def collide(self,x,y,piece):
+        # patterns are tight boxes, so wall/floor tests reduce to bounds checks
+        if x<0 or x+piece.width>self.cols or y+piece.height>self.rows: return True
+        board=self.row_masks
+        for i,m in enumerate(piece.masks):
+            if y+i>=0 and board[y+i] & (m << x): return True
         return False
     def lock(self):
-        for i,row in enumerate(self.pattern):
-            for j,val in enumerate(row):
-                if val and self.y+i>=0: self.grid[self.y+i][self.x+j]=self.colors[self.shape]
-        newg=[]; cleared=0
-        for row in self.grid:
-            if None not in row: cleared+=1
-            else: newg.append(row)
-        for _ in range(cleared): newg.insert(0,[None]*self.cols)
-        self.grid=newg; self.lines+=cleared; self.score+=cleared*100
+        ci=self.color_index[self.shape]; x,y=self.x,self.y
+        for i,m in enumerate(self.piece.masks):
+            if y+i>=0: self.row_masks[y+i] |= m << x
+        for dx,dy in self.piece.cells:
+            if y+dy>=0: self.row_colors[y+dy][x+dx]=ci
+        full=self.full_row
+        keep=[r for r in range(self.rows) if self.row_masks[r]!=full]
+        cleared=self.rows-len(keep)
+        if cleared:
+            self.row_masks=[0]*cleared + [self.row_masks[r] for r in keep]
+            self.row_colors=[bytearray(self.cols) for _ in range(cleared)] + [self.row_colors[r] for r in keep]
+        self.lines+=cleared; self.score+=cleared*LINE_SCORE
         if self.lines//10+1>self.level:
             self.level+=1
-            pygame.time.set_timer(self.gravity_event, max(50,500 - (self.level-1)*50))
         self.new_piece()
-    def update(self, events):
-        for e in events:
-            if e.type==pygame.KEYDOWN:
-                if e.key==pygame.K_LEFT and not self.collide(self.x-1,self.y,self.pattern): self.x-=1
-                if e.key==pygame.K_RIGHT and not self.collide(self.x+1,self.y,self.pattern): self.x+=1
-                if e.key==pygame.K_DOWN and not self.collide(self.x,self.y+1,self.pattern): self.y+=1
-                if e.key in (pygame.K_UP,pygame.K_w): self.rotate()
-            if e.type==self.gravity_event:
-                if not self.collide(self.x,self.y+1,self.pattern): self.y+=1
-                else: self.lock()
-        if getattr(self,"over",False): return ("Tetris",self.score)
+    def move(self, action):
+        if action=='left' and not self.collide(self.x-1,self.y,self.piece): self.x-=1
+        elif action=='right' and not self.collide(self.x+1,self.y,self.piece): self.x+=1
+        elif action=='down' and not self.collide(self.x,self.y+1,self.piece): self.y+=1
+        elif action=='rotate': self.rotate()
+    def fall(self):
+        # one gravity step
+        if not self.collide(self.x,self.y+1,self.piece): self.y+=1
+        else: self.lock()
+    def reachable(self):
+        # (rot, x) positions the piece can reach at its current row with the
+        # player's moves (left, right, rotate as in move()/rotate()): BFS from
+        # where it is now, so a wall or overhang between the piece and a
+        # column blocks it even when the target cell itself is free
+        rots=self.rotations[self.shape]
+        start=(self.rot,self.x)
+        if self.collide(self.x,self.y,self.piece): return set()
+        seen={start}; todo=deque([start])
+        while todo:
+            rot,x=todo.popleft()
+            for nxt in ((rot,x-1),(rot,x+1),((rot+1)%len(rots),x)):
+                if nxt not in seen and not self.collide(nxt[1],self.y,rots[nxt[0]]):
+                    seen.add(nxt); todo.append(nxt)
+        return seen
+    def play_best(self):
+        # hard-drop the current piece at the best (rotation, x) the AI ranks
+        # that is reachable from where the piece is now; returns the move, or
+        # None (and tops out) when no ranked placement is reachable
+        if self.ai is None: self.ai=TetrisAI()
+        reach=self.reachable()
+        for rot,x in self.ai.ranked(self):
+            if (rot,x) in reach: break
+        else:
+            self.over=True
+            return None
+        self.rot,self.piece,self.x=rot,self.rotations[self.shape][rot],x
+        while not self.collide(self.x,self.y+1,self.piece): self.y+=1
+        self.lock()
+        return rot,x
+    def step_delay(self):
+        return self.ai_delay if self.autoplay else self.gravity_delay(self.level)
+    def step(self):
+        if self.autoplay: self.play_best()
+        else: self.fall()
+    def tick(self, inputs=None, dt=None):
+        # headless core: inputs is a sequence of 'left'/'right'/'down'/'rotate'
+        # (ignored under autoplay); dt is ms of simulation time for the step
+        # accumulator (None = one gravity step, or one AI placement).
+        # The level delay is re-read every step, so speed-ups apply mid-batch.
+        if not self.autoplay:
+            for action in inputs or ():
+                self.move(action)
+        if dt is None:
+            self.sim_time+=self.step_delay()
+            self.step()
+        else:
+            self.gravity_acc+=dt
+            while not self.over and self.gravity_acc>=self.step_delay():
+                delay=self.step_delay()
+                self.gravity_acc-=delay; self.sim_time+=delay
+                self.step()
+        if self.over: return ("Tetris",self.score)
         return None
+    def clone(self):
+        # cheap copy for search and what-if play: boards are ints and small bytearrays
+        g=object.__new__(type(self))
+        g.__dict__.update(self.__dict__)
+        g.row_masks=list(self.row_masks)
+        g.row_colors=[bytearray(row) for row in self.row_colors]
+        g.ai=None
+        return g
+    def update(self, events):
+        actions=[self.keymap[e.key] for e in events if e.type==pygame.KEYDOWN and e.key in self.keymap]
+        now=pygame.time.get_ticks()
+        dt=0 if self.last_clock is None else min(now-self.last_clock, MAX_FRAME_MS)
+        self.last_clock=now
+        return self.tick(actions, dt)
     def draw(self,surf,font):
         surf.fill(BG_COLOR)
         offx=WIDTH//2 - self.cols*self.cell//2; offy=HEIGHT//2 - self.rows*self.cell//2
-        for i,row in enumerate(self.grid):
-            for j,color in enumerate(row):
-                if color: pygame.draw.rect(surf,color,(offx+j*self.cell,offy+i*self.cell,self.cell,self.cell))
-        for i,row in enumerate(self.pattern):
-            for j,val in enumerate(row):
-                if val and self.y+i>=0:
-                    pygame.draw.rect(surf,self.colors[self.shape],(offx+(self.x+j)*self.cell,offy+(self.y+i)*self.cell,self.cell,self.cell))
-        txt=font.render(f"Score:{self.score}",True,WHITE); surf.blit(txt,(5,5))
-        txt2=font.render(f"Lvl:{self.level}",True,WHITE); surf.blit(txt2,(5,30))
+        pal=self.palette
+        for i,row in enumerate(self.row_colors):
+            if not self.row_masks[i]: continue
+            for j,c in enumerate(row):
+                if c: pygame.draw.rect(surf,pal[c],(offx+j*self.cell,offy+i*self.cell,self.cell,self.cell))
+        for dx,dy in self.piece.cells:
+            if self.y+dy>=0:
+                pygame.draw.rect(surf,self.colors[self.shape],(offx+(self.x+dx)*self.cell,offy+(self.y+dy)*self.cell,self.cell,self.cell))
+        txt=render_text(font,f"Score:{self.score}",WHITE); surf.blit(txt,(5,5))
+        txt2=render_text(font,f"Lvl:{self.level}",WHITE); surf.blit(txt2,(5,30))
+    def to_dict(self):
+        # the bitboard as is (row_colors hold TetrisGame.palette indices);
+        # JSON saves get the colour grid from SaveCodec.export_json
+        return {
+            "row_masks": list(self.row_masks),
+            "row_colors": [bytes(row) for row in self.row_colors],
+            "score": self.score,
+            "level": self.level,
+            "lines": self.lines,
+            "shape": self.shape,
+            "rot": self.rot,
+            "x": self.x,
+            "y": self.y,
+            "autoplay": self.autoplay
+        }
     @classmethod
     def from_dict(cls,data):
         g = cls()
-        g.grid = [[tuple(cell) if cell else None for cell in row] for row in data['grid']]
+        if 'row_masks' in data:
+            # snapshots and binary saves carry the bitboard; indices are
+            # remapped only when the save has its own palette
+            g.row_masks=list(data['row_masks'])
+            g.row_colors=[bytearray(row) for row in data['row_colors']]
+            if data.get('palette'):
+                remap=bytearray(256)
+                for i,color in enumerate(data['palette'][1:],1):
+                    remap[i]=g.palette_index(color)
+                g.row_colors=[row.translate(remap) for row in g.row_colors]
+        else:
+            g.grid = [[tuple(cell) if cell else None for cell in row] for row in data['grid']]
         g.score = data['score']
         g.level = data['level']
         g.lines = data['lines']
-        pygame.time.set_timer(g.gravity_event, max(50,500-(g.level-1)*50))
         g.shape = data['shape']
         g.rot = data['rot']
-        g.pattern = g.shapes[g.shape][g.rot]
+        g.piece = g.rotations[g.shape][g.rot]
         g.x = data['x']
         g.y = data['y']
         g.over = False
+        g.autoplay = data.get('autoplay', False)
         return g
+    def thumbnail(self):
+        # locked cells plus the falling piece, one palette digit per cell
+        cells=[bytearray(r) for r in self.row_colors]
+        c=self.color_index[self.shape]
+        for dx,dy in self.piece.cells:
+            if 0<=self.y+dy<self.rows: cells[self.y+dy][self.x+dx]=c
+        return {"palette": [BG_COLOR, *self.palette[1:]], "rows": [bytes(b+48 for b in r).decode() for r in cells]}
+
+# Tetris autoplay
+class TetrisAI:
+    # weighted heuristic over the board after a placement. Placements and
+    # features come from batch_env (TetrisBatchEnv.placements() and
+    # board_features()), so autoplay and the batch environment share one
+    # drop/line-clear/feature implementation; numpy is only imported once
+    # autoplay starts.
+    w_height, w_lines, w_holes, w_bump = -0.51, 0.76, -0.36, -0.18
+    def __init__(self, lookahead=True, width=4, cache_size=10000):
+        # width: how many of the best 1-ply candidates get the lookahead; a
+        # count, not a time budget, so a board always gets the same move
+        import batch_env
+        self.lookahead=lookahead
+        self.width=width
+        # ranked moves per (row_masks, shape); the ranking depends only on
+        # the board and piece, so repeated states (restarts, replays, batch
+        # runs from one position) skip the placement search
+        self.cache_size=cache_size
+        self.cache={}
+        self.root=batch_env.TetrisBatchEnv(1, seed=0, auto_reset=False)
+        self.shape_ids={name: i for i,name in enumerate(self.root.shape_names)}
+        # one board per (candidate, next shape) for the lookahead
+        self.ahead=batch_env.TetrisBatchEnv(width*len(self.shape_ids), seed=0, auto_reset=False)
+        self.ahead.pieces[:]=list(range(len(self.shape_ids)))*width
+    def score(self, res):
+        # heuristic per candidate, -inf where the placement does not fit
+        import numpy as np
+        s=(self.w_height*res['aggregate_height'] + self.w_lines*res['lines']
+           + self.w_holes*res['holes'] + self.w_bump*res['bumpiness'])
+        return np.where(res['valid'], s, -np.inf)
+    def ranked(self, game):
+        # every placement of the current piece as (rot, x), best first: the
+        # `width` best 1-ply candidates reordered by the expected score after
+        # one more piece (mean over the 7 shapes), then the rest by 1-ply score
+        key=(tuple(game.row_masks), game.shape)
+        moves=self.cache.get(key)
+        if moves is not None: return moves
+        import numpy as np
+        env=self.root
+        env.boards[0]=(np.array(game.row_masks)[:,None] >> np.arange(game.cols)) & 1
+        env.pieces[0]=self.shape_ids[game.shape]
+        res=env.placements()
+        first=self.score(res)[0]
+        valid=np.flatnonzero(res['valid'][0])
+        order=valid[np.argsort(-first[valid], kind='stable')]
+        if self.lookahead and order.size:
+            top=order[:self.width]
+            shapes=len(self.shape_ids)
+            ahead=self.ahead
+            ahead.boards[:]=0
+            ahead.boards[:len(top)*shapes]=np.repeat(res['boards'][0,top], shapes, axis=0)
+            second=self.score(ahead.placements()).max(axis=1)[:len(top)*shapes]
+            second=np.where(np.isfinite(second), second, -1e9).reshape(len(top), shapes)
+            expected=self.w_lines*res['lines'][0,top] + second.mean(axis=1)
+            order=np.concatenate([top[np.argsort(-expected, kind='stable')], order[len(top):]])
+        moves=tuple((int(res['rot'][0,k]), int(res['x'][0,k])) for k in order)
+        if len(self.cache)>=self.cache_size: self.cache.clear()
+        self.cache[key]=moves
+        return moves
+    def best_move(self, game):
+        # (rot, x) or None when nothing fits
+        moves=self.ranked(game)
+        return moves[0] if moves else None
 
 # Ping Pong game
 class PingPongGame:
+    # physics runs in fixed steps of 1/physics_hz s whatever the render rate;
+    # speeds stay in px per 1/ref_fps s (the old per-frame units, as in saves)
+    physics_hz = 120
+    ref_fps = 60
+
     def __init__(self):
         self.paddle_w, self.paddle_h = 10, 100
+        self.paddle_x = 20
         self.paddle_speed = 7
         self.left_y = HEIGHT//2 - self.paddle_h//2
         self.ball_radius = 8
@@ -406,224 +1157,1037 @@ class PingPongGame:
         self.ball_x = WIDTH//2
         self.ball_y = HEIGHT//2
         self.score = 0
+        self.sim_time = 0
+        self.accumulator = 0
+        self.last_clock = None
 
     def update(self, events):
         # smooth continuous paddle movement via key state polling
         keys = pygame.key.get_pressed()
+        move = 0
         if keys[pygame.K_w] or keys[pygame.K_UP]:
-            self.left_y -= self.paddle_speed
+            move -= 1
         if keys[pygame.K_s] or keys[pygame.K_DOWN]:
-            self.left_y += self.paddle_speed
+            move += 1
+        now = pygame.time.get_ticks()
+        dt = 0 if self.last_clock is None else min(now - self.last_clock, MAX_FRAME_MS)
+        self.last_clock = now
+        return self.tick(move, dt)
+
+    def tick(self, inputs=0, dt=None):
+        # headless core: inputs is the paddle direction (-1 up, 0, 1 down);
+        # dt is ms of simulation time, None advances exactly one physics step
+        step_ms = 1000 / self.physics_hz
+        if dt is None:
+            steps = 1
+        else:
+            self.accumulator += dt
+            steps = int(self.accumulator // step_ms)
+            self.accumulator -= steps * step_ms
+        for _ in range(steps):
+            self.sim_time += step_ms
+            res = self.step(inputs, step_ms / 1000)
+            if res: return res
+        return None
+
+    def step(self, move, h):
+        self.left_y += move * self.paddle_speed * self.ref_fps * h
         self.left_y = max(0, min(self.left_y, HEIGHT - self.paddle_h))
-        self.ball_x += self.ball_speed_x
-        self.ball_y += self.ball_speed_y
-        if self.ball_y - self.ball_radius <= 0 or self.ball_y + self.ball_radius >= HEIGHT:
-            self.ball_speed_y *= -1
-        if self.ball_x - self.ball_radius <= self.paddle_w + 20:
-            if self.left_y <= self.ball_y <= self.left_y + self.paddle_h:
-                self.ball_speed_x *= -1
-                self.score += 1
-            else:
-                return ("Ping Pong", self.score)
-        if self.ball_x + self.ball_radius >= WIDTH:
-            self.ball_speed_x *= -1
+        r = self.ball_radius
+        # ball-centre x at which the ball touches the paddle face
+        face = self.paddle_x + self.paddle_w + r
+        remaining = h
+        # swept collision: jump to the earliest wall/paddle contact inside the
+        # step, resolve it, then spend the rest of the step on the new heading
+        for _ in range(4):
+            vx = self.ball_speed_x * self.ref_fps
+            vy = self.ball_speed_y * self.ref_fps
+            tx = ty = math.inf
+            if vx < 0: tx = max(0, (face - self.ball_x) / vx)
+            elif vx > 0: tx = max(0, (WIDTH - r - self.ball_x) / vx)
+            if vy < 0: ty = max(0, (r - self.ball_y) / vy)
+            elif vy > 0: ty = max(0, (HEIGHT - r - self.ball_y) / vy)
+            t = min(tx, ty)
+            if t > remaining:
+                self.ball_x += vx * remaining
+                self.ball_y += vy * remaining
+                break
+            self.ball_x += vx * t
+            self.ball_y += vy * t
+            remaining -= t
+            if ty == t:
+                self.ball_speed_y *= -1
+            if tx == t:
+                if vx < 0:
+                    if self.left_y <= self.ball_y <= self.left_y + self.paddle_h:
+                        self.ball_speed_x *= -1
+                        self.score += 1
+                    else:
+                        return ("Ping Pong", self.score)
+                else:
+                    self.ball_speed_x *= -1
         return None
 
+    def to_dict(self):
+        return {
+            "left_y": self.left_y,
+            "ball_x": self.ball_x,
+            "ball_y": self.ball_y,
+            "ball_speed_x": self.ball_speed_x,
+            "ball_speed_y": self.ball_speed_y,
+            "score": self.score
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        g = cls()
+        g.left_y = data["left_y"]
+        g.ball_x = data["ball_x"]
+        g.ball_y = data["ball_y"]
+        g.ball_speed_x = data["ball_speed_x"]
+        g.ball_speed_y = data["ball_speed_y"]
+        g.score = data["score"]
+        return g
+
+    def thumbnail(self, cell=20):
+        # court downsampled to cell x cell px blocks: paddle and ball
+        cols, rows = WIDTH//cell, HEIGHT//cell
+        grid = [bytearray(b"0"*cols) for _ in range(rows)]
+        x = self.paddle_x // cell
+        for r in range(max(0, int(self.left_y)//cell), min(rows, int(self.left_y + self.paddle_h - 1)//cell + 1)):
+            grid[r][x] = ord("1")
+        bx, by = int(self.ball_x)//cell, int(self.ball_y)//cell
+        if 0 <= bx < cols and 0 <= by < rows:
+            grid[by][bx] = ord("1")
+        return {"palette": [BG_COLOR, WHITE], "rows": [r.decode() for r in grid]}
+
     def draw(self, surf, font):
         surf.fill(BG_COLOR)
-        pygame.draw.rect(surf, WHITE, (20, self.left_y, self.paddle_w, self.paddle_h))
+        pygame.draw.rect(surf, WHITE, (self.paddle_x, int(self.left_y), self.paddle_w, self.paddle_h))
         pygame.draw.circle(surf, WHITE, (int(self.ball_x), int(self.ball_y)), self.ball_radius)
-        score_surf = font.render(f"{self.score}", True, WHITE)
+        score_surf = render_text(font, f"{self.score}", WHITE)
         surf.blit(score_surf, (WIDTH - score_surf.get_width() - 20, 20))
 
 # Game Over Screen
 class GameOverScreen:
-    def __init__(self, game, score): self.game=game; self.score=score
+    def __init__(self, game, score, best=None): self.game=game; self.score=score; self.best=best
     def draw(self,surf,font):
         surf.fill(BG_COLOR)
-        t1=font.render("Game Over",True,WHITE)
-        t2=font.render(f"{self.game} Score: {self.score}",True,WHITE)
-        t3=font.render("Click to return to Menu",True,WHITE)
+        t1=render_text(font,"Game Over",WHITE)
+        t2=render_text(font,f"{self.game} Score: {self.score}",WHITE)
+        t3=render_text(font,"Click to return to Menu",WHITE)
         surf.blit(t1,(WIDTH//2-t1.get_width()//2,HEIGHT//3))
         surf.blit(t2,(WIDTH//2-t2.get_width()//2,HEIGHT//2))
         surf.blit(t3,(WIDTH//2-t3.get_width()//2,HEIGHT*2//3))
+        if self.best is not None:
+            t4=render_text(font,f"Best: {self.best}",WHITE)
+            surf.blit(t4,(WIDTH//2-t4.get_width()//2,HEIGHT//2+t2.get_height()+10))
+
+# Binary saves
+class SaveCodec:
+    # .sav layout: a 16-byte little-endian header, then the payload
+    #   4s magic "PMDS" | B schema version | B flags (bit 0: zlib) | B game id |
+    #   x pad | I payload length | I crc32 of the payload as stored
+    # payloads (before the optional zlib):
+    #   snake    - <BHhh> players, move_delay, food x/y (-1 = none); per player
+    #              <bbhH> dir, lives, length + the body's x and y as 'H' arrays;
+    #              <B> power count, each <B> type length, utf-8 type, <hhBBBd>
+    #   tetris   - <BBIHIBbbB1s> cols, rows, score, level, lines, rot, x, y,
+    #              autoplay, shape; <B> palette size + RGB triples (index 0 is
+    #              empty); rows 'H' row masks; one palette index byte per set
+    #              bit, row-major
+    #   pingpong - <dddddi> left_y, ball x/y, ball speed x/y, score
+    # decode() returns the same {"game", "data"} dict as a JSON save, except
+    # that Tetris comes back as row_masks/row_colors/palette (see from_dict).
+    #
+    # Autosave journals (.jrn): "PMDJ" | B version | 3x pad, then records of
+    #   <BII> kind, payload length, crc32 of the payload
+    #   kind 1 - keyframe: a complete .sav image, starts the file
+    #   kind 2 - delta against the state before it:
+    #     snake    - <BHhh> as above; per player <bbhHH> dir, lives, length,
+    #                new head count + their x and y arrays, newest first
+    #     tetris   - <IHIBbbB1sB> score, level, lines, rot, x, y, autoplay,
+    #                shape, changed row count; per row <BH> index, mask + the
+    #                row's palette indices
+    #     pingpong - the full (scalar) payload
+    # Replay stops at the first torn or corrupt record, so a crash in the
+    # middle of an append only loses that delta.
+    magic = b"PMDS"
+    version = 1
+    ZLIB = 1
+    header = struct.Struct("<4sBBBxII")
+    journal_magic = b"PMDJ"
+    journal_header = struct.Struct("<4sB3x")
+    record = struct.Struct("<BII")
+    KEYFRAME, DELTA = 1, 2
+    game_ids = {"snake": 1, "tetris": 2, "pingpong": 3}
+    game_names = {v: k for k, v in game_ids.items()}
+
+    def __init__(self, compress=True):
+        self.compress = compress
+
+    @staticmethod
+    def pack_array(values):
+        a = array('H', values)
+        if sys.byteorder != 'little': a.byteswap()
+        return a.tobytes()
+
+    @staticmethod
+    def unpack_array(raw, pos, n):
+        a = array('H')
+        a.frombytes(raw[pos:pos + 2*n])
+        if sys.byteorder != 'little': a.byteswap()
+        return a, pos + 2*n
+
+    def encode(self, save):
+        game = save["game"]
+        payload = getattr(self, "pack_" + game)(save["data"])
+        flags = 0
+        if self.compress:
+            packed = zlib.compress(payload)
+            if len(packed) < len(payload):
+                payload, flags = packed, self.ZLIB
+        return self.header.pack(self.magic, self.version, flags, self.game_ids[game],
+                                len(payload), zlib.crc32(payload)) + payload
+
+    def decode(self, raw):
+        if len(raw) < self.header.size:
+            raise ValueError("truncated save header")
+        magic, version, flags, game_id, size, crc = self.header.unpack_from(raw)
+        if magic != self.magic:
+            raise ValueError("not a binary save")
+        if version > self.version:
+            raise ValueError(f"save schema {version} is newer than {self.version}")
+        payload = raw[self.header.size:self.header.size + size]
+        if len(payload) != size or zlib.crc32(payload) != crc:
+            raise ValueError("save checksum mismatch")
+        if flags & self.ZLIB:
+            payload = zlib.decompress(payload)
+        game = self.game_names.get(game_id)
+        if game is None:
+            raise ValueError(f"unknown game id {game_id}")
+        return {"game": game, "data": getattr(self, "unpack_" + game)(payload)}
+
+    def read(self, path):
+        # binary saves, or the JSON import path for older ones
+        with open(path, "rb") as f:
+            raw = f.read()
+        if raw[:4] == self.magic:
+            return self.decode(raw)
+        if raw[:4] == self.journal_magic:
+            return self.replay(raw)
+        return self.import_json(json.loads(raw))
+
+    def encode_record(self, kind, payload):
+        return self.record.pack(kind, len(payload), zlib.crc32(payload)) + payload
+
+    def encode_keyframe(self, save):
+        # a whole new journal file: header + keyframe record
+        return (self.journal_header.pack(self.journal_magic, self.version)
+                + self.encode_record(self.KEYFRAME, self.encode(save)))
+
+    def encode_delta(self, delta):
+        return self.encode_record(self.DELTA, getattr(self, "pack_delta_" + delta["game"])(delta))
+
+    def replay(self, raw):
+        magic, version = self.journal_header.unpack_from(raw)
+        if version > self.version:
+            raise ValueError(f"journal schema {version} is newer than {self.version}")
+        pos = self.journal_header.size
+        save = None
+        while pos + self.record.size <= len(raw):
+            kind, size, crc = self.record.unpack_from(raw, pos)
+            payload = raw[pos + self.record.size:pos + self.record.size + size]
+            if len(payload) != size or zlib.crc32(payload) != crc:
+                break
+            pos += self.record.size + size
+            if kind == self.KEYFRAME:
+                save = self.decode(payload)
+            elif kind == self.DELTA and save is not None:
+                getattr(self, "apply_delta_" + save["game"])(save["data"], payload)
+        if save is None:
+            raise ValueError("journal has no keyframe")
+        return save
+
+    @staticmethod
+    def export_json(save):
+        # JSON saves keep the colour grid; Tetris bitboard snapshots are
+        # expanded here, on the SaveWriter thread
+        data = save["data"]
+        if "row_masks" in data:
+            pal = data.get("palette") or TetrisGame.palette
+            grid = [[list(pal[c]) if c else None for c in row] for row in data["row_colors"]]
+            rest = {k: v for k, v in data.items() if k not in ("row_masks", "row_colors", "palette")}
+            save = dict(save, data={"grid": grid, **rest})
+        return json.dumps(save).encode()
+
+    @staticmethod
+    def import_json(save):
+        # {"game", "data"} JSON saves as written before .sav, plus the legacy
+        # single-snake layout {"snake": [[x, y], ...], "dir": [dx, dy], ...},
+        # either bare or wrapped in {"game": "snake", "data": ...}
+        data = save.get("data", save)
+        if "snake" in data and "snakes" not in data:
+            lives = data.get("lives", 3)
+            return {"game": "snake", "data": {
+                "snakes": [data["snake"]],
+                "dirs": [data.get("dir", (1, 0))],
+                "lives": lives if isinstance(lives, list) else [lives],
+                "food": data.get("food"),
+                "powers": data.get("powers", []),
+                "move_delay": data.get("move_delay", 150)
+            }}
+        if save.get("game") not in SaveCodec.game_ids:
+            raise ValueError("unrecognised save file")
+        return save
+
+    def pack_snake(self, d):
+        food = d["food"] or (-1, -1)
+        out = [struct.pack("<BHhh", len(d["snakes"]), d["move_delay"], food[0], food[1])]
+        for body, (dx, dy), lives in zip(d["snakes"], d["dirs"], d["lives"]):
+            out.append(struct.pack("<bbhH", dx, dy, lives, len(body)))
+            out.append(self.pack_array([x for x, _ in body]))
+            out.append(self.pack_array([y for _, y in body]))
+        out.append(struct.pack("<B", len(d["powers"])))
+        for p in d["powers"]:
+            kind = p["type"].encode()
+            out.append(struct.pack("<B", len(kind)) + kind)
+            out.append(struct.pack("<hhBBBd", *p["pos"], *p["color"], p["mult"]))
+        return b"".join(out)
+
+    def unpack_snake(self, raw):
+        players, move_delay, fx, fy = struct.unpack_from("<BHhh", raw)
+        pos = struct.calcsize("<BHhh")
+        snakes, dirs, lives = [], [], []
+        for _ in range(players):
+            dx, dy, n_lives, n = struct.unpack_from("<bbhH", raw, pos)
+            pos += struct.calcsize("<bbhH")
+            xs, pos = self.unpack_array(raw, pos, n)
+            ys, pos = self.unpack_array(raw, pos, n)
+            snakes.append(list(zip(xs, ys)))
+            dirs.append((dx, dy))
+            lives.append(n_lives)
+        powers = []
+        for _ in range(raw[pos]):
+            size = raw[pos+1]
+            kind = raw[pos+2:pos+2+size].decode()
+            pos += 2 + size
+            px, py, r, g, b, mult = struct.unpack_from("<hhBBBd", raw, pos)
+            pos += struct.calcsize("<hhBBBd")
+            powers.append({'type': kind, 'pos': (px, py), 'color': (r, g, b), 'mult': mult})
+        return {"snakes": snakes, "dirs": dirs, "lives": lives,
+                "food": (fx, fy) if fx >= 0 else None, "powers": powers, "move_delay": move_delay}
+
+    def pack_delta_snake(self, d):
+        food = d["food"] or (-1, -1)
+        out = [struct.pack("<BHhh", len(d["players"]), d["move_delay"], food[0], food[1])]
+        for dx, dy, lives, length, heads in d["players"]:
+            out.append(struct.pack("<bbhHH", dx, dy, lives, length, len(heads)))
+            out.append(self.pack_array([x for x, _ in heads]))
+            out.append(self.pack_array([y for _, y in heads]))
+        return b"".join(out)
+
+    def apply_delta_snake(self, d, raw):
+        players, move_delay, fx, fy = struct.unpack_from("<BHhh", raw)
+        pos = struct.calcsize("<BHhh")
+        for i in range(players):
+            dx, dy, lives, length, n = struct.unpack_from("<bbhHH", raw, pos)
+            pos += struct.calcsize("<bbhHH")
+            xs, pos = self.unpack_array(raw, pos, n)
+            ys, pos = self.unpack_array(raw, pos, n)
+            d["snakes"][i] = (list(zip(xs, ys)) + d["snakes"][i])[:length]
+            d["dirs"][i] = (dx, dy)
+            d["lives"][i] = lives
+        d["food"] = (fx, fy) if fx >= 0 else None
+        d["move_delay"] = move_delay
+
+    def pack_tetris(self, d):
+        # straight from the bitboard: row_colors are 0 exactly where a mask
+        # bit is clear, so dropping the zero bytes leaves one index per set bit
+        row_colors = d["row_colors"]
+        rows, cols = len(row_colors), len(row_colors[0])
+        palette = (d.get("palette") or TetrisGame.palette)[1:]
+        out = [struct.pack("<BBIHIBbbB1s", cols, rows, d["score"], d["level"], d["lines"], d["rot"],
+                           d["x"], d["y"], bool(d["autoplay"]), d["shape"].encode()),
+               struct.pack("<B", len(palette)), b"".join(bytes(c) for c in palette),
+               self.pack_array(d["row_masks"]), b"".join(bytes(row).translate(None, b"\0") for row in row_colors)]
+        return b"".join(out)
+
+    def unpack_tetris(self, raw):
+        fmt = "<BBIHIBbbB1s"
+        cols, rows, score, level, lines, rot, x, y, autoplay, shape = struct.unpack_from(fmt, raw)
+        pos = struct.calcsize(fmt)
+        n = raw[pos]; pos += 1
+        palette = [None] + [tuple(raw[pos+3*i:pos+3*i+3]) for i in range(n)]
+        pos += 3*n
+        masks, pos = self.unpack_array(raw, pos, rows)
+        row_colors = []
+        for mask in masks:
+            row = bytearray(cols)
+            for j in range(cols):
+                if mask >> j & 1:
+                    row[j] = raw[pos]; pos += 1
+            row_colors.append(row)
+        return {"row_masks": list(masks), "row_colors": row_colors, "palette": palette,
+                "score": score, "level": level, "lines": lines, "shape": shape.decode(),
+                "rot": rot, "x": x, "y": y, "autoplay": bool(autoplay)}
+
+    def pack_delta_tetris(self, d):
+        out = [struct.pack("<IHIBbbB1sB", d["score"], d["level"], d["lines"], d["rot"], d["x"], d["y"],
+                           bool(d["autoplay"]), d["shape"].encode(), len(d["rows"]))]
+        for i, mask, colors in d["rows"]:
+            out.append(struct.pack("<BH", i, mask) + colors)
+        return b"".join(out)
+
+    def apply_delta_tetris(self, d, raw):
+        fmt = "<IHIBbbB1sB"
+        score, level, lines, rot, x, y, autoplay, shape, n = struct.unpack_from(fmt, raw)
+        pos = struct.calcsize(fmt)
+        cols = len(d["row_colors"][0])
+        for _ in range(n):
+            i, mask = struct.unpack_from("<BH", raw, pos)
+            pos += 3
+            d["row_masks"][i] = mask
+            d["row_colors"][i] = bytearray(raw[pos:pos + cols])
+            pos += cols
+        d.update(score=score, level=level, lines=lines, rot=rot, x=x, y=y,
+                 autoplay=bool(autoplay), shape=shape.decode())
+
+    def pack_pingpong(self, d):
+        return struct.pack("<dddddi", d["left_y"], d["ball_x"], d["ball_y"],
+                           d["ball_speed_x"], d["ball_speed_y"], d["score"])
+
+    def unpack_pingpong(self, raw):
+        keys = ("left_y", "ball_x", "ball_y", "ball_speed_x", "ball_speed_y", "score")
+        return dict(zip(keys, struct.unpack("<dddddi", raw)))
+
+    def pack_delta_pingpong(self, d):
+        return self.pack_pingpong(d["data"])
+
+    def apply_delta_pingpong(self, d, raw):
+        d.update(self.unpack_pingpong(raw))
+
+save_codec = SaveCodec(SAVE_ZLIB)
+
+# Background persistence
+class SaveWriter:
+    # one worker thread writes every file the hub persists. Callers hand
+    # over a snapshot (fresh dicts/lists nobody mutates afterwards, e.g.
+    # to_dict()); the worker serializes it, fsyncs a temp file and
+    # os.replace()s it over the target, so a crash leaves the old or the new
+    # file, never a truncated one. A newer snapshot for a path still waiting
+    # in the queue replaces the older one (and its callback). append() adds
+    # records to the end of a file instead (autosave journals); appends for a
+    # path are written in submission order, after any replace queued before them.
+    # remove() queues a delete, which drops anything still queued for the path.
+    REMOVE = object()
+
+    def __init__(self):
+        self.pending = OrderedDict()
+        self.cond = threading.Condition()
+        self.current = None
+        self.thread = None
+
+    def submit(self, path, data, done=None, encode=None):
+        # encode(data) -> bytes runs on the worker (default: JSON);
+        # done(nbytes) runs there too, once the file is in place
+        with self.cond:
+            self.pending[path] = (data, done, encode, [])
+            self.wake()
+
+    def append(self, path, data, encode):
+        with self.cond:
+            entry = self.pending.get(path)
+            if entry is None:
+                self.pending[path] = (None, None, None, [(data, encode)])
+            else:
+                entry[3].append((data, encode))
+            self.wake()
+
+    def remove(self, path):
+        with self.cond:
+            self.pending[path] = (self.REMOVE, None, None, [])
+            self.wake()
+
+    def wake(self):
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.run, name="SaveWriter", daemon=True)
+            self.thread.start()
+        self.cond.notify_all()
+
+    def run(self):
+        while True:
+            with self.cond:
+                while not self.pending:
+                    self.cond.wait()
+                path, (data, done, encode, appends) = self.pending.popitem(last=False)
+                self.current = path
+            try:
+                tail = b"".join(enc(item) for item, enc in appends)
+                if data is self.REMOVE:
+                    size = 0
+                    if os.path.exists(path): os.remove(path)
+                elif data is None:
+                    size = self.write_tail(path, tail)
+                else:
+                    size = self.write(path, (encode(data) if encode else json.dumps(data).encode()) + tail)
+                if done: done(size)
+            except Exception as e:
+                print(f"[ERROR] writing {path}: {e}")
+            with self.cond:
+                self.current = None
+                self.cond.notify_all()
+
+    @staticmethod
+    def write(path, raw):
+        tmp = path + ".tmp"
+        try:
+            with open(tmp, "wb") as f:
+                f.write(raw)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, path)
+        except BaseException:
+            # a failed write (disk full, bad path) leaves no stray temp file
+            try: os.remove(tmp)
+            except OSError: pass
+            raise
+        # make the rename itself durable; directories cannot be opened or
+        # fsynced everywhere (Windows), where this is skipped
+        try:
+            fd = os.open(os.path.dirname(path) or ".", os.O_RDONLY)
+            try: os.fsync(fd)
+            finally: os.close(fd)
+        except OSError:
+            pass
+        return len(raw)
+
+    @staticmethod
+    def write_tail(path, raw):
+        with open(path, "ab") as f:
+            f.write(raw)
+            f.flush()
+            os.fsync(f.fileno())
+            return f.tell()
+
+    def busy(self, path):
+        # path is queued or being written
+        with self.cond:
+            return path in self.pending or self.current == path
+
+    def flush(self, path=None, timeout=None):
+        # wait until path (or everything) is on disk; False on timeout
+        def idle():
+            if path is None:
+                return not self.pending and self.current is None
+            return path not in self.pending and self.current != path
+        with self.cond:
+            return self.cond.wait_for(idle, timeout)
+
+save_writer = SaveWriter()
+atexit.register(save_writer.flush)
+
+# Save slot catalog
+class SaveIndex:
+    # saves/<game>/index.json maps each slot file to what the load menus show
+    # (score, lives, level, timestamp, size, mtime and a board thumbnail), so
+    # opening a slot list or detail view never reads a save the app already
+    # knows. It is updated on save and delete. Opening a slot list also lists
+    # the folder and stats each file: saves copied in, edited or removed
+    # outside the app (and every file, when the index is missing or outdated)
+    # are re-read or dropped then.
+    name = "index.json"
+    # bumped whenever a rescan would index more than before (2: .sav, .jrn
+    # and legacy JSON saves), so older catalogs are rebuilt
+    version = 2
+    games = {"snake": SnakeGame, "tetris": TetrisGame, "pingpong": PingPongGame}
+
+    def __init__(self, folder, game):
+        self.folder = folder
+        self.game = game
+        self.path = os.path.join(folder, self.name)
+        self.slots = None
+        self.skipped = {}
+        # set_size runs on the SaveWriter thread, everything else on the frame
+        # thread; reentrant since the public methods call each other. Taken
+        # before SaveWriter's lock, never while holding it
+        self.lock = threading.RLock()
+
+    def entries(self):
+        # (file name, meta) pairs in file name order, checked against the folder
+        with self.lock:
+            self.load()
+            self.sync()
+            return sorted(self.slots.items())
+
+    def get(self, fname):
+        with self.lock:
+            self.load()
+            return self.slots.get(fname)
+
+    def known(self):
+        # catalogued file names in order, as of the last sync (no folder scan)
+        with self.lock:
+            self.load()
+            return sorted(self.slots)
+
+    def load(self):
+        with self.lock:
+            if self.slots is not None:
+                return
+            try:
+                with open(self.path, "r") as f:
+                    index = json.load(f)
+                if index.get("version") == self.version:
+                    self.slots = index["slots"]
+                    return
+            except:
+                pass
+            # the next sync() re-reads every save in the folder
+            self.slots = {}
+            print(f"[INDEX] rebuilding {self.path}")
+
+    def sync(self):
+        # one listdir + a stat per file; only files whose mtime differs from
+        # the entry (or that have none) are read. Files SaveWriter still has
+        # queued or in flight are the app's own and left alone.
+        with self.lock:
+            try: names = [f for f in os.listdir(self.folder) if f.endswith(('.json', SAVE_EXT, JOURNAL_EXT)) and f != self.name]
+            except OSError: names = []
+            changed = False
+            for fname in set(self.slots) - set(names):
+                if not save_writer.busy(os.path.join(self.folder, fname)):
+                    del self.slots[fname]
+                    changed = True
+                    print(f"[INDEX] dropped {fname} (not on disk)")
+            for fname in names:
+                path = os.path.join(self.folder, fname)
+                if save_writer.busy(path): continue
+                try: mtime = os.stat(path).st_mtime_ns
+                except OSError: continue
+                meta = self.slots.get(fname)
+                if (meta is None or meta.get("mtime") != mtime) and self.skipped.get(fname) != mtime:
+                    changed |= self.add_file(fname, write=False)
+            if changed: self.write()
+
+    def add_file(self, fname, write=True):
+        # index a save already on disk by reading it back; True if it was added
+        with self.lock:
+            path = os.path.join(self.folder, fname)
+            try:
+                data = save_codec.read(path)
+                game = self.games[data["game"]].from_dict(data["data"])
+            except Exception as e:
+                print(f"[INDEX] skipped {fname}: {e}")
+                # not retried until the file changes
+                try: self.skipped[fname] = os.stat(path).st_mtime_ns
+                except OSError: pass
+                return False
+            self.record(fname, game, write)
+            return True
+
+    def record(self, fname, game, write=True, size=None):
+        # size None stats the file; new saves pass 0 and fill size and mtime
+        # in via set_size
+        with self.lock:
+            self.load()
+            mtime = None
+            if size is None:
+                st = os.stat(os.path.join(self.folder, fname))
+                size, mtime = st.st_size, st.st_mtime_ns
+            name_no_ext = os.path.splitext(fname)[0]
+            lives = getattr(game, 'lives', None)
+            self.slots[fname] = {
+                "game": self.game,
+                "title": name_no_ext[:-16] or 'save',
+                "timestamp": name_no_ext[-15:],
+                "score": getattr(game, 'score', None),
+                "lives": list(lives) if lives is not None else None,
+                "level": getattr(game, 'level', None),
+                "size": size,
+                "mtime": mtime,
+                "thumb": game.thumbnail(),
+            }
+            if write: self.write()
+
+    def set_size(self, fname, size):
+        # SaveWriter callback (worker thread) once the save is on disk
+        with self.lock:
+            meta = self.slots.get(fname)
+            if meta is not None:
+                try: mtime = os.stat(os.path.join(self.folder, fname)).st_mtime_ns
+                except OSError: mtime = None
+                self.slots[fname] = dict(meta, size=size, mtime=mtime)
+                self.write()
+
+    def remove(self, fname):
+        with self.lock:
+            self.load()
+            if self.slots.pop(fname, None) is not None:
+                self.write()
+
+    def write(self):
+        # entries are replaced, never edited, so a shallow copy is a snapshot
+        with self.lock:
+            save_writer.submit(self.path, {"version": self.version, "game": self.game, "slots": dict(self.slots)})
+
+    @staticmethod
+    def summary(meta):
+        # one short line for the detail view
+        if meta.get("level") is not None:
+            return f"{meta['score']}  Lv {meta['level']}"
+        if meta.get("lives") is not None:
+            return "Lives " + "/".join(str(n) for n in meta["lives"])
+        return str(meta.get("score", ""))
+
+    @staticmethod
+    def thumbnail_surface(thumb, max_size):
+        # palette-digit rows -> surface scaled to fit max_size
+        rows = thumb["rows"]
+        pal = thumb["palette"]
+        w, h = len(rows[0]), len(rows)
+        surf = pygame.Surface((w, h))
+        surf.fill(tuple(pal[0]))
+        for y, row in enumerate(rows):
+            for x, ch in enumerate(row):
+                if ch != "0": surf.set_at((x, y), tuple(pal[ord(ch) - 48]))
+        scale = min(max_size[0] / w, max_size[1] / h)
+        return pygame.transform.scale(surf, (max(1, int(w*scale)), max(1, int(h*scale))))
+
+# Crash autosave
+class Autosaver:
+    # while a game is played, every interval_ms of play it journals the run
+    # to saves/<game>/autosave_<ts>.jrn (format in SaveCodec): a keyframe when
+    # the journal starts and after every keyframe_every deltas, and small
+    # deltas in between. The frame loop only diffs against what it journalled
+    # last (new Snake heads, changed Tetris rows, Ping Pong scalars); packing
+    # and the append happen on the SaveWriter thread. A run that ends normally
+    # (game over, Save & Quit, Quit Without Saving) drops its journal; one cut
+    # short by a crash or a closed window stays in the slot menu. Only the
+    # newest `keep` journals per game are kept.
+    keyframe_every = 20
+    keep = 3
+    names = {GameState.SNAKE: "snake", GameState.TETRIS: "tetris", GameState.PINGPONG: "pingpong"}
+
+    def __init__(self, hub, interval_ms=AUTOSAVE_MS):
+        self.hub = hub
+        self.interval_ms = interval_ms
+        self.game = None
+        self.path = None
+        self.last_write = 0
+
+    def poll(self, state, game, now):
+        if self.interval_ms <= 0 or state not in self.names:
+            return
+        if game is not self.game:
+            # a new run: its journal starts at the first interval
+            self.game, self.name, self.path = game, self.names[state], None
+            self.last_write = now
+            return
+        if now - self.last_write < self.interval_ms:
+            return
+        self.last_write = now
+        if self.path is None:
+            self.start()
+            self.keyframe(game)
+            return
+        delta = None
+        if self.deltas < self.keyframe_every:
+            delta = getattr(self, self.name + "_delta")(game)
+        if delta is None:
+            self.keyframe(game)
+        else:
+            save_writer.append(self.path, delta, save_codec.encode_delta)
+            self.deltas += 1
+
+    def start(self):
+        self.index = self.hub.slot_index(self.name)
+        # rotate: drop the oldest journals so this one makes `keep`. Runs on
+        # the frame thread, so it goes by the catalog as loaded rather than
+        # syncing with the folder (journals copied in are picked up by the
+        # next slot list sync)
+        old = [f for f in self.index.known() if f.startswith("autosave_") and f.endswith(JOURNAL_EXT)]
+        for fname in old[:max(0, len(old) - self.keep + 1)]:
+            self.delete(fname)
+        stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        self.fname = f"autosave_{stamp}{JOURNAL_EXT}"
+        self.path = os.path.join(self.index.folder, self.fname)
+
+    def keyframe(self, game):
+        # the catalog entry is refreshed with each keyframe, not each delta
+        index, fname = self.index, self.fname
+        index.record(fname, game, write=False, size=0)
+        save_writer.submit(self.path, {"game": self.name, "data": game.to_dict()},
+                           lambda size: index.set_size(fname, size), save_codec.encode_keyframe)
+        index.write()
+        self.deltas = 0
+        # baseline for the next delta
+        if self.name == "snake":
+            self.remember_snakes(game)
+            self.move_delay = game.move_delay
+        elif self.name == "tetris":
+            self.masks = list(game.row_masks)
+            self.colors = [bytes(row) for row in game.row_colors]
+
+    def remember_snakes(self, g):
+        self.heads = [body[0] if body else None for body in g.snakes]
+        self.lens = [len(body) for body in g.snakes]
+        self.lives = list(g.lives)
+        self.sim_time = g.sim_time
+
+    def snake_delta(self, g):
+        # every step adds exactly one head, so the old head must sit `steps`
+        # cells into the body (unless the whole body is new), and food adds
+        # one cell and one life at a time; anything else (a death, a respawn)
+        # needs a keyframe
+        if g.move_delay != self.move_delay:
+            return None
+        steps = (g.sim_time - self.sim_time) // g.move_delay
+        players = []
+        for i, body in enumerate(g.snakes):
+            if not body:
+                players.append((*g.dirs[i], g.lives[i], 0, []))
+                continue
+            k = min(steps, len(body))
+            if k < len(body) and body[k] != self.heads[i]:
+                return None
+            if len(body) - self.lens[i] != g.lives[i] - self.lives[i]:
+                return None
+            players.append((*g.dirs[i], g.lives[i], len(body), list(islice(body, k))))
+        self.remember_snakes(g)
+        return {"game": "snake", "food": g.food, "move_delay": g.move_delay, "players": players}
+
+    def tetris_delta(self, g):
+        rows = []
+        masks, colors = g.row_masks, g.row_colors
+        for i in range(g.rows):
+            if masks[i] != self.masks[i] or colors[i] != self.colors[i]:
+                row = bytes(colors[i])
+                rows.append((i, masks[i], row))
+                self.masks[i], self.colors[i] = masks[i], row
+        return {"game": "tetris", "score": g.score, "level": g.level, "lines": g.lines, "rot": g.rot,
+                "x": g.x, "y": g.y, "autoplay": g.autoplay, "shape": g.shape, "rows": rows}
+
+    def pingpong_delta(self, g):
+        return {"game": "pingpong", "data": g.to_dict()}
+
+    def delete(self, fname):
+        # a writer job that supersedes anything still queued for the journal,
+        # so the frame never waits on its fsync
+        save_writer.remove(os.path.join(self.index.folder, fname))
+        self.index.remove(fname)
+
+    def discard(self):
+        # the run ended normally; its crash journal is no longer needed
+        if self.path is not None:
+            self.delete(self.fname)
+            print(f"[AUTOSAVE] dropped {self.path}")
+        self.game = self.path = None
+
+# Score history
+class ScoreStore:
+    # every finished game is a row in BASE_DIR/scores.db (sqlite3, WAL):
+    #   scores(id, game, score, ts) indexed on (game, score) and (game, ts),
+    # so best/top/recent are short index scans however long the history.
+    # record() only queues the row; a writer thread with its own connection
+    # inserts whatever has queued up in one transaction, at most every
+    # batch_ms. Game keys are normalized ("Ping Pong", "ping pong" ->
+    # "pingpong"). The old scores.json is imported once, when the schema is
+    # created, and left in place.
+    schema = 1
+    batch_ms = 1000
+    insert = "INSERT INTO scores (game, score, ts) VALUES (?, ?, ?)"
+
+    def __init__(self, path, legacy=None):
+        self.path = path
+        self.legacy = legacy
+        self.db = None
+        self.pending = []
+        self.writing = []
+        self.flushing = 0
+        self.cond = threading.Condition()
+        self.thread = None
+        atexit.register(self.flush)
+
+    @staticmethod
+    def key(game):
+        return "".join(ch for ch in str(game).lower() if ch.isalnum())
+
+    def connect(self):
+        db = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        self.prepare(db)
+        return db
+
+    def prepare(self, db):
+        # schema and the one-time import; either connection may get here first
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            if db.execute("PRAGMA user_version").fetchone()[0] < self.schema:
+                db.execute("CREATE TABLE IF NOT EXISTS scores (id INTEGER PRIMARY KEY, "
+                           "game TEXT NOT NULL, score INTEGER NOT NULL, ts REAL NOT NULL)")
+                db.execute("CREATE INDEX IF NOT EXISTS scores_game_score ON scores (game, score)")
+                db.execute("CREATE INDEX IF NOT EXISTS scores_game_ts ON scores (game, ts)")
+                rows = self.legacy_rows()
+                db.executemany(self.insert, rows)
+                db.execute(f"PRAGMA user_version = {self.schema}")
+                if rows: print(f"[SCORES] imported {len(rows)} scores from {self.legacy}")
+            db.execute("COMMIT")
+        except:
+            db.execute("ROLLBACK")
+            raise
+
+    def legacy_rows(self):
+        # scores.json ({game: [score, ...]}) has no times: ts 0 keeps them oldest
+        try:
+            with open(self.legacy, "r") as f:
+                data = json.load(f)
+        except (TypeError, OSError, ValueError):
+            return []
+        return [(self.key(game), int(score), 0.0) for game, scores in data.items() for score in scores]
+
+    def open(self):
+        # main-thread connection for queries
+        if self.db is None:
+            self.db = self.connect()
+        return self.db
+
+    def record(self, game, score):
+        with self.cond:
+            self.pending.append((self.key(game), int(score), time.time()))
+            if self.thread is None:
+                self.thread = threading.Thread(target=self.run, name="ScoreStore", daemon=True)
+                self.thread.start()
+            self.cond.notify_all()
+
+    def run(self):
+        db = None
+        while True:
+            with self.cond:
+                while not self.pending:
+                    self.cond.wait()
+                # let a burst collect unless someone is waiting in flush()
+                self.cond.wait_for(lambda: self.flushing, self.batch_ms / 1000)
+                self.writing, self.pending = self.pending, []
+            try:
+                if db is None: db = self.connect()
+                db.execute("BEGIN")
+                db.executemany(self.insert, self.writing)
+                # readers hold the lock across their query and queued(), so
+                # they see the rows either in writing or in the table, never both
+                with self.cond:
+                    db.execute("COMMIT")
+                    self.writing = []
+            except Exception as e:
+                # the batch is dropped rather than retried forever
+                print(f"[ERROR] writing {len(self.writing)} scores: {e}")
+                try: db.execute("ROLLBACK")
+                except Exception: pass
+            with self.cond:
+                self.writing = []
+                self.cond.notify_all()
+
+    def flush(self, timeout=None):
+        with self.cond:
+            self.flushing += 1
+            self.cond.notify_all()
+            try:
+                return self.cond.wait_for(lambda: not self.pending and not self.writing, timeout)
+            finally:
+                self.flushing -= 1
+
+    def queued(self, key):
+        with self.cond:
+            return [row for row in self.writing + self.pending if row[0] == key]
+
+    def top(self, game, n=10):
+        # (score, ts) best first; rows still queued are merged in
+        key = self.key(game)
+        db = self.open()
+        with self.cond:
+            rows = db.execute("SELECT score, ts FROM scores WHERE game = ? "
+                              "ORDER BY score DESC LIMIT ?", (key, n)).fetchall()
+            rows += [(score, ts) for _, score, ts in self.queued(key)]
+        return sorted(rows, key=lambda r: r[0], reverse=True)[:n]
+
+    def recent(self, game, n=10):
+        # (score, ts) newest first
+        key = self.key(game)
+        db = self.open()
+        with self.cond:
+            rows = db.execute("SELECT score, ts FROM scores WHERE game = ? "
+                              "ORDER BY ts DESC, id DESC LIMIT ?", (key, n)).fetchall()
+            rows = [(score, ts) for _, score, ts in reversed(self.queued(key))] + rows
+        return rows[:n]
+
+    def best(self, game):
+        top = self.top(game, 1)
+        return top[0][0] if top else None
 
 # Main Hub
 class GameHub:
+    # icons load on first use (see AssetManager.specs)
+    snake_icon = icon_property('snake')
+    tetris_icon = icon_property('tetris')
+    pingpong_icon = icon_property('pingpong')
+    save_icon = icon_property('save')
+    load_icon = icon_property('load')
+    new_icon = icon_property('new')
+    back_icon = icon_property('back')
+    save_quit_icon = icon_property('save_quit')
+    continue_icon = icon_property('continue')
+    title_pill_icon = icon_property('title_pill')
+    datetime_icon = icon_property('datetime')
+    slot_icon = icon_property('slot')
+    delete_icon = icon_property('delete')
+    score_icon = icon_property('score')
+    hint_icon = icon_property('hint')
+    title_icon = icon_property('title')
+
     def __init__(self):
         pygame.display.set_caption("PMD742OMNI HUB")
         self.screen=pygame.display.set_mode((WIDTH,HEIGHT))
+        profiler.lap("display")
+        self.font=fonts.get("consolas",24)
+        profiler.lap("fonts")
+        self.assets = AssetManager(self.font.get_height())
         self.set_icon()
-        try: self.font=pygame.font.SysFont("consolas",24)
-        except: self.font=pygame.font.Font(None,24)
+        profiler.lap("app icon")
         self.state=GameState.MENU
-        # load snake button icon
-        try:
-            raw = pygame.image.load(os.path.join('icons','snake.png')).convert_alpha()
-            h = self.font.get_height()
-            w = raw.get_width() * h // raw.get_height()
-            self.snake_icon = pygame.transform.smoothscale(raw, (w, h))
-        except:
-            self.snake_icon = None
-        # load tetris button icon
-        try:
-            raw = pygame.image.load(os.path.join('icons','tetris.png')).convert_alpha()
-            h = self.font.get_height()
-            w = raw.get_width() * h // raw.get_height()
-            self.tetris_icon = pygame.transform.smoothscale(raw, (w, h))
-        except:
-            self.tetris_icon = None
-        # load ping pong button icon
-        try:
-            raw = pygame.image.load(os.path.join('icons','ping pong.png')).convert_alpha()
-            h = self.font.get_height()
-            w = raw.get_width() * h // raw.get_height()
-            self.pingpong_icon = pygame.transform.smoothscale(raw, (w, h))
-        except:
-            self.pingpong_icon = None
-        # load save button icon
-        try:
-            raw = pygame.image.load(os.path.join('icons','save game.png')).convert_alpha()
-            h = self.font.get_height()
-            w = raw.get_width() * h // raw.get_height()
-            self.save_icon = pygame.transform.smoothscale(raw, (w, h))
-        except:
-            self.save_icon = None
-        # load Load Progress button icon
-        try:
-            raw = pygame.image.load(os.path.join('icons','load game.png')).convert_alpha()
-            h = self.font.get_height()
-            w = raw.get_width() * h // raw.get_height()
-            self.load_icon = pygame.transform.smoothscale(raw, (w, h))
-        except:
-            self.load_icon = None
-        # load New Game button icon
-        try:
-            raw = pygame.image.load(os.path.join('icons','new game.png')).convert_alpha()
-            h = self.font.get_height()
-            w = raw.get_width() * h // raw.get_height()
-            self.new_icon = pygame.transform.smoothscale(raw, (w, h))
-        except:
-            self.new_icon = None
-        # load Back button icon
-        try:
-            raw = pygame.image.load(os.path.join('icons','back.png')).convert_alpha()
-            h = self.font.get_height()
-            w = raw.get_width() * h // raw.get_height()
-            self.back_icon = pygame.transform.smoothscale(raw, (w, h))
-        except:
-            self.back_icon = None
-        # load Save & Quit button icon
-        try:
-            raw = pygame.image.load(os.path.join('icons','Save & Quit.png')).convert_alpha()
-            h = self.font.get_height()
-            w = raw.get_width() * h // raw.get_height()
-            self.save_quit_icon = pygame.transform.smoothscale(raw, (w, h))
-        except:
-            self.save_quit_icon = None
-        # load Continue button icon
-        try:
-            raw = pygame.image.load(os.path.join('icons','Continue.png')).convert_alpha()
-            h = self.font.get_height()
-            w = raw.get_width() * h // raw.get_height()
-            self.continue_icon = pygame.transform.smoothscale(raw, (w, h))
-        except:
-            self.continue_icon = None
-        # load info pill icons
-        try:
-            raw = pygame.image.load(os.path.join('icons','title.png')).convert_alpha()
-            h = self.font.get_height()
-            w = raw.get_width() * h // raw.get_height()
-            self.title_pill_icon = pygame.transform.smoothscale(raw, (w, h))
-        except:
-            self.title_pill_icon = None
-        try:
-            raw = pygame.image.load(os.path.join('icons','Date & Time.png')).convert_alpha()
-            h = self.font.get_height()
-            w = raw.get_width() * h // raw.get_height()
-            self.datetime_icon = pygame.transform.smoothscale(raw, (w, h))
-        except:
-            self.datetime_icon = None
-        # load slot button icon
-        try:
-            raw = pygame.image.load(os.path.join(BASE_DIR, 'icons','Slot.png')).convert_alpha()
-            h = self.font.get_height()
-            w = raw.get_width() * h // raw.get_height()
-            self.slot_icon = pygame.transform.smoothscale(raw, (w, h))
-        except:
-            self.slot_icon = None
-        # load delete slot button icon
-        try:
-            raw = pygame.image.load(os.path.join(BASE_DIR, 'icons','delete.png')).convert_alpha()
-            h = self.font.get_height()
-            w = raw.get_width() * h // raw.get_height()
-            self.delete_icon = pygame.transform.smoothscale(raw, (w, h))
-        except:
-            self.delete_icon = None
-        # load score display icon
-        try:
-            raw = pygame.image.load(os.path.join('icons','score.png')).convert_alpha()
-            h = self.font.get_height()
-            w = raw.get_width() * h // raw.get_height()
-            self.score_icon = pygame.transform.smoothscale(raw, (w, h))
-        except:
-            self.score_icon = None
-        # load pause hint icon
-        try:
-            raw = pygame.image.load(os.path.join('icons','hints.png')).convert_alpha()
-            h = self.font.get_height()
-            w = raw.get_width() * h // raw.get_height()
-            self.hint_icon = pygame.transform.smoothscale(raw, (w, h))
-        except:
-            self.hint_icon = None
-        # unify icon sizes to Save Progress icon dimensions
-        if self.save_icon:
-            size = self.save_icon.get_size()
-            if self.snake_icon:
-                self.snake_icon = pygame.transform.smoothscale(self.snake_icon, size)
-            if self.tetris_icon:
-                self.tetris_icon = pygame.transform.smoothscale(self.tetris_icon, size)
-            if getattr(self, 'load_icon', None):
-                self.load_icon = pygame.transform.smoothscale(self.load_icon, size)
-            if getattr(self, 'new_icon', None):
-                self.new_icon = pygame.transform.smoothscale(self.new_icon, size)
-            if getattr(self, 'back_icon', None):
-                self.back_icon = pygame.transform.smoothscale(self.back_icon, size)
-            if getattr(self, 'save_quit_icon', None):
-                self.save_quit_icon = pygame.transform.smoothscale(self.save_quit_icon, size)
-            if getattr(self, 'continue_icon', None):
-                self.continue_icon = pygame.transform.smoothscale(self.continue_icon, size)
-            if getattr(self, 'title_pill_icon', None):
-                self.title_pill_icon = pygame.transform.smoothscale(self.title_pill_icon, size)
-            if getattr(self, 'datetime_icon', None):
-                self.datetime_icon = pygame.transform.smoothscale(self.datetime_icon, size)
-            if getattr(self, 'slot_icon', None):
-                self.slot_icon = pygame.transform.smoothscale(self.slot_icon, size)
-            if getattr(self, 'delete_icon', None):
-                self.delete_icon = pygame.transform.smoothscale(self.delete_icon, size)
-            if getattr(self, 'pingpong_icon', None):
-                self.pingpong_icon = pygame.transform.smoothscale(self.pingpong_icon, size)
-        # compute uniform width for buttons
+        # frame timing (see FrameStats); the overlay text is rebuilt a few times a second
+        self.stats = FrameStats()
+        self.show_stats = False
+        self.stats_surf = None
+        self.stats_drawn = 0
+        # last drawn menu frame (see menu_key); None forces a redraw
+        self.menu_view = None
+        # composited menu backgrounds keyed by state + geometry (see static_layer)
+        self.layers = {}
+        self.layer_size = None
+        # per-slot detail pills as (key, [(surface, pos), ...]), drawn over the layer
+        self.detail_pills = None
+        # compute uniform width for buttons (loads the menu icons)
         gap, pad_x = 10, 20
-        snake_txt_w = self.font.render("Play Snake", True, WHITE).get_width()
+        snake_txt_w = self.font.size("Play Snake")[0]
         snake_icon_w = self.snake_icon.get_width() if self.snake_icon else 0
         calc_snake_w = snake_txt_w + snake_icon_w + gap + pad_x*2
-        tetris_txt_w = self.font.render("Play Tetris", True, WHITE).get_width()
+        tetris_txt_w = self.font.size("Play Tetris")[0]
         tetris_icon_w = self.tetris_icon.get_width() if self.tetris_icon else 0
         calc_tetris_w = tetris_txt_w + tetris_icon_w + gap + pad_x*2
-        pingpong_txt_w = self.font.render("Play Ping Pong", True, WHITE).get_width()
+        pingpong_txt_w = self.font.size("Play Ping Pong")[0]
         pingpong_icon_w = self.pingpong_icon.get_width() if self.pingpong_icon else 0
         calc_pingpong_w = pingpong_txt_w + pingpong_icon_w + gap + pad_x*2
-        save_txt_w = self.font.render("Save Progress", True, WHITE).get_width()
+        save_txt_w = self.font.size("Save Progress")[0]
         save_icon_w = self.save_icon.get_width() if self.save_icon else 0
         calc_save_w = save_txt_w + save_icon_w + gap + pad_x*2
-        load_txt_w = self.font.render("Load Progress", True, WHITE).get_width()
+        load_txt_w = self.font.size("Load Progress")[0]
         load_icon_w = self.load_icon.get_width() if getattr(self, 'load_icon', None) else 0
         calc_load_w = load_txt_w + load_icon_w + gap + pad_x*2
-        new_txt_w = self.font.render("Start New Game", True, WHITE).get_width()
+        new_txt_w = self.font.size("Start New Game")[0]
         new_icon_w = self.new_icon.get_width() if getattr(self, 'new_icon', None) else 0
         calc_new_w = new_txt_w + new_icon_w + gap + pad_x*2
-        back_txt_w = self.font.render("Back", True, WHITE).get_width()
+        back_txt_w = self.font.size("Back")[0]
         back_icon_w = self.back_icon.get_width() if getattr(self, 'back_icon', None) else 0
         calc_back_w = back_txt_w + back_icon_w + gap + pad_x*2
         unified_w = max(calc_snake_w, calc_tetris_w, calc_pingpong_w, calc_save_w, calc_load_w, calc_new_w, calc_back_w, 180)
@@ -635,12 +2199,6 @@ class GameHub:
         unified_size = (unified_w + 105, unified_h)
         # keep button size for submenus
         self.btn_size = unified_size
-        # load title icon under title
-        try:
-            self.title_icon = pygame.image.load(os.path.join('icons','game hub.png')).convert_alpha()
-            self.title_icon = pygame.transform.smoothscale(self.title_icon, (50, 50))
-        except:
-            self.title_icon = None
         # Main menu: three game selectors
         cx = WIDTH//2
         mid_y = HEIGHT//2
@@ -650,15 +2208,28 @@ class GameHub:
             OrbitButton("Play Tetris",    (cx, mid_y),            unified_size, self.open_tetris_menu, self.tetris_icon),
             OrbitButton("Play Ping Pong", (cx, mid_y + offset),   unified_size, self.open_pingpong_menu,    self.pingpong_icon),
         ]
+        profiler.lap("button layout")
         self.state = GameState.MENU
         self.focus_index = 0
-        self.scores = self.load_scores()
         self.over = None
         self.paused_state = None
+        # save folders, legacy migration and scores are set up after the first frame
+        self.pending_init = True
+        self.slot_scroll = 0
+        # per-game slot catalogs (see SaveIndex), loaded when a load menu first opens
+        self.slot_indexes = {}
+        self.autosave = Autosaver(self)
+        # no I/O until open() (deferred) or the first record(), so an early QUIT can still flush it
+        self.scores = ScoreStore(os.path.join(BASE_DIR, "scores.db"), os.path.join(BASE_DIR, "scores.json"))
+
+    def finish_init(self):
+        # work the first menu frame does not need; run() calls this right after it
+        self.pending_init = False
         # setup absolute save directories
         os.makedirs(os.path.join(BASE_DIR,'saves','snake'), exist_ok=True)
         os.makedirs(os.path.join(BASE_DIR,'saves','tetris'), exist_ok=True)
         os.makedirs(os.path.join(BASE_DIR,'saves','pingpong'), exist_ok=True)
+        profiler.lap("save folders (deferred)")
         # migrate legacy single-slot saves into multi-slot folders
         for game in ('snake','tetris'):
             old = os.path.join(BASE_DIR, f"{game}_save.json")
@@ -667,29 +2238,30 @@ class GameHub:
                 dest = os.path.join(BASE_DIR, 'saves', game, f"autosave_{now}.json")
                 os.rename(old, dest)
                 print(f"[MIGRATE] moved {old} to {dest}")
+                self.slot_index(game).add_file(os.path.basename(dest))
         # migrate generic savegame.json into multi-slot folders
         oldg = os.path.join(BASE_DIR, "savegame.json")
         if os.path.exists(oldg):
-            with open(oldg, "r") as _f:
-                d = json.load(_f)
-            game = d.get("game")
+            try: game = save_codec.read(oldg)["game"]
+            except Exception: game = None
             if game in ('snake','tetris'):
                 now = datetime.now().strftime("%Y%m%d_%H%M%S")
                 destg = os.path.join(BASE_DIR, 'saves', game, f"savegame_{now}.json")
                 os.rename(oldg, destg)
                 print(f"[MIGRATE] moved generic savegame to {destg}")
-        self.slot_scroll = 0
+                self.slot_index(game).add_file(os.path.basename(destg))
+        profiler.lap("save migration (deferred)")
+        self.scores.open()
+        profiler.lap("open scores (deferred)")
+        profiler.report()
 
     def set_icon(self):
         # load custom app icon, fallback to default GH
-        try:
-            raw = pygame.image.load(os.path.join('icons','app icon.png')).convert_alpha()
-            surf = pygame.transform.smoothscale(raw, (32,32))
-        except:
+        surf = self.assets.icon('app')
+        if surf is None:
             surf = pygame.Surface((32,32))
             surf.fill(CYAN)
-            try: f=pygame.font.SysFont("consolas",20)
-            except: f=pygame.font.Font(None,20)
+            f=fonts.get("consolas",20)
             txt = f.render("PH", True, BG_COLOR)
             surf.blit(txt, (8,5))
         pygame.display.set_icon(surf)
@@ -700,96 +2272,180 @@ class GameHub:
 
     def play_pingpong(self): self.game=PingPongGame(); self.state=GameState.PINGPONG
 
-    def load_scores(self, filename="scores.json"):
-        if os.path.exists(filename):
-            with open(filename, "r") as f:
-                return json.load(f)
-        return {"snake": [], "tetris": [], "pingpong": []}
+    def slot_index(self, game):
+        if game not in self.slot_indexes:
+            self.slot_indexes[game] = SaveIndex(os.path.join(BASE_DIR, 'saves', game), game)
+        return self.slot_indexes[game]
 
-    def save_scores(self, filename="scores.json"):
-        with open(filename, "w") as f:
-            json.dump(self.scores, f)
+    def menu_key(self, hovered):
+        # everything that changes a menu frame between inputs
+        return (self.state, id(self.buttons), len(self.buttons), self.focus_index,
+                self.slot_scroll, tuple(hovered))
 
-    def record_score(self, game, score):
-        key = game.lower()
-        if key in self.scores:
-            self.scores[key].append(score)
+    def remember_menu_view(self, drawn_state):
+        # after drawing a menu frame, idle until something differs from it; a
+        # frame that switched screens is drawn again with the new buttons
+        if self.state == drawn_state and self.state in MENU_STATES:
+            self.menu_view = self.menu_key([b.hovered for b in self.buttons])
+        else:
+            self.menu_view = None
+
+    def toggle_stats(self):
+        self.show_stats = not self.show_stats
+        self.stats_surf = None
+        # the overlay covered part of a dirty-rect board; repaint it all
+        if getattr(self, 'game', None) is not None:
+            self.game.needs_full_redraw = True
+
+    def draw_stats(self):
+        # opaque frame-time overlay in the top-left corner; returns its rect.
+        # Text goes straight through font.render so changing numbers do not
+        # churn text_cache.
+        now = time.perf_counter()
+        if self.stats_surf is None or now - self.stats_drawn > 0.25:
+            font = fonts.get("consolas", 14)
+            rows = self.stats.overlay_rows() or [("collecting...",)]
+            lh = font.get_linesize()
+            # first column left-aligned, numbers right-aligned in fixed columns
+            label_w = max(font.size(r[0])[0] for r in rows if len(r) > 1) if len(rows) > 1 else 0
+            col_w = font.size("000.0")[0] + 8
+            w = max([label_w + 3*col_w] + [font.size(r[0])[0] for r in rows if len(r) == 1]) + 12
+            size = (w, lh*len(rows) + 10)
+            if self.stats_surf and self.stats_surf.get_size() != size and getattr(self, 'game', None) is not None:
+                # a shrinking overlay would leave stale pixels on a dirty-rect board
+                self.game.needs_full_redraw = True
+            self.stats_surf = pygame.Surface(size)
+            self.stats_surf.fill(BLACK)
+            for i, row in enumerate(rows):
+                y = 5 + i*lh
+                self.stats_surf.blit(font.render(row[0], True, YELLOW), (6, y))
+                for j, cell in enumerate(row[1:]):
+                    txt = font.render(cell, True, YELLOW)
+                    self.stats_surf.blit(txt, (6 + label_w + (j+1)*col_w - txt.get_width(), y))
+            self.stats_drawn = now
+        return self.screen.blit(self.stats_surf, (4, 4))
+
+    def static_layer(self, key, build):
+        # blit the static background for key, compositing it with build(surf)
+        # onto a BG-filled screen-sized surface only the first time it is seen;
+        # the cache is dropped whenever the window size changes. Keys carry no
+        # per-save data, so there is about one layer per menu state
+        size = self.screen.get_size()
+        if size != self.layer_size:
+            self.layers.clear(); self.layer_size = size
+        layer = self.layers.get(key)
+        if layer is None:
+            if len(self.layers) >= len(MENU_STATES):
+                self.layers.pop(next(iter(self.layers)))
+            layer = pygame.Surface(size).convert(self.screen)
+            layer.fill(BG_COLOR)
+            build(layer)
+            self.layers[key] = layer
+        self.screen.blit(layer, (0, 0))
+
+    def draw_panel(self, surf, rect, icon=None, title=None, header=None, header_y=None):
+        # translucent rounded menu panel, optional title pill and dark header pill
+        panel = pygame.Surface(rect.size, pygame.SRCALPHA)
+        pygame.draw.rect(panel, (*MED_CYAN,50), panel.get_rect(), border_radius=min(rect.size)//3)
+        surf.blit(panel, rect.topleft)
+        if title is not None:
+            draw_title(surf, self.font, icon, rect, title)
+        if header is not None:
+            surf.blit(self.header_pill(header), (rect.x + (rect.width - self.btn_size[0])//2, header_y))
+
+    def header_pill(self, header):
+        # dark pill with centred white text, button-sized
+        pill_w, pill_h = self.btn_size
+        hdr_pill = pygame.Surface((pill_w, pill_h), pygame.SRCALPHA)
+        pygame.draw.rect(hdr_pill, (0,0,0,150), hdr_pill.get_rect(), border_radius=pill_h//2)
+        hdr_surf = render_text(self.font, header, WHITE)
+        hdr_pill.blit(hdr_surf, ((pill_w - hdr_surf.get_width())//2, (pill_h - hdr_surf.get_height())//2))
+        return hdr_pill
+
+    def draw_hud(self, value, hint=True):
+        # render score and hint in centered cyan pills; returns the touched rects
+        pad_x, pad_y = 10, 5
+        sc_text = render_text(self.font, value, BLACK)
+        sc_tw, sc_th = sc_text.get_size()
+        sc_iw, sc_ih = self.score_icon.get_size() if self.score_icon else (0,0)
+        hint_text = render_text(self.font, "Press P to Pause", BLACK)
+        hi_tw, hi_th = hint_text.get_size()
+        hi_iw, hi_ih = self.hint_icon.get_size() if self.hint_icon else (0,0)
+        content_w = max(sc_iw + pad_x + sc_tw, hi_iw + pad_x + hi_tw)
+        pill_w = content_w + pad_x*2
+        pill_h = max(sc_ih, sc_th, hi_ih, hi_th) + pad_y*2
+        pill_x = (WIDTH - pill_w)//2
+        cy_sc = TOP_MARGIN//2; y_sc = cy_sc - pill_h//2
+        cy_hi = HEIGHT - BOTTOM_MARGIN//2; y_hi = cy_hi - pill_h//2
+        rects = []
+        # transparent white background pill for score
+        pill_surf = pygame.Surface((pill_w, pill_h), pygame.SRCALPHA)
+        pygame.draw.rect(pill_surf, (255,255,255,150), pill_surf.get_rect(), border_radius=pill_h//2)
+        self.screen.blit(pill_surf, (pill_x, y_sc))
+        if self.score_icon:
+            self.screen.blit(self.score_icon, (pill_x + pad_x, y_sc + (pill_h - sc_ih)//2))
+            self.screen.blit(sc_text, (pill_x + pad_x + sc_iw + pad_x, y_sc + (pill_h - sc_th)//2))
         else:
-            self.scores[key] = [score]
-        self.save_scores()
+            self.screen.blit(sc_text, (pill_x + pad_x, y_sc + (pill_h - sc_th)//2))
+        rects.append(pygame.Rect(pill_x, y_sc, pill_w, pill_h))
+        if not hint:
+            return rects
+        # transparent white background pill for hint
+        pill_surf2 = pygame.Surface((pill_w, pill_h), pygame.SRCALPHA)
+        pygame.draw.rect(pill_surf2, (255,255,255,150), pill_surf2.get_rect(), border_radius=pill_h//2)
+        self.screen.blit(pill_surf2, (pill_x, y_hi))
+        if self.hint_icon:
+            self.screen.blit(self.hint_icon, (pill_x + pad_x, y_hi + (pill_h - hi_ih)//2))
+            self.screen.blit(hint_text, (pill_x + pad_x + hi_iw + pad_x, y_hi + (pill_h - hi_th)//2))
+        else:
+            self.screen.blit(hint_text, (pill_x + pad_x, y_hi + (pill_h - hi_th)//2))
+        rects.append(pygame.Rect(pill_x, y_hi, pill_w, pill_h))
+        return rects
+
+    def record_score(self, game, score):
+        # called on game over: the run is finished, so is its autosave
+        self.autosave.discard()
+        self.scores.record(game, score)
 
     def save_progress(self, filename="savegame.json"):
         # determine which game to save: use paused_state when pausing
         state = self.paused_state or self.state
-        if state == GameState.SNAKE:
-            data = {"game": "snake", "data": {
-                "snakes": [list(seg) for seg in self.game.snakes],
-                "dirs": self.game.dirs,
-                "lives": self.game.lives,
-                "food": self.game.food,
-                "powers": self.game.powers,
-                "move_delay": self.game.move_delay
-            }}
-        elif state == GameState.TETRIS:
-            data = {"game": "tetris", "data": {
-                "grid": [[list(cell) if cell else None for cell in row] for row in self.game.grid],
-                "score": self.game.score,
-                "level": self.game.level,
-                "lines": self.game.lines,
-                "shape": self.game.shape,
-                "rot": self.game.rot,
-                "x": self.game.x,
-                "y": self.game.y
-            }}
-        elif state == GameState.PINGPONG:
-            data = {"game": "pingpong", "data": {
-                "left_y": self.game.left_y,
-                "ball_x": self.game.ball_x,
-                "ball_y": self.game.ball_y,
-                "ball_speed_x": self.game.ball_speed_x,
-                "ball_speed_y": self.game.ball_speed_y,
-                "score": self.game.score
-            }}
-        else:
+        if state == GameState.SNAKE: game = "snake"
+        elif state == GameState.TETRIS: game = "tetris"
+        elif state == GameState.PINGPONG: game = "pingpong"
+        else: return
+        # snapshot now; serializing and the disk write happen on the SaveWriter thread
+        data = {"game": game, "data": self.game.to_dict()}
+        # .sav files use the binary format, anything else stays JSON
+        encode = save_codec.encode if filename.endswith(SAVE_EXT) else save_codec.export_json
+        folder, fname = os.path.split(os.path.abspath(filename))
+        if os.path.dirname(folder) != os.path.abspath(os.path.join(BASE_DIR, 'saves')):
+            save_writer.submit(filename, data, encode=encode)
             return
-        with open(filename, "w") as f:
-            json.dump(data, f)
+        # slot saves keep their folder's catalog current; the entry is queued
+        # after the save and gets its file size once the save is written
+        index = self.slot_index(os.path.basename(folder))
+        index.record(fname, self.game, write=False, size=0)
+        save_writer.submit(filename, data, lambda size: index.set_size(fname, size), encode)
+        index.write()
 
     def load_progress(self, filename="savegame.json"):
+        save_writer.flush(filename)
         if not os.path.exists(filename):
             return
-        with open(filename, "r") as f:
-            data = json.load(f)
+        try:
+            data = save_codec.read(filename)
+        except Exception as e:
+            print(f"[ERROR] loading {filename}: {e}")
+            return
         if data.get("game") == "snake":
-            self.game = SnakeGame()
-            self.game.snakes = [tuple(seg) for seg in data["data"]["snakes"]]
-            self.game.dirs = tuple(data["data"]["dirs"])
-            self.game.lives = data["data"]["lives"]
-            self.game.food = tuple(data["data"]["food"])
-            self.game.powers = [{'type':p['type'],'pos':tuple(p['pos']),'color':tuple(p['color']),'mult':p['mult']} for p in data["data"]["powers"]]
-            self.game.move_delay = data["data"]["move_delay"]
+            self.game = SnakeGame.from_dict(data["data"])
             self.state = GameState.SNAKE
         elif data.get("game") == "tetris":
-            self.game = TetrisGame()
-            self.game.grid = [[tuple(cell) if cell else None for cell in row] for row in data["data"]["grid"]]
-            self.game.score = data["data"]["score"]
-            self.game.level = data["data"]["level"]
-            self.game.lines = data["data"]["lines"]
-            pygame.time.set_timer(self.game.gravity_event, max(50,500-(self.game.level-1)*50))
-            self.game.shape = data["data"]["shape"]
-            self.game.rot = data["data"]["rot"]
-            self.game.pattern = self.game.shapes[self.game.shape][self.game.rot]
-            self.game.x = data["data"]["x"]
-            self.game.y = data["data"]["y"]
+            self.game = TetrisGame.from_dict(data["data"])
             self.state = GameState.TETRIS
         elif data.get("game") == "pingpong":
-            self.game = PingPongGame()
-            self.game.left_y = data["data"]["left_y"]
-            self.game.ball_x = data["data"]["ball_x"]
-            self.game.ball_y = data["data"]["ball_y"]
-            self.game.ball_speed_x = data["data"]["ball_speed_x"]
-            self.game.ball_speed_y = data["data"]["ball_speed_y"]
-            self.game.score = data["data"]["score"]
+            self.game = PingPongGame.from_dict(data["data"])
             self.state = GameState.PINGPONG
 
     # Game-specific save wrappers
@@ -819,9 +2475,10 @@ class GameHub:
         unified_size = self.btn_size
         cx = WIDTH//2; mid_y = HEIGHT//2; offset_y = unified_size[1] + 20
         self.buttons = [
-            OrbitButton("Start New Game", (cx, mid_y - offset_y), unified_size, self.start_tetris,      self.new_icon),
-            OrbitButton("Load Game",      (cx, mid_y),            unified_size, self.open_load_tetris_menu,  self.load_icon),
-            OrbitButton("Back",           (cx, mid_y + offset_y), unified_size, self.open_main_menu,    self.back_icon),
+            OrbitButton("Start New Game", (cx, mid_y - offset_y*3//2), unified_size, self.start_tetris,          self.new_icon),
+            OrbitButton("Autoplay",       (cx, mid_y - offset_y//2),   unified_size, self.start_tetris_autoplay, self.new_icon),
+            OrbitButton("Load Game",      (cx, mid_y + offset_y//2),   unified_size, self.open_load_tetris_menu, self.load_icon),
+            OrbitButton("Back",           (cx, mid_y + offset_y*3//2), unified_size, self.open_main_menu,        self.back_icon),
         ]
         self.state = GameState.SUBMENU_TETRIS
         self.focus_index = 0
@@ -847,6 +2504,8 @@ class GameHub:
 
     def start_tetris(self): self.game = TetrisGame(); self.state = GameState.TETRIS
 
+    def start_tetris_autoplay(self): self.game = TetrisGame(autoplay=True); self.state = GameState.TETRIS
+
     def start_pingpong(self): self.game = PingPongGame(); self.state = GameState.PINGPONG
 
     def open_main_menu(self):
@@ -885,14 +2544,19 @@ class GameHub:
         self.focus_index = 0
 
     def resume_game(self):
+        # restart the game's real-time clock so paused time is not simulated
+        self.game.last_clock = None
+        # the pause overlay covered the board; dirty-rect renderers start over
+        self.game.needs_full_redraw = True
         self.state = self.paused_state
 
     def perform_save_quit(self):
         # auto-save with timestamp + return to submenu
+        self.autosave.discard()
         now = datetime.now().strftime("%Y%m%d_%H%M%S")
         sub = 'snake' if self.paused_state==GameState.SNAKE else 'tetris' if self.paused_state==GameState.TETRIS else 'pingpong'
         dir_path = os.path.join(BASE_DIR,'saves',sub)
-        fname = f"save_{now}.json"
+        fname = f"save_{now}{SAVE_EXT}"
         full = os.path.join(dir_path,fname)
         self.save_progress(full)
         print(f"[SAVE] created {full}")
@@ -901,16 +2565,14 @@ class GameHub:
         else: self.open_pingpong_menu()
 
     def perform_quit_without_saving(self):
+        self.autosave.discard()
         if self.paused_state==GameState.SNAKE: self.open_snake_menu()
         elif self.paused_state==GameState.TETRIS: self.open_tetris_menu()
         else: self.open_pingpong_menu()
 
     # Multi-slot load menus
     def open_load_snake_menu(self):
-        path = os.path.join(BASE_DIR, 'saves','snake')
-        print(f"[DEBUG] open_load_snake_menu path: {path}")
-        files = sorted(f for f in os.listdir(path) if f.endswith('.json'))
-        print(f"[DEBUG] found save files: {files}")
+        files = [f for f, _ in self.slot_index('snake').entries()]
         cx, mid_y = WIDTH//2, HEIGHT//2; offset_y = self.btn_size[1] + 20
         start_y = mid_y - ((len(files)-1)/2)*offset_y
         self.buttons = []
@@ -927,10 +2589,7 @@ class GameHub:
         pygame.event.clear(pygame.MOUSEBUTTONDOWN)
 
     def open_load_tetris_menu(self):
-        path = os.path.join(BASE_DIR, 'saves','tetris')
-        print(f"[DEBUG] open_load_tetris_menu path: {path}")
-        files = sorted(f for f in os.listdir(path) if f.endswith('.json'))
-        print(f"[DEBUG] found save files: {files}")
+        files = [f for f, _ in self.slot_index('tetris').entries()]
         cx, mid_y = WIDTH//2, HEIGHT//2; offset_y = self.btn_size[1] + 20
         start_y = mid_y - ((len(files)-1)/2)*offset_y
         self.buttons = []
@@ -942,13 +2601,11 @@ class GameHub:
         self.buttons.append(OrbitButton("Back", (cx, int(start_y + len(files)*offset_y)), self.btn_size, lambda: self.open_tetris_menu(), self.back_icon))
         self.state = GameState.LOAD_MENU_TETRIS
         self.focus_index = 0
+        self.slot_scroll = 0
         pygame.event.clear(pygame.MOUSEBUTTONDOWN)
 
     def open_load_pingpong_menu(self):
-        path = os.path.join(BASE_DIR, 'saves','pingpong')
-        print(f"[DEBUG] open_load_pingpong_menu path: {path}")
-        files = sorted(f for f in os.listdir(path) if f.endswith('.json'))
-        print(f"[DEBUG] found save files: {files}")
+        files = [f for f, _ in self.slot_index('pingpong').entries()]
         cx, mid_y = WIDTH//2, HEIGHT//2; offset_y = self.btn_size[1] + 20
         start_y = mid_y - ((len(files)-1)/2)*offset_y
         self.buttons = []
@@ -964,14 +2621,7 @@ class GameHub:
         pygame.event.clear(pygame.MOUSEBUTTONDOWN)
 
     def open_detail_snake(self, fname, slot_no):
-        path = os.path.join(BASE_DIR, 'saves','snake', fname)
-        name_no_ext = fname[:-5]
-        timestamp = name_no_ext[-15:]
-        title = name_no_ext[:-16] or 'save'
-        self.detail_title = title
-        self.detail_timestamp = timestamp
-        self.detail_filepath = path
-        self.detail_slot = slot_no
+        self.set_detail('snake', fname, slot_no)
         cx, mid_y = WIDTH//2, HEIGHT//2; offset = self.btn_size[1] + 20
         self.detail_pill1_y = int(mid_y - 1.5*offset)
         self.detail_pill2_y = int(mid_y - 0.5*offset)
@@ -985,14 +2635,7 @@ class GameHub:
         self.focus_index = 0
 
     def open_detail_tetris(self, fname, slot_no):
-        path = os.path.join(BASE_DIR, 'saves','tetris', fname)
-        name_no_ext = fname[:-5]
-        timestamp = name_no_ext[-15:]
-        title = name_no_ext[:-16] or 'save'
-        self.detail_title = title
-        self.detail_timestamp = timestamp
-        self.detail_filepath = path
-        self.detail_slot = slot_no
+        self.set_detail('tetris', fname, slot_no)
         cx, mid_y = WIDTH//2, HEIGHT//2; offset = self.btn_size[1] + 20
         self.detail_pill1_y = int(mid_y - 1.5*offset)
         self.detail_pill2_y = int(mid_y - 0.5*offset)
@@ -1006,14 +2649,7 @@ class GameHub:
         self.focus_index = 0
 
     def open_detail_pingpong(self, fname, slot_no):
-        path = os.path.join(BASE_DIR, 'saves','pingpong', fname)
-        name_no_ext = fname[:-5]
-        timestamp = name_no_ext[-15:]
-        title = name_no_ext[:-16] or 'save'
-        self.detail_title = title
-        self.detail_timestamp = timestamp
-        self.detail_filepath = path
-        self.detail_slot = slot_no
+        self.set_detail('pingpong', fname, slot_no)
         cx, mid_y = WIDTH//2, HEIGHT//2; offset = self.btn_size[1] + 20
         self.detail_pill1_y = int(mid_y - 1.5*offset)
         self.detail_pill2_y = int(mid_y - 0.5*offset)
@@ -1026,12 +2662,26 @@ class GameHub:
         self.state = GameState.DETAIL_SAVE_PINGPONG
         self.focus_index = 0
 
+    def set_detail(self, game, fname, slot_no):
+        # detail view fields come from the slot catalog, not the save file
+        meta = self.slot_index(game).get(fname) or {}
+        self.detail_game = game
+        self.detail_meta = meta
+        self.detail_title = meta.get('title', 'save')
+        self.detail_timestamp = meta.get('timestamp', '')
+        self.detail_filepath = os.path.join(BASE_DIR, 'saves', game, fname)
+        self.detail_slot = slot_no
+
     def perform_delete_slot(self):
+        # a queued write must not bring the file back after the delete
+        save_writer.flush(self.detail_filepath)
         try:
             os.remove(self.detail_filepath)
             print(f"[DELETE] removed {self.detail_filepath}")
         except Exception as e:
             print(f"[ERROR] deleting slot: {e}")
+        if not os.path.exists(self.detail_filepath):
+            self.slot_index(self.detail_game).remove(os.path.basename(self.detail_filepath))
         # return to the appropriate load menu
         if self.state == GameState.DETAIL_SAVE_SNAKE:
             self.open_load_snake_menu()
@@ -1075,15 +2725,34 @@ class GameHub:
 
         clock=pygame.time.Clock()
         while True:
-            dt=clock.tick(60)/1000
-            events=pygame.event.get()
+            menu = self.state in MENU_STATES
+            if not menu:
+                self.menu_view = None
+            if self.menu_view is not None:
+                # idle menu: sleep until input (or the timeout) instead of spinning
+                e = pygame.event.wait(MENU_IDLE_MS)
+                events = ([e] if e.type != pygame.NOEVENT else []) + pygame.event.get()
+                dt=clock.tick()/1000
+            else:
+                dt=clock.tick(60)/1000
+                events=pygame.event.get()
+            self.stats.begin(self.state)
+            mouse = pygame.mouse.get_pos()
             for e in events:
-                if e.type==pygame.QUIT: pygame.quit(); sys.exit()
+                if e.type==pygame.QUIT: save_writer.flush(); self.scores.flush(); pygame.quit(); sys.exit()
+                elif e.type==pygame.KEYDOWN and e.key==pygame.K_F3:
+                    self.toggle_stats()
+                elif e.type==pygame.KEYDOWN and e.key==pygame.K_F4:
+                    print(f"[STATS] exported {self.stats.export(os.path.join(BASE_DIR, 'stats'))}")
+            if self.state in Autosaver.names:
+                self.autosave.poll(self.state, self.game, pygame.time.get_ticks())
+            # skip the frame when only the mouse moved and no hover changed
+            if self.menu_view is not None and all(e.type==pygame.MOUSEMOTION for e in events):
+                if self.menu_key([b.rect.collidepoint(mouse) for b in self.buttons]) == self.menu_view:
+                    continue
+            drawn_state = self.state
             # keyboard navigation for menu states
-            if self.state in (GameState.MENU, GameState.SUBMENU_SNAKE, GameState.SUBMENU_TETRIS,
-                              GameState.SUBMENU_PINGPONG, GameState.PAUSE, GameState.LOAD_MENU_SNAKE, GameState.LOAD_MENU_TETRIS,
-                              GameState.LOAD_MENU_PINGPONG, GameState.DETAIL_SAVE_SNAKE, GameState.DETAIL_SAVE_TETRIS,
-                              GameState.DETAIL_SAVE_PINGPONG):
+            if menu:
                 for e in events:
                     if e.type==pygame.KEYDOWN:
                         if e.key==pygame.K_UP:
@@ -1095,11 +2764,12 @@ class GameHub:
                 # mark focus, keep hovered only for mouse
                 for i,b in enumerate(self.buttons):
                     b.focused = (i == self.focus_index)
+            self.stats.lap("events")
             if self.state==GameState.MENU:
-                for b in self.buttons: b.update(dt)
+                for b in self.buttons: b.update(dt, mouse)
                 for e in events:
                     for b in self.buttons: b.handle_event(e)
-                self.screen.fill(BG_COLOR)
+                self.stats.lap("events")
                 # panel background sized to buttons
                 btn_w = max(b.size[0] for b in self.buttons)
                 # add extra horizontal margins (40px each side)
@@ -1112,60 +2782,53 @@ class GameHub:
                 dynamic_h = extent + btn_h + margin_v*2
                 panel_h = max(dynamic_h, int(HEIGHT * 0.85))
                 panel_h - 70
-                panel = pygame.Surface((panel_w, panel_h), pygame.SRCALPHA)
-                # smoother, more rounded corners
-                radius = min(panel_w, panel_h) // 3
-                pygame.draw.rect(panel, (*MED_CYAN, 50), panel.get_rect(), border_radius=radius)
                 x = (WIDTH - panel_w)//2
                 y = (HEIGHT - panel_h)//2
-                self.screen.blit(panel, (x, y))
-                # draw title with panel rect for dynamic sizing
+                # panel + title pill with panel rect for dynamic sizing, composited once
                 panel_rect = pygame.Rect(x, y, panel_w, panel_h)
-                draw_title(self.screen,self.font,self.title_icon, panel_rect)
+                self.static_layer((self.state, tuple(panel_rect)),
+                                  lambda surf: self.draw_panel(surf, panel_rect, self.title_icon, "PMD742OMNI GAME HUB"))
                 for b in self.buttons: b.draw(self.screen, self.font)
             elif self.state==GameState.SUBMENU_SNAKE:
                 # Snake submenu
-                for b in self.buttons: b.update(dt)
+                for b in self.buttons: b.update(dt, mouse)
                 for e in events:
                     for b in self.buttons: b.handle_event(e)
-                self.screen.fill(BG_COLOR)
+                self.stats.lap("events")
                 # draw panel background
                 btn_w = max(b.size[0] for b in self.buttons)
                 panel_w = btn_w + 70
                 panel_h = int(HEIGHT * 0.85)
-                panel = pygame.Surface((panel_w,panel_h), pygame.SRCALPHA)
-                pygame.draw.rect(panel, (*MED_CYAN,50), panel.get_rect(), border_radius=min(panel_w,panel_h)//3)
                 x=(WIDTH-panel_w)//2; y=(HEIGHT-panel_h)//2
-                self.screen.blit(panel,(x,y))
-                draw_title(self.screen,self.font,self.snake_icon, pygame.Rect(x,y,panel_w,panel_h), "SNAKE")
+                panel_rect = pygame.Rect(x,y,panel_w,panel_h)
+                self.static_layer((self.state, tuple(panel_rect)),
+                                  lambda surf: self.draw_panel(surf, panel_rect, self.snake_icon, "SNAKE"))
                 for b in self.buttons: b.draw(self.screen,self.font)
             elif self.state==GameState.SUBMENU_TETRIS:
                 # Tetris submenu
-                for b in self.buttons: b.update(dt)
+                for b in self.buttons: b.update(dt, mouse)
                 for e in events:
                     for b in self.buttons: b.handle_event(e)
-                self.screen.fill(BG_COLOR)
+                self.stats.lap("events")
                 btn_w = max(b.size[0] for b in self.buttons)
                 panel_w = btn_w + 70; panel_h = int(HEIGHT * 0.85)
-                panel = pygame.Surface((panel_w,panel_h), pygame.SRCALPHA)
-                pygame.draw.rect(panel, (*MED_CYAN,50), panel.get_rect(), border_radius=min(panel_w,panel_h)//3)
                 x=(WIDTH-panel_w)//2; y=(HEIGHT-panel_h)//2
-                self.screen.blit(panel,(x,y))
-                draw_title(self.screen,self.font,self.tetris_icon, pygame.Rect(x,y,panel_w,panel_h), "TETRIS")
+                panel_rect = pygame.Rect(x,y,panel_w,panel_h)
+                self.static_layer((self.state, tuple(panel_rect)),
+                                  lambda surf: self.draw_panel(surf, panel_rect, self.tetris_icon, "TETRIS"))
                 for b in self.buttons: b.draw(self.screen,self.font)
             elif self.state==GameState.SUBMENU_PINGPONG:
                 # Ping Pong submenu
-                for b in self.buttons: b.update(dt)
+                for b in self.buttons: b.update(dt, mouse)
                 for e in events:
                     for b in self.buttons: b.handle_event(e)
-                self.screen.fill(BG_COLOR)
+                self.stats.lap("events")
                 btn_w = max(b.size[0] for b in self.buttons)
                 panel_w = btn_w + 70; panel_h = int(HEIGHT * 0.85)
-                panel = pygame.Surface((panel_w,panel_h), pygame.SRCALPHA)
-                pygame.draw.rect(panel, (*MED_CYAN,50), panel.get_rect(), border_radius=min(panel_w,panel_h)//3)
                 x=(WIDTH-panel_w)//2; y=(HEIGHT-panel_h)//2
-                self.screen.blit(panel,(x,y))
-                draw_title(self.screen,self.font,self.pingpong_icon, pygame.Rect(x,y,panel_w,panel_h), "PING PONG")
+                panel_rect = pygame.Rect(x,y,panel_w,panel_h)
+                self.static_layer((self.state, tuple(panel_rect)),
+                                  lambda surf: self.draw_panel(surf, panel_rect, self.pingpong_icon, "PING PONG"))
                 for b in self.buttons: b.draw(self.screen,self.font)
             elif self.state==GameState.SNAKE:
                 # pause/save in game
@@ -1175,41 +2838,28 @@ class GameHub:
                         break
                 if self.state == GameState.SNAKE:
                     res=self.game.update(events)
+                    self.stats.lap("update")
+                    if DIRTY_RECTS:
+                        # the hint pill only needs repainting after a full redraw; translucent
+                        # pills must never be blitted twice onto the same background
+                        full = self.game.needs_full_redraw
+                        rects = self.game.draw_dirty(self.screen,self.font)
+                        self.stats.lap("draw")
+                        if self.game.hud_repainted:
+                            rects += self.draw_hud(str(self.game.lives[0]), hint=full)
+                        if self.show_stats:
+                            rects.append(self.draw_stats())
+                        self.stats.lap("hud")
+                        if res:
+                            g,s=res; self.record_score(g,s); self.over=GameOverScreen(g,s,self.scores.best(g)); self.state=GameState.GAME_OVER
+                        pygame.display.update(rects)
+                        self.stats.lap("flip"); self.stats.end()
+                        continue
                     self.game.draw(self.screen,self.font)
-                    # render score and hint in centered cyan pills
-                    pad_x, pad_y = 10, 5
-                    sc_text = self.font.render(str(self.game.lives[0]), True, BLACK)
-                    sc_tw, sc_th = sc_text.get_size()
-                    sc_iw, sc_ih = self.score_icon.get_size() if self.score_icon else (0,0)
-                    hint_text = self.font.render("Press P to Pause", True, BLACK)
-                    hi_tw, hi_th = hint_text.get_size()
-                    hi_iw, hi_ih = self.hint_icon.get_size() if self.hint_icon else (0,0)
-                    content_w = max(sc_iw + pad_x + sc_tw, hi_iw + pad_x + hi_tw)
-                    pill_w = content_w + pad_x*2
-                    pill_h = max(sc_ih, sc_th, hi_ih, hi_th) + pad_y*2
-                    pill_x = (WIDTH - pill_w)//2
-                    cy_sc = TOP_MARGIN//2; y_sc = cy_sc - pill_h//2
-                    cy_hi = HEIGHT - BOTTOM_MARGIN//2; y_hi = cy_hi - pill_h//2
-                    # transparent white background pill for score
-                    pill_surf = pygame.Surface((pill_w, pill_h), pygame.SRCALPHA)
-                    pygame.draw.rect(pill_surf, (255,255,255,150), pill_surf.get_rect(), border_radius=pill_h//2)
-                    self.screen.blit(pill_surf, (pill_x, y_sc))
-                    if self.score_icon:
-                        self.screen.blit(self.score_icon, (pill_x + pad_x, y_sc + (pill_h - sc_ih)//2))
-                        self.screen.blit(sc_text, (pill_x + pad_x + sc_iw + pad_x, y_sc + (pill_h - sc_th)//2))
-                    else:
-                        self.screen.blit(sc_text, (pill_x + pad_x, y_sc + (pill_h - sc_th)//2))
-                    # transparent white background pill for hint
-                    pill_surf2 = pygame.Surface((pill_w, pill_h), pygame.SRCALPHA)
-                    pygame.draw.rect(pill_surf2, (255,255,255,150), pill_surf2.get_rect(), border_radius=pill_h//2)
-                    self.screen.blit(pill_surf2, (pill_x, y_hi))
-                    if self.hint_icon:
-                        self.screen.blit(self.hint_icon, (pill_x + pad_x, y_hi + (pill_h - hi_ih)//2))
-                        self.screen.blit(hint_text, (pill_x + pad_x + hi_iw + pad_x, y_hi + (pill_h - hi_th)//2))
-                    else:
-                        self.screen.blit(hint_text, (pill_x + pad_x, y_hi + (pill_h - hi_th)//2))
+                    self.stats.lap("draw")
+                    self.draw_hud(str(self.game.lives[0]))
                     if res:
-                        g,s=res; self.record_score(g,s); self.over=GameOverScreen(g,s); self.state=GameState.GAME_OVER
+                        g,s=res; self.record_score(g,s); self.over=GameOverScreen(g,s,self.scores.best(g)); self.state=GameState.GAME_OVER
             elif self.state==GameState.TETRIS:
                 # pause/save in game
                 for e in events:
@@ -1218,55 +2868,28 @@ class GameHub:
                         break
                 if self.state == GameState.TETRIS:
                     res=self.game.update(events)
+                    self.stats.lap("update")
                     self.game.draw(self.screen,self.font)
-                    # render score and hint in centered cyan pills
-                    pad_x, pad_y = 10, 5
-                    sc_text = self.font.render(str(self.game.score), True, BLACK)
-                    sc_tw, sc_th = sc_text.get_size()
-                    sc_iw, sc_ih = self.score_icon.get_size() if self.score_icon else (0,0)
-                    hint_text = self.font.render("Press P to Pause", True, BLACK)
-                    hi_tw, hi_th = hint_text.get_size()
-                    hi_iw, hi_ih = self.hint_icon.get_size() if self.hint_icon else (0,0)
-                    content_w = max(sc_iw + pad_x + sc_tw, hi_iw + pad_x + hi_tw)
-                    pill_w = content_w + pad_x*2
-                    pill_h = max(sc_ih, sc_th, hi_ih, hi_th) + pad_y*2
-                    pill_x = (WIDTH - pill_w)//2
-                    cy_sc = TOP_MARGIN//2; y_sc = cy_sc - pill_h//2
-                    cy_hi = HEIGHT - BOTTOM_MARGIN//2; y_hi = cy_hi - pill_h//2
-                    # transparent white background pill for score
-                    pill_surf = pygame.Surface((pill_w, pill_h), pygame.SRCALPHA)
-                    pygame.draw.rect(pill_surf, (255,255,255,150), pill_surf.get_rect(), border_radius=pill_h//2)
-                    self.screen.blit(pill_surf, (pill_x, y_sc))
-                    if self.score_icon:
-                        self.screen.blit(self.score_icon, (pill_x + pad_x, y_sc + (pill_h - sc_ih)//2))
-                        self.screen.blit(sc_text, (pill_x + pad_x + sc_iw + pad_x, y_sc + (pill_h - sc_th)//2))
-                    else:
-                        self.screen.blit(sc_text, (pill_x + pad_x, y_sc + (pill_h - sc_th)//2))
-                    # transparent white background pill for hint
-                    pill_surf2 = pygame.Surface((pill_w, pill_h), pygame.SRCALPHA)
-                    pygame.draw.rect(pill_surf2, (255,255,255,150), pill_surf2.get_rect(), border_radius=pill_h//2)
-                    self.screen.blit(pill_surf2, (pill_x, y_hi))
-                    if self.hint_icon:
-                        self.screen.blit(self.hint_icon, (pill_x + pad_x, y_hi + (pill_h - hi_ih)//2))
-                        self.screen.blit(hint_text, (pill_x + pad_x + hi_iw + pad_x, y_hi + (pill_h - hi_th)//2))
-                    else:
-                        self.screen.blit(hint_text, (pill_x + pad_x, y_hi + (pill_h - hi_th)//2))
+                    self.stats.lap("draw")
+                    self.draw_hud(str(self.game.score))
                     if res:
-                        g,s=res; self.record_score(g,s); self.over=GameOverScreen(g,s); self.state=GameState.GAME_OVER
+                        g,s=res; self.record_score(g,s); self.over=GameOverScreen(g,s,self.scores.best(g)); self.state=GameState.GAME_OVER
             elif self.state==GameState.PINGPONG:
                 res = self.game.update(events)
+                self.stats.lap("update")
                 self.game.draw(self.screen, self.font)
                 if res:
-                    g,s=res; self.record_score(g,s); self.over=GameOverScreen(g,s); self.state=GameState.GAME_OVER
+                    g,s=res; self.record_score(g,s); self.over=GameOverScreen(g,s,self.scores.best(g)); self.state=GameState.GAME_OVER
             elif self.state==GameState.PAUSE:
-                for b in self.buttons: b.update(dt)
+                for b in self.buttons: b.update(dt, mouse)
                 for e in events:
                     for b in self.buttons: b.handle_event(e)
+                self.stats.lap("events")
                 self.screen.fill(BG_COLOR)
                 for b in self.buttons: b.draw(self.screen,self.font)
             elif self.state==GameState.LOAD_MENU_SNAKE:
                 # update and handle scroll events
-                for b in self.buttons: b.update(dt)
+                for b in self.buttons: b.update(dt, mouse)
                 offset_y = self.btn_size[1] + 20
                 scroll_step = offset_y
                 panel_h = int(HEIGHT * 0.85)
@@ -1284,23 +2907,17 @@ class GameHub:
                         elif e.key==pygame.K_UP:
                             self.slot_scroll = max(self.slot_scroll - scroll_step, 0)
                     for b in self.buttons: b.handle_event(e)
-                self.screen.fill(BG_COLOR)
-                # draw panel background
+                self.stats.lap("events")
+                # draw panel background with header pill "Slots"
                 btn_w = max(b.size[0] for b in self.buttons)
                 panel_w = btn_w + 70
                 panel_h = int(HEIGHT * 0.85)
-                panel = pygame.Surface((panel_w, panel_h), pygame.SRCALPHA)
-                pygame.draw.rect(panel, (*MED_CYAN,50), panel.get_rect(), border_radius=min(panel_w,panel_h)//3)
                 panel_x = (WIDTH - panel_w)//2; panel_y = (HEIGHT - panel_h)//2
-                self.screen.blit(panel, (panel_x, panel_y))
-                # header pill "Slots"
                 pill_w, pill_h = self.btn_size
-                hdr_pill = pygame.Surface((pill_w, pill_h), pygame.SRCALPHA)
-                pygame.draw.rect(hdr_pill, (0,0,0,150), hdr_pill.get_rect(), border_radius=pill_h//2)
-                hdr_surf = self.font.render("Slots", True, WHITE)
-                hdr_pill.blit(hdr_surf, ((pill_w - hdr_surf.get_width())//2, (pill_h - hdr_surf.get_height())//2))
-                hdr_x = panel_x + (panel_w - pill_w)//2; hdr_y = panel_y + 80
-                self.screen.blit(hdr_pill, (hdr_x, hdr_y))
+                hdr_y = panel_y + 80
+                panel_rect = pygame.Rect(panel_x, panel_y, panel_w, panel_h)
+                self.static_layer((self.state, tuple(panel_rect)),
+                                  lambda surf: self.draw_panel(surf, panel_rect, header="Slots", header_y=hdr_y))
                 # draw scrollable buttons
                 content_start_y = hdr_y + pill_h + 80
                 prev_clip = self.screen.get_clip()
@@ -1332,7 +2949,7 @@ class GameHub:
                 back_btn.draw(self.screen, self.font)
             elif self.state==GameState.LOAD_MENU_TETRIS:
                 # update and handle scroll events
-                for b in self.buttons: b.update(dt)
+                for b in self.buttons: b.update(dt, mouse)
                 offset_y = self.btn_size[1] + 20
                 scroll_step = offset_y
                 panel_h = int(HEIGHT * 0.85)
@@ -1350,24 +2967,17 @@ class GameHub:
                         elif e.key==pygame.K_UP:
                             self.slot_scroll = max(self.slot_scroll - scroll_step, 0)
                     for b in self.buttons: b.handle_event(e)
-                self.screen.fill(BG_COLOR)
-                # draw panel background
+                self.stats.lap("events")
+                # draw panel background with header pill "Slots"
                 btn_w = max(b.size[0] for b in self.buttons)
                 panel_w = btn_w + 70
                 panel_h = int(HEIGHT * 0.85) + 50
-                panel = pygame.Surface((panel_w, panel_h), pygame.SRCALPHA)
-                pygame.draw.rect(panel, (*MED_CYAN,50), panel.get_rect(), border_radius=min(panel_w,panel_h)//3)
                 panel_x = (WIDTH - panel_w)//2; panel_y = (HEIGHT - panel_h)//2 - 10
-                self.screen.blit(panel, (panel_x, panel_y))
-                # header pill "Slots"
                 pill_w, pill_h = self.btn_size
-                hdr_pill = pygame.Surface((pill_w, pill_h), pygame.SRCALPHA)
-                pygame.draw.rect(hdr_pill, (0,0,0,150), hdr_pill.get_rect(), border_radius=pill_h//2)
-                hdr_surf = self.font.render("Slots", True, WHITE)
-                hdr_pill.blit(hdr_surf, ((pill_w - hdr_surf.get_width())//2, (pill_h - hdr_surf.get_height())//2))
-                hdr_x = panel_x + (panel_w - pill_w)//2
                 hdr_y = panel_y + 80
-                self.screen.blit(hdr_pill, (hdr_x, hdr_y))
+                panel_rect = pygame.Rect(panel_x, panel_y, panel_w, panel_h)
+                self.static_layer((self.state, tuple(panel_rect)),
+                                  lambda surf: self.draw_panel(surf, panel_rect, header="Slots", header_y=hdr_y))
                 # draw scrollable buttons
                 content_start_y = hdr_y + pill_h + 80
                 prev_clip = self.screen.get_clip()
@@ -1399,7 +3009,7 @@ class GameHub:
                 back_btn.draw(self.screen, self.font)
             elif self.state==GameState.LOAD_MENU_PINGPONG:
                 # update and handle scroll events
-                for b in self.buttons: b.update(dt)
+                for b in self.buttons: b.update(dt, mouse)
                 offset_y = self.btn_size[1] + 20
                 scroll_step = offset_y
                 panel_h = int(HEIGHT * 0.85)
@@ -1417,24 +3027,17 @@ class GameHub:
                         elif e.key==pygame.K_UP:
                             self.slot_scroll = max(self.slot_scroll - scroll_step, 0)
                     for b in self.buttons: b.handle_event(e)
-                self.screen.fill(BG_COLOR)
-                # draw panel background
+                self.stats.lap("events")
+                # draw panel background with header pill "Slots"
                 btn_w = max(b.size[0] for b in self.buttons)
                 panel_w = btn_w + 70
                 panel_h = int(HEIGHT * 0.85) + 50
-                panel = pygame.Surface((panel_w, panel_h), pygame.SRCALPHA)
-                pygame.draw.rect(panel, (*MED_CYAN,50), panel.get_rect(), border_radius=min(panel_w,panel_h)//3)
                 panel_x = (WIDTH - panel_w)//2; panel_y = (HEIGHT - panel_h)//2 - 10
-                self.screen.blit(panel, (panel_x, panel_y))
-                # header pill "Slots"
                 pill_w, pill_h = self.btn_size
-                hdr_pill = pygame.Surface((pill_w, pill_h), pygame.SRCALPHA)
-                pygame.draw.rect(hdr_pill, (0,0,0,150), hdr_pill.get_rect(), border_radius=pill_h//2)
-                hdr_surf = self.font.render("Slots", True, WHITE)
-                hdr_pill.blit(hdr_surf, ((pill_w - hdr_surf.get_width())//2, (pill_h - hdr_surf.get_height())//2))
-                hdr_x = panel_x + (panel_w - pill_w)//2
                 hdr_y = panel_y + 80
-                self.screen.blit(hdr_pill, (hdr_x, hdr_y))
+                panel_rect = pygame.Rect(panel_x, panel_y, panel_w, panel_h)
+                self.static_layer((self.state, tuple(panel_rect)),
+                                  lambda surf: self.draw_panel(surf, panel_rect, header="Slots", header_y=hdr_y))
                 # draw scrollable buttons
                 content_start_y = hdr_y + pill_h + 80
                 prev_clip = self.screen.get_clip()
@@ -1467,61 +3070,80 @@ class GameHub:
             elif self.state in (GameState.DETAIL_SAVE_SNAKE, GameState.DETAIL_SAVE_TETRIS,
                                 GameState.DETAIL_SAVE_PINGPONG):
                 # render detailed save view
-                for b in self.buttons: b.update(dt)
+                for b in self.buttons: b.update(dt, mouse)
                 for e in events:  # handle back/load button clicks
                     for b in self.buttons: b.handle_event(e)
-                self.screen.fill(BG_COLOR)
+                self.stats.lap("events")
                 # outer panel
                 btn_w = max(b.size[0] for b in self.buttons)
                 panel_w = btn_w + 70; panel_h = int(HEIGHT * 0.85) + 50
-                panel = pygame.Surface((panel_w, panel_h), pygame.SRCALPHA)
-                pygame.draw.rect(panel, (*MED_CYAN,50), panel.get_rect(), border_radius=min(panel_w,panel_h)//3)
                 x = (WIDTH-panel_w)//2; y = (HEIGHT-panel_h)//2 - 25
-                pill_h = self.btn_size[1]
+                pill_w, pill_h = self.btn_size
                 panel_drop = pill_h // 2
                 y += panel_drop
-                self.screen.blit(panel, (x, y))
-                # header pill for slot number instead of default title
-                pill_w, pill_h = self.btn_size
-                hdr_pill = pygame.Surface((pill_w, pill_h), pygame.SRCALPHA)
-                pygame.draw.rect(hdr_pill, (0,0,0,150), hdr_pill.get_rect(), border_radius=pill_h//2)
-                hdr_txt = f"Slot {self.detail_slot}"
-                hdr_surf = self.font.render(hdr_txt, True, WHITE)
-                hdr_pill.blit(hdr_surf, ((pill_w - hdr_surf.get_width())//2, (pill_h - hdr_surf.get_height())//2))
-                hdr_x = x + (panel_w - pill_w)//2
                 hdr_y = y + pill_h  # drop header pill by one pill height from panel top
-                self.screen.blit(hdr_pill, (hdr_x, hdr_y))
-                # inner cyan panel for info pills
-                pill_w, pill_h = self.btn_size
+                # inner cyan panel for info pills, below header pill with consistent padding
                 inner_pad = 10
                 info_w = pill_w + inner_pad*2
-                info_h = pill_h*2 + inner_pad*3
-                info_panel = pygame.Surface((info_w, info_h), pygame.SRCALPHA)
-                pygame.draw.rect(info_panel, (*CYAN,100), info_panel.get_rect(), border_radius=pill_h//2)
+                info_h = pill_h*3 + inner_pad*4
                 ix = x + (panel_w - info_w)//2
-                # position inner panel below header pill with consistent padding
                 iy = hdr_y + pill_h + inner_pad
-                self.screen.blit(info_panel, (ix, iy))
-                # title pill
-                pill = pygame.Surface((pill_w, pill_h), pygame.SRCALPHA)
-                pygame.draw.rect(pill, (255,255,255,150), pill.get_rect(), border_radius=pill_h//2)
-                pad_x = 20; gap = 10; icon_r = pill_h//2
-                bg_x = pad_x + icon_r; bg_y = pill_h//2
-                pygame.draw.circle(pill, (255,255,255,150), (bg_x, bg_y), icon_r)
-                if self.title_pill_icon:
-                    pill.blit(self.title_pill_icon, (bg_x - self.title_pill_icon.get_width()//2, bg_y - self.title_pill_icon.get_height()//2))
-                txt = self.font.render(self.detail_title, True, (0,0,0))
-                pill.blit(txt, (bg_x + icon_r + gap, bg_y - txt.get_height()//2))
-                self.screen.blit(pill, (ix + inner_pad, iy + inner_pad))
-                # datetime pill
-                pill2 = pygame.Surface((pill_w, pill_h), pygame.SRCALPHA)
-                pygame.draw.rect(pill2, (255,255,255,150), pill2.get_rect(), border_radius=pill_h//2)
-                pygame.draw.circle(pill2, (255,255,255,150), (bg_x, bg_y), icon_r)
-                if self.datetime_icon:
-                    pill2.blit(self.datetime_icon, (bg_x - self.datetime_icon.get_width()//2, bg_y - self.datetime_icon.get_height()//2))
-                txt2 = self.font.render(self.detail_timestamp, True, (0,0,0))
-                pill2.blit(txt2, (bg_x + icon_r + gap, bg_y - txt2.get_height()//2))
-                self.screen.blit(pill2, (ix + inner_pad, iy + inner_pad*2 + pill_h))
+                panel_rect = pygame.Rect(x, y, panel_w, panel_h)
+                def build(surf):
+                    # panel and info panel only: the per-slot pills go on top
+                    self.draw_panel(surf, panel_rect)
+                    info_panel = pygame.Surface((info_w, info_h), pygame.SRCALPHA)
+                    pygame.draw.rect(info_panel, (*CYAN,100), info_panel.get_rect(), border_radius=pill_h//2)
+                    surf.blit(info_panel, (ix, iy))
+                def build_pills():
+                    # header pill for slot number instead of default title
+                    pills = [(self.header_pill(f"Slot {self.detail_slot}"), (x + (panel_w - pill_w)//2, hdr_y))]
+                    # title pill
+                    pill = pygame.Surface((pill_w, pill_h), pygame.SRCALPHA)
+                    pygame.draw.rect(pill, (255,255,255,150), pill.get_rect(), border_radius=pill_h//2)
+                    pad_x = 20; gap = 10; icon_r = pill_h//2
+                    bg_x = pad_x + icon_r; bg_y = pill_h//2
+                    pygame.draw.circle(pill, (255,255,255,150), (bg_x, bg_y), icon_r)
+                    if self.title_pill_icon:
+                        pill.blit(self.title_pill_icon, (bg_x - self.title_pill_icon.get_width()//2, bg_y - self.title_pill_icon.get_height()//2))
+                    txt = render_text(self.font, self.detail_title, BLACK)
+                    pill.blit(txt, (bg_x + icon_r + gap, bg_y - txt.get_height()//2))
+                    pills.append((pill, (ix + inner_pad, iy + inner_pad)))
+                    # datetime pill
+                    pill2 = pygame.Surface((pill_w, pill_h), pygame.SRCALPHA)
+                    pygame.draw.rect(pill2, (255,255,255,150), pill2.get_rect(), border_radius=pill_h//2)
+                    pygame.draw.circle(pill2, (255,255,255,150), (bg_x, bg_y), icon_r)
+                    if self.datetime_icon:
+                        pill2.blit(self.datetime_icon, (bg_x - self.datetime_icon.get_width()//2, bg_y - self.datetime_icon.get_height()//2))
+                    txt2 = render_text(self.font, self.detail_timestamp, BLACK)
+                    pill2.blit(txt2, (bg_x + icon_r + gap, bg_y - txt2.get_height()//2))
+                    pills.append((pill2, (ix + inner_pad, iy + inner_pad*2 + pill_h)))
+                    # summary pill: score/lives/level and the board thumbnail from the catalog
+                    pill3 = pygame.Surface((pill_w, pill_h), pygame.SRCALPHA)
+                    pygame.draw.rect(pill3, (255,255,255,150), pill3.get_rect(), border_radius=pill_h//2)
+                    pygame.draw.circle(pill3, (255,255,255,150), (bg_x, bg_y), icon_r)
+                    if self.score_icon:
+                        pill3.blit(self.score_icon, (bg_x - self.score_icon.get_width()//2, bg_y - self.score_icon.get_height()//2))
+                    meta = self.detail_meta
+                    if meta:
+                        txt3 = render_text(self.font, SaveIndex.summary(meta), BLACK)
+                        pill3.blit(txt3, (bg_x + icon_r + gap, bg_y - txt3.get_height()//2))
+                        if meta.get('thumb'):
+                            thumb = SaveIndex.thumbnail_surface(meta['thumb'], (pill_h*5//4, pill_h - 12))
+                            tr = thumb.get_rect(midright=(pill_w - icon_r, bg_y))
+                            pill3.blit(thumb, tr)
+                            pygame.draw.rect(pill3, BLACK, tr.inflate(2, 2), 1)
+                    pills.append((pill3, (ix + inner_pad, iy + inner_pad*3 + pill_h*2)))
+                    return pills
+                self.static_layer((self.state, tuple(panel_rect)), build)
+                # one entry for the slot on show, rebuilt when another slot opens or
+                # its catalog entry changes (a save landing on disk sets its mtime)
+                self.detail_meta = self.slot_index(self.detail_game).get(os.path.basename(self.detail_filepath)) or self.detail_meta
+                pill_key = (self.state, tuple(panel_rect), self.detail_slot, self.detail_title, self.detail_timestamp,
+                            self.detail_filepath, self.detail_meta.get('mtime'))
+                if self.detail_pills is None or self.detail_pills[0] != pill_key:
+                    self.detail_pills = (pill_key, build_pills())
+                self.screen.blits(self.detail_pills[1], doreturn=False)
                 # draw Load/Back buttons directly below inner panel using inner_pad spacing
                 cx = WIDTH // 2
                 y_load = iy + info_h + pill_h + inner_pad*2
@@ -1538,7 +3160,12 @@ class GameHub:
                     b.rect.center = b.center
                     b.pos = b.rect.topleft
                     b.draw(self.screen, self.font)
+                self.stats.lap("draw")
+                if self.show_stats: self.draw_stats()
+                self.stats.lap("hud")
                 pygame.display.flip()
+                self.stats.lap("flip"); self.stats.end()
+                self.remember_menu_view(drawn_state)
                 continue
             elif self.state==GameState.GAME_OVER:
                 for e in events:
@@ -1546,8 +3173,19 @@ class GameHub:
                     if e.type==pygame.MOUSEBUTTONDOWN or (e.type==pygame.KEYDOWN and e.key in (pygame.K_RETURN, pygame.K_KP_ENTER)):
                         self.state = GameState.MENU
                 self.over.draw(self.screen,self.font)
+            # whatever the branch did since its last lap was drawing
+            self.stats.lap("draw")
+            if self.show_stats: self.draw_stats()
+            self.stats.lap("hud")
             pygame.display.flip()
+            self.stats.lap("flip"); self.stats.end()
+            self.remember_menu_view(drawn_state)
+            if self.pending_init:
+                profiler.lap("first frame")
+                self.finish_init()
 
 if __name__=="__main__":
+    profiler.lap("module load")
     pygame.init()
+    profiler.lap("pygame.init")
     GameHub().run()
@@ -0,0 +1,4 @@
+# main.py opens no window at import time, but pygame still wants a video driver
+import os, sys
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
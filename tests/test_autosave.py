@@ -0,0 +1,97 @@
+import os, random
+import pytest
+from main import (Autosaver, GameState, PingPongGame, SaveIndex, SnakeGame, TetrisGame,
+                  save_codec, save_writer)
+
+
+class Hub:
+    # the part of GameHub the Autosaver uses
+    def __init__(self, base):
+        self.base = base
+        self.indexes = {}
+
+    def slot_index(self, game):
+        if game not in self.indexes:
+            folder = os.path.join(self.base, game)
+            os.makedirs(folder, exist_ok=True)
+            self.indexes[game] = SaveIndex(folder, game)
+        return self.indexes[game]
+
+
+def snake_state(d):
+    # JSON-style lists vs tuples are the same state
+    return dict(d, snakes=[[tuple(c) for c in s] for s in d["snakes"]], dirs=[tuple(x) for x in d["dirs"]])
+
+
+RUNS = [
+    (GameState.SNAKE, lambda: SnakeGame(2, seed=3),
+     lambda g, rng: g.tick([rng.choice([None]*6 + [(1,0), (0,1), (-1,0), (0,-1)]) for _ in range(2)]), snake_state),
+    (GameState.TETRIS, lambda: TetrisGame(autoplay=True), lambda g, rng: g.tick(None, 60), dict),
+    (GameState.PINGPONG, PingPongGame, lambda g, rng: g.tick(rng.choice([-1, 0, 1]), 16), dict),
+]
+
+
+@pytest.mark.parametrize("state, make, play, norm", RUNS, ids=lambda r: getattr(r, "name", ""))
+def test_journal_replays_to_the_live_game(tmp_path, state, make, play, norm):
+    random.seed(1)
+    rng = random.Random(1)
+    autosaver = Autosaver(Hub(str(tmp_path)), interval_ms=100)
+    game, now, kinds = make(), 0, set()
+    for _ in range(120):
+        for _ in range(rng.randint(1, 6)):
+            if play(game, rng): break
+        now += 100
+        autosaver.poll(state, game, now)
+        if autosaver.path is None:
+            continue
+        kinds.add("keyframe" if autosaver.deltas == 0 else "delta")
+        save_writer.flush()
+        # keyframe plus every delta since, replayed from the file
+        save = save_codec.read(autosaver.path)
+        assert norm(type(game).from_dict(save["data"]).to_dict()) == norm(game.to_dict())
+        if getattr(game, "over", False) or (state == GameState.SNAKE and not any(game.snakes)):
+            break
+    assert kinds == {"keyframe", "delta"}
+
+
+def test_torn_delta_replays_up_to_the_last_whole_record(tmp_path):
+    random.seed(1)
+    autosaver = Autosaver(Hub(str(tmp_path)), interval_ms=100)
+    game = TetrisGame(autoplay=True)
+    autosaver.poll(GameState.TETRIS, game, 0)
+    autosaver.poll(GameState.TETRIS, game, 100)
+    game.tick(None, 200)
+    autosaver.poll(GameState.TETRIS, game, 200)
+    save_writer.flush()
+    before = game.to_dict()
+    game.tick(None, 200)
+    autosaver.poll(GameState.TETRIS, game, 300)
+    save_writer.flush()
+    with open(autosaver.path, "rb") as f:
+        raw = f.read()
+    assert TetrisGame.from_dict(save_codec.replay(raw)["data"]).to_dict() == game.to_dict() != before
+    # a crash in the middle of the last append
+    save = save_codec.replay(raw[:-3])
+    assert TetrisGame.from_dict(save["data"]).to_dict() == before
+
+
+def test_rotation_keeps_the_newest_journals(tmp_path):
+    hub = Hub(str(tmp_path))
+    index = hub.slot_index("tetris")
+    old = [f"autosave_2026010{i}_000000.jrn" for i in range(1, 5)]
+    for fname in old:
+        with open(os.path.join(index.folder, fname), "wb") as f:
+            f.write(save_codec.encode_keyframe({"game": "tetris", "data": TetrisGame().to_dict()}))
+    index.entries()
+    # the legacy JSON autosave is never rotated out
+    legacy = "autosave_20250101_000000.json"
+    index.record(legacy, TetrisGame(), write=False, size=0)
+    autosaver = Autosaver(hub, interval_ms=100)
+    game = TetrisGame()
+    autosaver.poll(GameState.TETRIS, game, 0)
+    autosaver.poll(GameState.TETRIS, game, 100)
+    save_writer.flush()
+    journals = sorted(f for f in os.listdir(index.folder) if f.endswith(".jrn"))
+    assert len(journals) == Autosaver.keep
+    assert journals == sorted(old[-(Autosaver.keep - 1):] + [autosaver.fname])
+    assert sorted(index.known()) == sorted(journals + [legacy])
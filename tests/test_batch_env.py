@@ -0,0 +1,79 @@
+import random
+import numpy as np
+from main import SnakeGame, TetrisGame
+from batch_env import DIRS, SnakeBatchEnv, TetrisBatchEnv
+
+
+def greedy(g, i, rng):
+    # head for the food through free cells, with some random turns
+    if not g.snakes[i]:
+        return -1
+    x, y = g.snakes[i][0]
+    fx, fy = g.food or (x, y)
+    def free(d):
+        nx, ny = x + DIRS[d][0], y + DIRS[d][1]
+        return 0 <= nx < g.cols and 0 <= ny < g.rows and not g.occ[ny*g.cols + nx]
+    options = [d for d in range(4) if free(d)] or [0]
+    if rng.random() < 0.1:
+        return rng.choice(options)
+    return min(options, key=lambda d: abs(x + DIRS[d][0] - fx) + abs(y + DIRS[d][1] - fy))
+
+
+def test_snake_batch_matches_snake_game():
+    rng = random.Random(4)
+    eaten = lost = 0
+    for seed in range(3):
+        env = SnakeBatchEnv(1, num_players=2, seed=seed, auto_reset=False)
+        g = SnakeGame(2, seed=seed)
+        for _ in range(400):
+            # same food on both boards: the two pick it with different generators
+            f = int(env.food[0])
+            g.food = (f % g.cols, f // g.cols) if f >= 0 else None
+            actions = [greedy(g, i, rng) for i in range(2)]
+            rewards, done = env.step(np.array([actions]))
+            g.tick([DIRS[a] if a >= 0 else None for a in actions])
+            eaten += int((rewards > 0).sum()); lost += int((rewards < 0).sum())
+            assert bytes(env.occ[0].astype(np.uint8)) == bytes(g.occ)
+            assert list(env.lives[0]) == g.lives
+            assert list(env.length[0]) == [len(body) for body in g.snakes]
+            if done[0]: break
+    assert eaten and lost
+
+
+def test_tetris_placements_match_tetris_game():
+    random.seed(5)
+    g = TetrisGame()
+    env = TetrisBatchEnv(1, seed=0, auto_reset=False)
+    cleared = 0
+    for _ in range(60):
+        env.boards[0] = (np.array(g.row_masks)[:, None] >> np.arange(g.cols)) & 1
+        env.pieces[0] = env.shape_names.index(g.shape)
+        res = env.placements()
+        for k in range(env.K):
+            if not env.cand_ok[env.pieces[0], k]:
+                continue
+            rot, x = int(res['rot'][0, k]), int(res['x'][0, k])
+            piece = g.rotations[g.shape][rot]
+            assert bool(res['valid'][0, k]) == (not g.collide(x, 0, piece))
+            if not res['valid'][0, k]:
+                continue
+            # hard-drop the same placement through the game's own rules
+            t = g.clone()
+            t.rot, t.piece, t.x, t.y = rot, piece, x, 0
+            while not t.collide(t.x, t.y + 1, t.piece): t.y += 1
+            lines = t.lines
+            t.lock()
+            want = (np.array(t.row_masks)[:, None] >> np.arange(g.cols)) & 1
+            assert (res['boards'][0, k] == want).all()
+            assert res['lines'][0, k] == t.lines - lines
+            cleared += t.lines - lines
+        # move on with a simple greedy placement, so lines do get cleared
+        value = 10*res['lines'][0] - res['aggregate_height'][0] - 4*res['holes'][0]
+        k = int(np.where(res['valid'][0], value, -10**9).argmax())
+        rot, x = int(res['rot'][0, k]), int(res['x'][0, k])
+        g.rot, g.piece, g.x = rot, g.rotations[g.shape][rot], x
+        while not g.collide(g.x, g.y + 1, g.piece): g.y += 1
+        g.lock()
+        if g.over:
+            break
+    assert cleared
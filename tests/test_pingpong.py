@@ -0,0 +1,42 @@
+from main import PingPongGame, HEIGHT, WIDTH
+
+
+def test_fast_ball_bounces_off_paddle():
+    g = PingPongGame()
+    # 300 px per step at 120 Hz: far wider than the paddle, so a per-step
+    # overlap test would let the ball skip straight past it
+    g.ball_speed_x, g.ball_speed_y = -600, 0
+    g.ball_x, g.ball_y = 200, g.left_y + g.paddle_h/2
+    assert g.tick(0) is None
+    assert g.ball_speed_x > 0 and g.score == 1
+    assert g.ball_x >= g.paddle_x + g.paddle_w + g.ball_radius
+
+
+def test_miss_ends_game():
+    g = PingPongGame()
+    g.ball_speed_x, g.ball_speed_y = -600, 0
+    g.ball_x, g.ball_y = 200, g.left_y + g.paddle_h + 50
+    g.score = 3
+    assert g.tick(0) == ("Ping Pong", 3)
+
+
+def test_ball_stays_in_court():
+    g = PingPongGame()
+    # fast, steep ball against a full-height paddle: every step has contacts
+    g.ball_speed_x, g.ball_speed_y = 37, 53
+    g.paddle_h, g.left_y = HEIGHT, 0
+    r = g.ball_radius
+    for _ in range(2000):
+        assert g.tick(0) is None
+        assert r - 1e-6 <= g.ball_y <= HEIGHT - r + 1e-6
+        assert g.paddle_x + g.paddle_w + r - 1e-6 <= g.ball_x <= WIDTH - r + 1e-6
+    assert g.score > 0
+
+
+def test_tick_is_frame_rate_independent():
+    a, b = PingPongGame(), PingPongGame()
+    for _ in range(120):
+        a.tick(1, 1000/30)
+    for _ in range(480):
+        b.tick(1, 1000/120)
+    assert a.to_dict() == b.to_dict()
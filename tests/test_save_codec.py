@@ -0,0 +1,50 @@
+import os, random
+import pytest
+from main import PingPongGame, SaveCodec, SaveWriter, SnakeGame, TetrisGame, save_codec
+
+
+def test_failed_write_leaves_no_temp_file(tmp_path):
+    # the target is a directory, so the final os.replace fails
+    target = tmp_path / "slot.sav"
+    target.mkdir()
+    with pytest.raises(OSError):
+        SaveWriter.write(str(target), b"data")
+    assert sorted(os.listdir(tmp_path)) == ["slot.sav"]
+    assert SaveWriter.write(str(tmp_path / "ok.sav"), b"data") == 4
+    assert (tmp_path / "ok.sav").read_bytes() == b"data"
+    assert not (tmp_path / "ok.sav.tmp").exists()
+
+
+def games():
+    random.seed(3)
+    snake = SnakeGame(2, seed=3)
+    for _ in range(40):
+        snake.tick()
+    tetris = TetrisGame()
+    for _ in range(12):
+        tetris.play_best()
+    pong = PingPongGame()
+    pong.tick(1, 500)
+    return {"snake": snake, "tetris": tetris, "pingpong": pong}
+
+
+@pytest.mark.parametrize("compress", [True, False])
+def test_round_trip(compress):
+    codec = SaveCodec(compress)
+    for name, game in games().items():
+        raw = codec.encode({"game": name, "data": game.to_dict()})
+        save = codec.decode(raw)
+        assert save["game"] == name
+        assert type(game).from_dict(save["data"]).to_dict() == game.to_dict()
+
+
+def test_rejects_damaged_saves():
+    game = games()["tetris"]
+    raw = bytearray(save_codec.encode({"game": "tetris", "data": game.to_dict()}))
+    flipped = bytearray(raw)
+    flipped[-1] ^= 0x01
+    newer = bytearray(raw)
+    newer[4] = SaveCodec.version + 1
+    for bad in (flipped, raw[:-1], raw[:10], b"XXXX" + raw[4:], newer):
+        with pytest.raises(ValueError):
+            save_codec.decode(bytes(bad))
@@ -0,0 +1,75 @@
+import json, os
+import main
+from main import SaveIndex, TetrisGame, save_codec, save_writer
+
+
+def put(folder, fname, score, mtime_ns):
+    g = TetrisGame()
+    g.score = score
+    path = os.path.join(folder, fname)
+    with open(path, "wb") as f:
+        f.write(save_codec.encode({"game": "tetris", "data": g.to_dict()}))
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def scores(index):
+    return [(f, m["score"]) for f, m in index.entries()]
+
+
+def test_sync_follows_the_folder(tmp_path, monkeypatch):
+    folder = str(tmp_path)
+    reads = []
+    real_read = save_codec.read
+    monkeypatch.setattr(save_codec, "read", lambda path: reads.append(os.path.basename(path)) or real_read(path))
+    # no catalog yet: every save in the folder is read once
+    put(folder, "save_20260101_000000.sav", 10, 10**18)
+    put(folder, "save_20260102_000000.sav", 20, 10**18)
+    index = SaveIndex(folder, "tetris")
+    assert scores(index) == [("save_20260101_000000.sav", 10), ("save_20260102_000000.sav", 20)]
+    assert len(reads) == 2
+    # unchanged files are not opened again
+    assert scores(index) == [("save_20260101_000000.sav", 10), ("save_20260102_000000.sav", 20)]
+    assert len(reads) == 2
+    # copied in, edited (new mtime), removed
+    put(folder, "save_20260103_000000.sav", 30, 10**18)
+    put(folder, "save_20260101_000000.sav", 11, 10**18 + 1)
+    os.remove(os.path.join(folder, "save_20260102_000000.sav"))
+    del reads[:]
+    assert scores(index) == [("save_20260101_000000.sav", 11), ("save_20260103_000000.sav", 30)]
+    assert sorted(reads) == ["save_20260101_000000.sav", "save_20260103_000000.sav"]
+    # the catalog on disk matches, and a fresh SaveIndex trusts it
+    save_writer.flush()
+    with open(os.path.join(folder, SaveIndex.name)) as f:
+        assert sorted(json.load(f)["slots"]) == ["save_20260101_000000.sav", "save_20260103_000000.sav"]
+    del reads[:]
+    assert scores(SaveIndex(folder, "tetris")) == scores(index)
+    assert reads == []
+
+
+def test_unreadable_file_skipped_until_it_changes(tmp_path, monkeypatch):
+    folder = str(tmp_path)
+    path = os.path.join(folder, "junk_20260101_000000.sav")
+    with open(path, "wb") as f:
+        f.write(b"garbage")
+    os.utime(path, ns=(10**18, 10**18))
+    index = SaveIndex(folder, "tetris")
+    assert index.entries() == []
+    reads = []
+    real_read = save_codec.read
+    monkeypatch.setattr(save_codec, "read", lambda p: reads.append(p) or real_read(p))
+    assert index.entries() == []
+    assert reads == []
+    # replaced by a real save: picked up on the next sync
+    put(folder, "junk_20260101_000000.sav", 5, 10**18 + 1)
+    assert scores(index) == [("junk_20260101_000000.sav", 5)]
+
+
+def test_queued_files_left_alone(tmp_path, monkeypatch):
+    folder = str(tmp_path)
+    put(folder, "save_20260101_000000.sav", 10, 10**18)
+    index = SaveIndex(folder, "tetris")
+    index.record("save_20260102_000000.sav", TetrisGame(), write=False, size=0)
+    # a save still queued on the writer is not on disk yet: its entry stays
+    monkeypatch.setattr(main.save_writer, "busy", lambda path: path.endswith("save_20260102_000000.sav"))
+    assert [f for f, _ in index.entries()] == ["save_20260101_000000.sav", "save_20260102_000000.sav"]
+    save_writer.flush()
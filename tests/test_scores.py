@@ -0,0 +1,50 @@
+import threading
+from main import ScoreStore
+
+
+class PausingConnection:
+    # the writer's connection: holds the thread right after COMMIT
+    def __init__(self, db, committed, release):
+        self.db, self.committed, self.release = db, committed, release
+
+    def execute(self, sql, *args):
+        cur = self.db.execute(sql, *args)
+        if sql == "COMMIT":
+            self.committed.set()
+            self.release.wait(5)
+        return cur
+
+    def executemany(self, sql, rows):
+        return self.db.executemany(sql, rows)
+
+
+class PausingStore(ScoreStore):
+    batch_ms = 0
+
+    def __init__(self, path):
+        super().__init__(path)
+        self.committed, self.release = threading.Event(), threading.Event()
+
+    def connect(self):
+        db = super().connect()
+        if threading.current_thread() is self.thread:
+            return PausingConnection(db, self.committed, self.release)
+        return db
+
+
+def test_read_while_batch_commits(tmp_path):
+    store = PausingStore(str(tmp_path / "scores.db"))
+    store.open()
+    for score in (5, 9, 7):
+        store.record("Snake", score)
+    assert store.committed.wait(5)
+    # the batch is in the table and the writer has not let go of it yet;
+    # the query connection belongs to this thread, so a timer lets go
+    timer = threading.Timer(0.2, store.release.set)
+    timer.start()
+    top, recent = store.top("snake"), store.recent("snake")
+    timer.join()
+    assert [score for score, _ in top] == [9, 7, 5]
+    assert [score for score, _ in recent] == [7, 9, 5]
+    assert store.best("Snake") == 9
+    assert store.flush(5)
@@ -0,0 +1,44 @@
+from collections import deque
+from main import SnakeGame
+
+
+def check_board(g):
+    want = bytearray(g.cols*g.rows)
+    for i, body in enumerate(g.snakes):
+        for x, y in body:
+            want[y*g.cols + x] = i + 1
+    assert g.occ == want
+    # free list: every empty cell exactly once, nothing else
+    occupied = sum(1 for c in g.occ if c)
+    assert len(g.free) + occupied == g.cols*g.rows
+    assert sorted(g.free) == [c for c in range(g.cols*g.rows) if not g.occ[c]]
+    assert all(g.free_pos[c] == k for k, c in enumerate(g.free))
+    assert g.food is None or not g.occ[g.food[1]*g.cols + g.food[0]]
+
+
+def test_respawn_onto_other_snake():
+    g = SnakeGame(2, seed=1)
+    # P1 lies across P2's start point; P2 dies next step and must respawn elsewhere
+    sx, sy = g.start_pos(1)
+    g.snakes = [deque((x, sy) for x in range(sx + 2, sx - 3, -1)), deque([(g.cols - 1, 0)])]
+    g.dirs = [(0, 1), (1, 0)]
+    g.rebuild_occupancy()
+    g.tick()
+    assert g.lives[1] == 2
+    assert g.snakes[1][0] != (sx, sy)
+    check_board(g)
+    # run both long enough for every body cell to be entered and left again
+    for _ in range(30):
+        g.tick()
+        check_board(g)
+
+
+def test_respawn_avoids_food():
+    g = SnakeGame(1, seed=2)
+    g.food = g.start_pos(0)
+    g.snakes = [deque([(g.cols - 1, 0)])]
+    g.rebuild_occupancy()
+    g.tick()
+    assert g.lives[0] == 2
+    assert g.snakes[0][0] != g.food
+    check_board(g)
@@ -0,0 +1,68 @@
+import random
+from main import TetrisGame, TetrisAI
+
+
+def board(g, masks):
+    g.row_masks = list(masks)
+    g.row_colors = [bytearray(g.cols) for _ in range(g.rows)]
+
+
+def test_play_best_skips_blocked_placements():
+    random.seed(7)
+    g = TetrisGame(autoplay=True)
+    # the O piece sits in a cave (cols 0-3, rows 15-16) under a roof on row 14;
+    # every ranked drop lands on the roof, and those over cols 4-9 collide here
+    wall = g.full_row & ~0b1111
+    board(g, [0]*14 + [g.full_row & ~(1 << 9), wall, wall, wall | 0b110, g.full_row & ~1, g.full_row & ~1])
+    g.shape, g.rot, g.x, g.y = 'O', 0, 0, 15
+    g.piece = g.rotations['O'][0]
+    ranked = TetrisAI().ranked(g)
+    legal = [move for move in ranked if move in g.reachable()]
+    assert legal and ranked[0] != legal[0]
+    assert g.play_best() == legal[0]
+    assert not g.over
+
+
+def test_play_best_does_not_pass_through_walls():
+    random.seed(7)
+    g = TetrisGame(autoplay=True)
+    # a pillar on col 4 (rows 15-16) splits the piece's row; the two-line
+    # slot at cols 6-7 is free at that row but only reachable from the top
+    pillar, slot = 1 << 4, g.full_row & ~(0b11 << 6)
+    board(g, [0]*15 + [pillar, pillar, slot, slot, g.full_row & ~1])
+    g.shape, g.rot, g.x, g.y = 'O', 0, 0, 15
+    g.piece = g.rotations['O'][0]
+    ranked = TetrisAI().ranked(g)
+    assert ranked[0] == (0, 6) and not g.collide(6, g.y, g.piece)
+    assert g.reachable() == {(0, 0), (0, 1), (0, 2)}
+    rot, x = g.play_best()
+    assert x <= 2 and (rot, x) == next(m for m in ranked if m[1] <= 2)
+    assert g.lines == 0
+
+
+def test_play_best_reports_no_move():
+    random.seed(7)
+    g = TetrisGame(autoplay=True)
+    # full to the top bar a one-wide well: the O piece fits nowhere
+    board(g, [0] + [g.full_row & ~1]*19)
+    g.shape, g.rot, g.x, g.y = 'O', 0, 4, 0
+    g.piece = g.rotations['O'][0]
+    assert g.play_best() is None
+    assert g.over
+
+
+def test_ranked_cached_per_board_and_shape():
+    random.seed(7)
+    g = TetrisGame(autoplay=True)
+    ai = TetrisAI(cache_size=2)
+    moves = ai.ranked(g)
+    assert ai.ranked(g) is moves
+    # the piece position is not part of the key, the board and shape are
+    g.x += 1
+    assert ai.ranked(g) is moves
+    g.row_masks[-1] = 1
+    assert ai.ranked(g) is not moves
+    # full cache: cleared before the next entry goes in
+    g.row_masks[-1] = 3
+    ai.ranked(g)
+    assert len(ai.cache) == 1